@@ -0,0 +1,51 @@
+"""
+Benchmark import anggota: register_user berulang vs register_users_bulk
+register_users_bulk menjalankan PBKDF2 di thread pool (hashlib melepas GIL)
+
+Usage:
+    python benchmarks/bench_auth_bulk.py --users 64
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.auth import AuthenticationManager
+
+
+def make_records(count: int):
+    return [
+        {"username": f"member{i}", "password": f"password{i:04d}", "full_name": f"Member {i}",
+         "email": f"member{i}@example.com", "phone": "0812", "address": "Jl. Benchmark",
+         "user_id": f"u{i:07d}"}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=32)
+    args = parser.parse_args()
+    records = make_records(args.users)
+
+    auth = AuthenticationManager()
+    start = time.perf_counter()
+    for record in records:
+        auth.register_user(**record)
+    elapsed = time.perf_counter() - start
+    print(f"register_user (loop)  : {args.users / elapsed:8.1f} user/s")
+
+    auth = AuthenticationManager()
+    start = time.perf_counter()
+    auth.register_users_bulk(records)
+    elapsed = time.perf_counter() - start
+    auth.shutdown()
+    print(f"register_users_bulk   : {args.users / elapsed:8.1f} user/s "
+          f"({os.cpu_count()} worker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark peminjaman/pengembalian massal: borrow_book/return_book berulang vs borrow_many/return_many
+Riwayat transaksi diisi dulu (--history) karena return_book mencari transaksi secara linear
+
+Usage:
+    python benchmarks/bench_batch_checkout.py --books 10000 --history 50000 --batch 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic_data import make_books
+from src.library_manager import LibraryManager
+
+
+def build_library(books: int, history: int) -> LibraryManager:
+    rng = random.Random(42)
+    library = LibraryManager()
+    for book in make_books(books, rng):
+        book.total_copies = book.available_copies = 1000
+        library.add_book(book)
+    book_ids = [book_id for book_id, _ in library.get_all_books()]
+    for i in range(0, history, 100):
+        library.borrow_many(f"member{i}", rng.sample(book_ids, min(100, history - i)))
+    return library
+
+
+def run(library: LibraryManager, batches, single: bool):
+    borrow_time = return_time = 0.0
+    for book_ids in batches:
+        start = time.perf_counter()
+        if single:
+            results = [library.borrow_book("desk", book_id) for book_id in book_ids]
+        else:
+            results = library.borrow_many("desk", book_ids)
+        borrow_time += time.perf_counter() - start
+
+        transaction_ids = [trans_id for success, _, trans_id in results if success]
+        start = time.perf_counter()
+        if single:
+            for trans_id in transaction_ids:
+                library.return_book(trans_id)
+        else:
+            library.return_many(transaction_ids)
+        return_time += time.perf_counter() - start
+    return borrow_time, return_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=10000)
+    parser.add_argument("--history", type=int, default=50000, help="transaksi yang sudah ada")
+    parser.add_argument("--batch", type=int, default=50, help="buku per batch")
+    parser.add_argument("--batches", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    for label, single in (("loop borrow_book/return_book", True), ("borrow_many/return_many  ", False)):
+        library = build_library(args.books, args.history)
+        book_ids = [book_id for book_id, _ in library.get_all_books()]
+        batches = [rng.sample(book_ids, args.batch) for _ in range(args.batches)]
+        borrow_time, return_time = run(library, batches, single)
+        items = args.batch * args.batches
+        print(f"{label}: borrow {items / borrow_time:9.0f} item/s   "
+              f"return {items / return_time:9.0f} item/s")
+
+
+if __name__ == "__main__":
+    main()
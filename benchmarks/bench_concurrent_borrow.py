@@ -0,0 +1,81 @@
+"""
+Benchmark throughput LibraryManager yang diakses banyak thread
+Setiap thread menjalankan campuran borrow/return dan get_book/pencarian
+pada buku acak; di akhir stok setiap buku diverifikasi terhadap transaksi aktif
+
+Usage:
+    python benchmarks/bench_concurrent_borrow.py --books 10000 --ops 20000 --threads 1 2 4 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic_data import make_books
+from src.library_manager import LibraryManager
+
+
+def build_library(count: int) -> LibraryManager:
+    library = LibraryManager()
+    for book in make_books(count, random.Random(42)):
+        library.add_book(book)
+    return library
+
+
+def worker(library: LibraryManager, book_ids, ops: int, read_ratio: float, seed: int) -> None:
+    rng = random.Random(seed)
+    active = []
+    for i in range(ops):
+        book_id = rng.choice(book_ids)
+        if rng.random() < read_ratio:
+            library.get_book(book_id)
+        elif active and (rng.random() < 0.5 or i == ops - 1):
+            library.return_book(active.pop(rng.randrange(len(active))))
+        else:
+            success, _, trans_id = library.borrow_book(f"user{seed}", book_id)
+            if success:
+                active.append(trans_id)
+
+
+def verify(library: LibraryManager) -> bool:
+    """available_copies + peminjaman aktif harus sama dengan total_copies"""
+    active = {}
+    for trans in library.get_pending_transactions():
+        active[trans.book_id] = active.get(trans.book_id, 0) + 1
+    return all(book.available_copies + active.get(book_id, 0) == book.total_copies
+               for book_id, book in library.get_all_books())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=20000, help="total operasi per run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--read-ratio", type=float, default=0.8)
+    args = parser.parse_args()
+
+    for threads in args.threads:
+        library = build_library(args.books)
+        book_ids = [book_id for book_id, _ in library.get_all_books()]
+        per_thread = args.ops // threads
+        pool = [threading.Thread(target=worker,
+                                 args=(library, book_ids, per_thread, args.read_ratio, seed))
+                for seed in range(threads)]
+        start = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - start
+        print(f"{threads:2d} thread : {per_thread * threads / elapsed:10.0f} op/s   "
+              f"borrow={library.borrow_count:6d} return={library.return_count:6d}   "
+              f"konsisten={'ya' if verify(library) else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark waktu startup: DataPersistence.load_all sekuensial vs paralel
+Juga mengukur latensi borrow/return pertama setelah load eager vs lazy:
+koleksi transaksi lazy dimuat utuh, sehingga mutasi pertama menanggung
+deserialisasi seluruh riwayat (kecuali di-preload di background)
+
+Usage:
+    python benchmarks/bench_load_all.py --books 50000 --transactions 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.library_manager import LibraryManager
+from src.auth import AuthenticationManager
+from src.persistence import DataPersistence
+from synthetic_data import write_dataset
+
+
+def time_load(data_dir: str, parallel: bool, workers: int) -> float:
+    persistence = DataPersistence(data_dir)
+    library = LibraryManager()
+    auth = AuthenticationManager()
+    start = time.perf_counter()
+    success, msg = persistence.load_all(library, auth, parallel=parallel, max_workers=workers)
+    elapsed = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(msg)
+    return elapsed
+
+
+def time_first_mutations(data_dir: str, lazy: bool, preload: bool,
+                         book_id: str, transaction_id: str):
+    """Returns: (load_all, borrow pertama, return pertama) dalam detik"""
+    persistence = DataPersistence(data_dir)
+    library = LibraryManager()
+    start = time.perf_counter()
+    persistence.load_all(library, AuthenticationManager(), lazy=lazy)
+    loaded = time.perf_counter()
+    if preload:
+        library.preload_lazy_collections()  # GUI menjalankan ini di background thread
+    before_borrow = time.perf_counter()
+    success, msg, _ = library.borrow_book("member0", book_id)
+    borrowed = time.perf_counter()
+    if not success:
+        raise RuntimeError(msg)
+    success, msg, _ = library.return_book(transaction_id)
+    returned = time.perf_counter()
+    if not success:
+        raise RuntimeError(msg)
+    return loaded - start, borrowed - before_borrow, returned - borrowed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--reviews", type=int, default=50000)
+    parser.add_argument("--searches", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_dataset(data_dir, args.books, args.users, args.transactions,
+                      args.reviews, args.searches)
+        size_mb = sum(os.path.getsize(os.path.join(data_dir, f))
+                      for f in os.listdir(data_dir)) / 1e6
+        print(f"Dataset: {size_mb:.1f} MB, {os.cpu_count()} CPU")
+
+        for label, parallel in (("sekuensial", False), ("paralel", True)):
+            best = min(time_load(data_dir, parallel, args.workers) for _ in range(args.repeat))
+            print(f"  load_all {label:<11}: {best:.3f} s")
+
+        library = LibraryManager()
+        DataPersistence(data_dir).load_all(library, AuthenticationManager())
+        book_id = next(book.book_id for _, book in library.get_all_books()
+                       if book.available_copies > 0)
+        transaction_id = library.get_pending_transactions()[0].transaction_id
+        print("  Mutasi pertama setelah startup:")
+        for label, lazy, preload in (("eager", False, False), ("lazy", True, False),
+                                     ("lazy+preload", True, True)):
+            load_s, borrow_s, return_s = min(
+                (time_first_mutations(data_dir, lazy, preload, book_id, transaction_id)
+                 for _ in range(args.repeat)), key=lambda r: r[1])
+            print(f"    {label:<13}: load_all {load_s:.3f} s, borrow pertama "
+                  f"{borrow_s * 1000:.1f} ms, return pertama {return_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
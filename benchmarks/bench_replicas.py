@@ -0,0 +1,85 @@
+"""
+Benchmark read replica multi-process di atas snapshot katalog mmap
+Primary mem-publish snapshot lalu N process worker menjalankan get_book/pencarian
+lewat CatalogReplica; di tengah run primary mengubah buku dan publish versi baru
+
+Usage:
+    python benchmarks/bench_replicas.py --books 100000 --workers 1 2 4 --seconds 3
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic_data import make_books
+from src.library_manager import LibraryManager
+from src.replica import CatalogPublisher, CatalogReplica
+
+
+def worker(directory: str, book_ids, seconds: float, seed: int, results) -> None:
+    rng = random.Random(seed)
+    replica = CatalogReplica(directory, check_interval=0.2)
+    versions = {replica.version}
+    queries = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if queries % 50 == 0:
+            replica.search_books(title="a", limit=20)
+        else:
+            replica.get_book(rng.choice(book_ids))
+        versions.add(replica.version)
+        queries += 1
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((queries, sorted(versions), rss_mb))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    library = LibraryManager()
+    for book in make_books(args.books, random.Random(42)):
+        library.add_book(book)
+    book_ids = [book_id for book_id, _ in library.get_all_books()]
+
+    # spawn: worker tidak mewarisi memori primary, RSS yang dilaporkan milik replika sendiri
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        publisher = CatalogPublisher(library, directory)
+        start = time.perf_counter()
+        print(publisher.publish()[1], f"dalam {time.perf_counter() - start:.2f}s")
+
+        for workers in args.workers:
+            results = context.Queue()
+            pool = [context.Process(target=worker,
+                                    args=(directory, book_ids, args.seconds, seed, results))
+                    for seed in range(workers)]
+            for p in pool:
+                p.start()
+
+            time.sleep(args.seconds / 2)
+            library.update_book(book_ids[0], title="Judul Revisi")
+            publisher.publish_if_changed()
+
+            stats = [results.get() for _ in pool]
+            for p in pool:
+                p.join()
+            total = sum(queries for queries, _, _ in stats)
+            versions = sorted({tuple(v) for _, v, _ in stats})
+            max_rss = max(rss for _, _, rss in stats)
+            print(f"{workers:2d} worker : {total / args.seconds:10.0f} query/s   "
+                  f"versi={versions}   RSS maks/worker={max_rss:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark throughput borrow/return: backend JSON vs SQLite
+Kedua backend memanggil save_all setelah tiap operasi (path yang dipakai
+GUI/BackgroundSaver): JSON menulis ulang semua file, SQLite hanya
+meng-upsert baris yang berubah (buku dan transaksi).
+
+Usage:
+    python benchmarks/bench_storage_backends.py --books 10000 --ops 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.library_manager import LibraryManager
+from src.auth import AuthenticationManager
+from src.persistence import DataPersistence
+from src.sqlite_persistence import SQLitePersistence
+from synthetic_data import make_books
+
+
+def run_ops(library: LibraryManager, ops: int, rng: random.Random, on_change) -> float:
+    """Jalankan borrow lalu return bergantian, panggil on_change() setelah tiap operasi"""
+    book_ids = [book_id for book_id, _ in library.get_all_books()]
+    start = time.perf_counter()
+    for _ in range(ops // 2):
+        book_id = rng.choice(book_ids)
+        success, _, trans_id = library.borrow_book("bench-user", book_id)
+        if not success:
+            continue
+        on_change()
+        library.return_book(trans_id)
+        on_change()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    books = make_books(args.books, random.Random(42))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Backend JSON
+        library, auth = LibraryManager(), AuthenticationManager()
+        for book in books:
+            library.add_book(book)
+        json_store = DataPersistence(os.path.join(tmp, "json"))
+        elapsed = run_ops(library, args.ops, random.Random(1),
+                          lambda: json_store.save_all(library, auth))
+        print(f"JSON   : {args.ops / elapsed:10.1f} ops/s ({elapsed:.2f} s)")
+
+        # Backend SQLite
+        library = LibraryManager()
+        for book in make_books(args.books, random.Random(42)):
+            library.add_book(book)
+        sqlite_store = SQLitePersistence(os.path.join(tmp, "library.db"))
+        sqlite_store.save_all(library, auth)
+        elapsed = run_ops(library, args.ops, random.Random(1),
+                          lambda: sqlite_store.save_all(library, auth))
+        print(f"SQLite : {args.ops / elapsed:10.1f} ops/s ({elapsed:.2f} s)")
+        sqlite_store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Benchmark suite struktur data dan hot path LibraryManager dengan output JSON
+Setiap case diukur `--repeat` kali per skala; hasil (best/median, op/s) ditulis ke JSON
+agar bisa dibandingkan antar commit dengan --compare
+
+Usage:
+    python benchmarks/run_benchmarks.py --scales 1k 100k --output bench-new.json
+    python benchmarks/run_benchmarks.py --scales 1k 100k 1m --only bst hash_table
+    python benchmarks/run_benchmarks.py --scales 1k --compare bench-old.json --threshold 0.1
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic_data import WORDS, CATEGORIES, write_dataset
+from src.auth import AuthenticationManager
+from src.data_structures import BinarySearchTree, HashTable, LinkedList, MinHeap, Graph
+from src.library_manager import LibraryManager
+from src.persistence import DataPersistence
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+LOOKUPS = 100_000       # Batas operasi O(log n)/O(1) per case
+LINEAR_BUDGET = 10**7   # Operasi O(n) per case dibatasi ~LINEAR_BUDGET / n
+LIBRARY_BUDGET = 10**6  # Idem untuk method LibraryManager (per elemen jauh lebih mahal)
+MIN_TIME = 0.1          # Detik minimum per pengukuran
+
+
+def linear_ops(n: int, cap: int = 1000, budget: int = LINEAR_BUDGET) -> int:
+    """Jumlah operasi untuk case O(n) per operasi (skala besar -> lebih sedikit)"""
+    return max(10, min(cap, budget // n))
+
+
+def measure(run: Callable[[], Any], repeat: int) -> List[float]:
+    """
+    Waktu per run() (detik) untuk `repeat` pengukuran
+    Run pertama sekaligus kalibrasi: case yang lebih cepat dari MIN_TIME diulang
+    beberapa kali per pengukuran agar resolusi/noise timer tidak dominan
+    """
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    first = time.perf_counter() - start
+    if first >= MIN_TIME:
+        times, loops = [first], 1
+    else:
+        times, loops = [], int(MIN_TIME / max(first, 1e-6)) + 1
+
+    while len(times) < repeat:
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        times.append((time.perf_counter() - start) / loops)
+    return times
+
+
+def make_keys(n: int, rng: random.Random) -> List[str]:
+    return [f"{rng.getrandbits(64):016x}" for _ in range(n)]
+
+
+# ==================== STRUKTUR DATA ====================
+
+def bench_bst(n: int, rng: random.Random, repeat: int):
+    keys = make_keys(n, rng)
+    lookups = [rng.choice(keys) if i % 2 else f"x{i}" for i in range(min(n, LOOKUPS))]
+
+    def build():
+        bst = BinarySearchTree()
+        for key in keys:
+            bst.insert(key, key)
+        return bst
+
+    yield "bst.insert", n, measure(build, repeat)
+    bst = build()
+    yield "bst.search", len(lookups), measure(lambda: [bst.search(key) for key in lookups], repeat)
+
+
+def bench_hash_table(n: int, rng: random.Random, repeat: int):
+    keys = make_keys(n, rng)
+    lookups = [rng.choice(keys) if i % 2 else f"x{i}" for i in range(min(n, LOOKUPS))]
+
+    def build():
+        table = HashTable()
+        for key in keys:
+            table.insert(key, key)
+        return table
+
+    yield "hash_table.insert", n, measure(build, repeat)
+    table = build()
+    yield "hash_table.search", len(lookups), measure(lambda: [table.search(key) for key in lookups], repeat)
+
+
+def bench_linked_list(n: int, rng: random.Random, repeat: int):
+    def build():
+        linked_list = LinkedList()
+        for i in range(n):
+            linked_list.append(i)
+        return linked_list
+
+    yield "linked_list.append", n, measure(build, repeat)
+    linked_list = build()
+    indexes = [rng.randrange(n) for _ in range(linear_ops(n))]
+    yield "linked_list.get", len(indexes), measure(lambda: [linked_list.get(i) for i in indexes], repeat)
+    yield "linked_list.get_all", n, measure(lambda: linked_list.get_all(), repeat)
+
+
+def bench_min_heap(n: int, rng: random.Random, repeat: int):
+    items = [(rng.random(), i) for i in range(n)]
+
+    def push_pop():
+        heap = MinHeap()
+        for item in items:
+            heap.insert(item)
+        while heap.size():
+            heap.extract_min()
+
+    yield "min_heap.insert_extract", 2 * n, measure(push_pop, repeat)
+
+
+def bench_graph(n: int, rng: random.Random, repeat: int):
+    edges = [(f"b{rng.randrange(n)}", f"b{rng.randrange(n)}", rng.random()) for _ in range(4 * n)]
+
+    def build():
+        graph = Graph()
+        for i in range(n):
+            graph.add_node(f"b{i}", f"Buku {i}")
+        for source, target, weight in edges:
+            graph.add_edge(source, target, weight)
+        return graph
+
+    yield "graph.build", n + len(edges), measure(build, repeat)
+    graph = build()
+    sources = [f"b{rng.randrange(n)}" for _ in range(min(n, 1000))]
+    yield "graph.get_recommendations", len(sources), measure(
+        lambda: [graph.get_recommendations(source, depth=2, limit=10) for source in sources], repeat)
+
+
+# ==================== LIBRARY MANAGER & PERSISTENCE ====================
+
+def bench_library(n: int, rng: random.Random, repeat: int):
+    """Dataset sintetis n buku / n transaksi; load_all juga menyiapkan library untuk case lain"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_dataset(data_dir, n, max(1, n // 10), n, n // 10, n // 10, seed=rng.randrange(2**32))
+        persistence = DataPersistence(data_dir)
+        loaded = []
+
+        def load():
+            library, auth = LibraryManager(), AuthenticationManager()
+            success, msg = persistence.load_all(library, auth)
+            if not success:
+                raise RuntimeError(msg)
+            loaded[:] = [library, auth]
+
+        yield "persistence.load_all", n, measure(load, repeat)
+        library, auth = loaded
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            out = DataPersistence(out_dir)
+            yield "persistence.save_all", n, measure(lambda: out.save_all(library, auth), repeat)
+
+    queries = [dict(title=WORDS[i % len(WORDS)]) if i % 3 == 0 else
+               dict(category=CATEGORIES[i % len(CATEGORIES)], year=1950 + i % 75) if i % 3 == 1 else
+               dict(author=f"Author {i + 1}")
+               for i in range(linear_ops(n, cap=100, budget=LIBRARY_BUDGET))]
+    yield "library.search_books_multi_criteria", len(queries), measure(
+        lambda: [library.search_books_multi_criteria(**query) for query in queries], repeat)
+
+    book_ids = [book_id for book_id, _ in library.get_all_books()]
+    picks = [rng.choice(book_ids) for _ in range(linear_ops(n, cap=500, budget=LIBRARY_BUDGET))]
+
+    def borrow_return():
+        for book_id in picks:
+            success, _, transaction_id = library.borrow_book("bench-user", book_id)
+            if success:
+                library.return_book(transaction_id)
+
+    yield "library.borrow_return", len(picks), measure(borrow_return, repeat)
+
+    calls = linear_ops(n, cap=100, budget=LIBRARY_BUDGET)
+    yield "library.generate_statistics", calls, measure(
+        lambda: [library.generate_statistics() for _ in range(calls)], repeat)
+
+
+SUITES = {
+    "bst": bench_bst,
+    "hash_table": bench_hash_table,
+    "linked_list": bench_linked_list,
+    "min_heap": bench_min_heap,
+    "graph": bench_graph,
+    "library": bench_library,
+}
+
+
+# ==================== RUNNER ====================
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float) -> int:
+    """Cetak rasio op/s terhadap baseline; Returns: jumlah case yang regresi"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r["name"], r["scale"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"\nDibanding {baseline_path} (regresi jika < {1 - threshold:.0%} op/s baseline):")
+    for result in results:
+        old = baseline.get((result["name"], result["scale"]))
+        if old is None or old["ops"] != result["ops"]:
+            continue  # Case baru / jumlah operasi berbeda: tidak sebanding
+        ratio = result["ops_per_s"] / old["ops_per_s"]
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  REGRESI"
+            regressions += 1
+        print(f"  {result['name']:<38} {result['scale']:>5}  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", nargs="+", default=["1k", "100k"], choices=list(SCALES),
+                        help="1m butuh beberapa GB RAM dan beberapa menit")
+    parser.add_argument("--only", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="file JSON hasil run sebelumnya")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="penurunan op/s yang dianggap regresi (0.1 = 10%%)")
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        n = SCALES[scale]
+        for suite in args.only:
+            # Seed per (skala, suite): hasil tidak bergantung pada suite lain yang dijalankan
+            rng = random.Random(f"{args.seed}-{scale}-{suite}")
+            for name, ops, times in SUITES[suite](n, rng, args.repeat):
+                best = min(times)
+                results.append({
+                    "name": name,
+                    "scale": scale,
+                    "n": n,
+                    "ops": ops,
+                    "repeat": len(times),
+                    "best_s": best,
+                    "median_s": statistics.median(times),
+                    "ops_per_s": ops / best,
+                })
+                print(f"{name:<38} {scale:>5}  {ops:>9} op  best {best:9.4f}s  "
+                      f"{results[-1]['ops_per_s']:12.0f} op/s", flush=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil ditulis ke {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
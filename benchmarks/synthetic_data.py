@@ -0,0 +1,111 @@
+"""
+Synthetic Data Generator untuk Benchmark Sistem Perpustakaan Digital
+Menulis file data/*.json berukuran besar tanpa melalui PBKDF2/GUI
+"""
+
+import json
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from src.models import Book, User, Transaction, Reservation, Review, SearchHistory
+
+CATEGORIES = ["Programming", "Computer Science", "History", "Biography",
+              "Psychology", "Science", "Fiction"]
+WORDS = ["data", "python", "sejarah", "algoritma", "novel", "ilmu", "dunia",
+         "cinta", "kode", "sistem", "jaringan", "budaya", "alam", "kota"]
+
+
+def _short_id(rng: random.Random) -> str:
+    return uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+
+
+def make_books(count: int, rng: random.Random):
+    """Generate list Book acak (ID acak agar BST tetap seimbang)"""
+    books = []
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(3)).title() + f" {i}"
+        copies = rng.randint(1, 8)
+        books.append(Book(
+            book_id=_short_id(rng),
+            title=title,
+            author=f"Author {rng.randint(1, max(1, count // 10))}",
+            publisher="Penerbit Benchmark",
+            isbn=f"978-{rng.randint(0, 10**9):09d}",
+            publication_year=rng.randint(1950, 2024),
+            category=rng.choice(CATEGORIES),
+            total_copies=copies,
+            available_copies=copies,
+            location=f"Rak {rng.choice('ABCD')}{rng.randint(1, 9)}",
+            description=f"Buku tentang {' '.join(rng.choice(WORDS) for _ in range(8))}"
+        ))
+    return books
+
+
+def make_users(count: int, rng: random.Random):
+    """Generate list User acak (password hash palsu, tanpa PBKDF2)"""
+    return [
+        User(
+            user_id=_short_id(rng),
+            username=f"member{i}",
+            password_hash=f"{'0' * 64}${'1' * 32}",
+            full_name=f"Member {i}",
+            email=f"member{i}@example.com",
+            phone="0812-0000-0000",
+            address="Jl. Benchmark"
+        )
+        for i in range(count)
+    ]
+
+
+def write_dataset(data_dir: str, n_books: int, n_users: int, n_transactions: int,
+                  n_reviews: int = 0, n_searches: int = 0, seed: int = 42) -> None:
+    """Tulis dataset sintetis ke data_dir dengan layout yang sama seperti DataPersistence"""
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+
+    books = make_books(n_books, rng)
+    users = make_users(n_users, rng)
+    now = datetime.now()
+
+    transactions = []
+    for _ in range(n_transactions):
+        book = rng.choice(books)
+        user = rng.choice(users)
+        date = now - timedelta(days=rng.randint(0, 365))
+        closed = rng.random() < 0.8
+        transactions.append(Transaction(
+            transaction_id=_short_id(rng),
+            user_id=user.user_id,
+            book_id=book.book_id,
+            transaction_type="Peminjaman",
+            transaction_date=date.isoformat(),
+            due_date=(date + timedelta(days=7)).isoformat(),
+            return_date=(date + timedelta(days=rng.randint(1, 10))).isoformat() if closed else None,
+            status="Selesai" if closed else "Aktif"
+        ))
+
+    reviews = [
+        Review(review_id=_short_id(rng), book_id=rng.choice(books).book_id,
+               user_id=rng.choice(users).user_id, rating=rng.randint(1, 5),
+               review_text="Bagus sekali " * rng.randint(1, 5))
+        for _ in range(n_reviews)
+    ]
+    searches = [
+        SearchHistory(search_id=_short_id(rng), user_id=rng.choice(users).user_id,
+                      query=rng.choice(WORDS), results_count=rng.randint(0, 50))
+        for _ in range(n_searches)
+    ]
+
+    collections = {
+        "books.json": books,
+        "users.json": users,
+        "transactions.json": transactions,
+        "reservations.json": [],
+        "reviews.json": reviews,
+        "search_history.json": searches,
+    }
+    for filename, items in collections.items():
+        with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump([item.to_dict() for item in items], f, ensure_ascii=False)
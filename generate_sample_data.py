@@ -102,27 +102,31 @@ def generate_sample_data():
     
     all_books = [b for _, b in library.books_bst.get_all()]
     
+    relationships = []
+    
     # Connect programming books
     programming_books = [b for b in all_books if b.category == "Programming"]
     for i in range(len(programming_books)):
         for j in range(i+1, len(programming_books)):
             similarity = 0.9 - (0.1 * (j - i))
-            library.add_book_relationship(
+            relationships.append((
                 programming_books[i].book_id,
                 programming_books[j].book_id,
                 similarity
-            )
+            ))
     
     # Connect fiction books
     fiction_books = [b for b in all_books if b.category == "Fiction"]
     for i in range(len(fiction_books)):
         for j in range(i+1, len(fiction_books)):
             similarity = 0.85 - (0.1 * (j - i))
-            library.add_book_relationship(
+            relationships.append((
                 fiction_books[i].book_id,
                 fiction_books[j].book_id,
                 similarity
-            )
+            ))
+    
+    library.add_book_relationships(relationships)
     
     print(f"  ✓ Book relationships created")
     
@@ -0,0 +1,23 @@
+"""
+Migrasi Data JSON ke SQLite untuk Sistem Perpustakaan Digital
+Menyalin data/*.json ke database SQLite (default: data/library.db)
+
+Usage:
+    python migrate_to_sqlite.py [data_dir] [db_path]
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.sqlite_persistence import migrate_json_to_sqlite
+
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    db_path = sys.argv[2] if len(sys.argv) > 2 else None
+    
+    success, message = migrate_json_to_sqlite(data_dir, db_path)
+    print(("✓ " if success else "✗ ") + message)
+    sys.exit(0 if success else 1)
@@ -14,9 +14,14 @@ from src.data_structures import (
     Stack,
     Graph,
     LinkedList,
-    MinHeap
+    LazyLinkedList,
+    MinHeap,
+    LRUCache,
+    SortedIndex
 )
 
+from src.concurrency import ReadWriteLock, StripedLock
+
 from src.models import (
     Book,
     User,
@@ -31,7 +36,10 @@ from src.models import (
 
 from src.auth import AuthenticationManager
 from src.library_manager import LibraryManager
-from src.persistence import DataPersistence
+from src.persistence import BackgroundSaver, DataPersistence
+from src.sqlite_persistence import SQLitePersistence
+from src.api_server import LibraryAPIServer
+from src.replica import CatalogPublisher, CatalogReplica
 
 __version__ = "1.0.0"
 __all__ = [
@@ -41,7 +49,12 @@ __all__ = [
     "Stack",
     "Graph",
     "LinkedList",
+    "LazyLinkedList",
     "MinHeap",
+    "LRUCache",
+    "SortedIndex",
+    "ReadWriteLock",
+    "StripedLock",
     "Book",
     "User",
     "Transaction",
@@ -53,5 +66,10 @@ __all__ = [
     "UserRole",
     "AuthenticationManager",
     "LibraryManager",
-    "DataPersistence"
+    "DataPersistence",
+    "BackgroundSaver",
+    "SQLitePersistence",
+    "LibraryAPIServer",
+    "CatalogPublisher",
+    "CatalogReplica"
 ]
@@ -0,0 +1,488 @@
+"""
+Module HTTP/JSON API untuk Sistem Perpustakaan Digital
+Server asyncio (stdlib) di atas LibraryManager & AuthenticationManager,
+untuk melayani banyak meja layanan atau katalog web sekaligus
+
+Endpoint (body & response JSON, session lewat header "Authorization: Bearer <id>"):
+    POST /login                          {username, password} -> {session_id}
+    POST /logout
+    GET  /books/search?title=&author=&category=&year=&limit=
+    GET  /books/<book_id>
+    GET  /books/<book_id>/recommendations?depth=&limit=
+    GET  /me/recommendations?limit=
+    POST /borrow                         {book_id | book_ids[, user_id (staff)][, duration_days]}
+    POST /return                         {transaction_id | transaction_ids}   (staff)
+    POST /reserve                        {book_id}
+    POST /reviews                        {book_id, rating, review_text}
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from src.auth import AuthenticationManager
+from src.library_manager import LibraryManager
+from src.models import UserRole
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+    404: "Not Found", 405: "Method Not Allowed", 408: "Request Timeout",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+    501: "Not Implemented", 503: "Service Unavailable",
+}
+
+STAFF_ROLES = (UserRole.LIBRARIAN.value, UserRole.ADMIN.value)
+
+
+class HTTPError(Exception):
+    """Error yang dikirim ke client sebagai response JSON {success: false, message}"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class LibraryAPIServer:
+    """
+    Server HTTP/1.1 asyncio dengan keep-alive
+    - Request dibatasi max_concurrent sekaligus (semaphore); sisanya menunggu
+    - Pekerjaan berat CPU (PBKDF2 login, pencarian, rekomendasi) dijalankan di
+      executor agar event loop tetap melayani koneksi lain
+    - Mutasi juga dijalankan di executor; jika `saver` (BackgroundSaver)
+      diberikan, mutasi memegang saver.lock (di worker, bukan di event loop)
+      dan disimpan di background
+    - Body hanya dibaca lewat Content-Length; Transfer-Encoding ditolak
+      (411 untuk chunked, 501 untuk coding lain) dan koneksi ditutup
+    """
+
+    MAX_HEADER_BYTES = 16 * 1024
+    MAX_BODY_BYTES = 1024 * 1024
+    SEARCH_LIMIT = 100
+    MAX_DEPTH = 5  # Depth maksimum rekomendasi per request
+    BATCH_LIMIT = 200  # Item maksimum per request borrow/return batch
+
+    def __init__(self, library_manager: LibraryManager, auth_manager: AuthenticationManager,
+                 host: str = "127.0.0.1", port: int = 8080, max_concurrent: int = 64,
+                 keep_alive_timeout: float = 15.0, saver=None,
+                 max_workers: Optional[int] = None):
+        self.library_manager = library_manager
+        self.auth_manager = auth_manager
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.keep_alive_timeout = keep_alive_timeout
+        self.saver = saver
+        self.max_workers = max_workers or os.cpu_count()
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}  # koneksi yang masih terbuka
+        self.request_count = 0
+
+        self._routes = {
+            ("POST", "login"): self._login,
+            ("POST", "logout"): self._logout,
+            ("GET", "books/search"): self._search,
+            ("GET", "me/recommendations"): self._user_recommendations,
+            ("POST", "borrow"): self._borrow,
+            ("POST", "return"): self._return,
+            ("POST", "reserve"): self._reserve,
+            ("POST", "reviews"): self._review,
+        }
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        """Mulai listen (port 0 = pilih port bebas; port sebenarnya di self.port)"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="api-worker")
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=self.MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Start lalu layani request sampai dibatalkan"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """Tutup listener, koneksi keep-alive yang masih terbuka, dan worker pool"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Koneksi keep-alive ditutup dari sisi transport (bukan task.cancel()) sehingga
+        # handler selesai lewat jalur EOF biasa
+        connections = list(self._connections.items())
+        for _, writer in connections:
+            writer.close()
+        await asyncio.gather(*(task for task, _ in connections), return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # ==================== HTTP ====================
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"),
+                                                  self.keep_alive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write_response(writer, 413, {"success": False,
+                                                             "message": "Header terlalu besar"}, False)
+                    break
+
+                keep_alive = await self._handle_request(head, reader, writer)
+                if not keep_alive:
+                    break
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_request(self, head: bytes, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> bool:
+        """Proses satu request; Returns: apakah koneksi dipertahankan"""
+        keep_alive = False
+        try:
+            method, target, version, headers = self._parse_head(head)
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+            # Body chunked tidak di-parse: jika dibiarkan, isinya akan terbaca
+            # sebagai request berikutnya di koneksi keep-alive
+            transfer_encoding = headers.get("transfer-encoding")
+            if transfer_encoding is not None:
+                keep_alive = False
+                if "chunked" in transfer_encoding.lower():
+                    raise HTTPError(411, "Body chunked tidak didukung, gunakan Content-Length")
+                raise HTTPError(501, "Transfer-Encoding tidak didukung")
+
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                keep_alive = False
+                raise HTTPError(400, "Content-Length tidak valid")
+            if length > self.MAX_BODY_BYTES:
+                keep_alive = False
+                raise HTTPError(413, "Body terlalu besar")
+            body = await reader.readexactly(length) if length else b""
+
+            async with self._semaphore:
+                self.request_count += 1
+                status, payload = await self._dispatch(method, target, headers, body)
+        except HTTPError as e:
+            status, payload = e.status, {"success": False, "message": e.message}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return False
+        except Exception as e:
+            status, payload = 500, {"success": False, "message": f"Error server: {str(e)}"}
+
+        await self._write_response(writer, status, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        try:
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Request line tidak valid")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, version, headers
+
+    async def _write_response(self, writer: asyncio.StreamWriter, status: int,
+                              payload: Dict[str, Any], keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str],
+                        body: bytes) -> Tuple[int, Dict[str, Any]]:
+        url = urlsplit(target)
+        path = url.path.strip("/")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        data = {}
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "Body bukan JSON yang valid")
+            if not isinstance(data, dict):
+                raise HTTPError(400, "Body harus berupa objek JSON")
+
+        request = {"query": query, "data": data, "headers": headers}
+        handler = self._routes.get((method, path))
+        if handler is not None:
+            return await handler(request)
+
+        # /books/<id> dan /books/<id>/recommendations
+        parts = path.split("/")
+        if parts[0] == "books" and len(parts) in (2, 3):
+            if method != "GET":
+                raise HTTPError(405, "Method tidak diizinkan")
+            if len(parts) == 2:
+                return await self._get_book(request, parts[1])
+            if parts[2] == "recommendations":
+                return await self._book_recommendations(request, parts[1])
+
+        if any(route_path == path for _, route_path in self._routes):
+            raise HTTPError(405, "Method tidak diizinkan")
+        raise HTTPError(404, "Endpoint tidak ditemukan")
+
+    # ==================== HELPERS ====================
+
+    async def _run_in_executor(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _mutate(self, func, *args):
+        """
+        Jalankan mutasi di executor (di bawah lock BackgroundSaver jika ada)
+        agar menunggu saver.lock tidak memblokir event loop
+        """
+        return await self._run_in_executor(self._mutate_sync, func, *args)
+
+    def _mutate_sync(self, func, *args):
+        if self.saver is None:
+            return func(*args)
+        with self.saver.mutation():
+            return func(*args)
+
+    async def _current_user(self, request: Dict[str, Any]):
+        """
+        User dari header Authorization: Bearer <session_id>
+        (lookup di executor karena memegang auth_manager.lock)
+        """
+        auth = request["headers"].get("authorization", "")
+        if not auth.lower().startswith("bearer "):
+            raise HTTPError(401, "Session diperlukan")
+        return await self._run_in_executor(self._session_user, auth[7:].strip())
+
+    def _session_user(self, session_id: str):
+        valid, user_id = self.auth_manager.validate_session(session_id)
+        if not valid:
+            raise HTTPError(401, "Session tidak valid atau kadaluarsa")
+        user = self.auth_manager.get_user_by_id(user_id)
+        if user is None or not user.is_active:
+            raise HTTPError(401, "User tidak aktif")
+        return user
+
+    @staticmethod
+    def _require(data: Dict[str, Any], *fields: str) -> None:
+        missing = [name for name in fields if data.get(name) in (None, "")]
+        if missing:
+            raise HTTPError(400, f"Field wajib: {', '.join(missing)}")
+
+    def _id_list(self, data: Dict[str, Any], single: str, many: str) -> Optional[list]:
+        """List ID batch dari field `many`, atau None jika request memakai field `single`"""
+        if many not in data:
+            self._require(data, single)
+            return None
+        ids = data[many]
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, str) for i in ids):
+            raise HTTPError(400, f"{many} harus berupa list ID")
+        if len(ids) > self.BATCH_LIMIT:
+            raise HTTPError(413, f"Maksimal {self.BATCH_LIMIT} item per batch")
+        return ids
+
+    def _batch_result(self, ids: list, results: list, id_field: str,
+                      value_field: str) -> Tuple[int, Dict[str, Any]]:
+        """Response batch: hasil per item, berurutan sesuai ID di request"""
+        succeeded = sum(1 for success, _, _ in results if success)
+        return self._result(True, f"{succeeded}/{len(results)} item berhasil", results=[
+            {id_field: item_id, "success": success, "message": message, value_field: value}
+            for item_id, (success, message, value) in zip(ids, results)
+        ])
+
+    @staticmethod
+    def _int_param(query: Dict[str, str], name: str, default: int,
+                   minimum: Optional[int] = None, maximum: Optional[int] = None) -> int:
+        try:
+            value = int(query.get(name, default))
+        except ValueError:
+            raise HTTPError(400, f"Parameter {name} harus berupa angka")
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise HTTPError(400, f"Parameter {name} harus di antara {minimum} dan {maximum}")
+        return value
+
+    @staticmethod
+    def _result(success: bool, message: str, **extra) -> Tuple[int, Dict[str, Any]]:
+        payload = {"success": success, "message": message}
+        payload.update(extra)
+        return (200 if success else 400), payload
+
+    # ==================== ENDPOINTS ====================
+
+    async def _login(self, request):
+        data = request["data"]
+        self._require(data, "username", "password")
+        success, message, session_id = await asyncio.wrap_future(
+            self.auth_manager.login_async(data["username"], data["password"])
+        )
+        if not success:
+            raise HTTPError(401, message)
+        return self._result(True, message, session_id=session_id)
+
+    async def _logout(self, request):
+        await self._current_user(request)
+        session_id = request["headers"]["authorization"][7:].strip()
+        await self._run_in_executor(self.auth_manager.logout, session_id)
+        return self._result(True, "Logout berhasil")
+
+    async def _search(self, request):
+        query = request["query"]
+        limit = self._int_param(query, "limit", 20, 1, self.SEARCH_LIMIT)
+        year = self._int_param(query, "year", 0)
+        books = await self._run_in_executor(
+            lambda: self.library_manager.search_books_multi_criteria(
+                title=query.get("title", ""), author=query.get("author", ""),
+                category=query.get("category", ""), year=year, limit=limit
+            )
+        )
+        return self._result(True, f"{len(books)} buku ditemukan",
+                            books=[book.to_dict() for book in books])
+
+    async def _get_book(self, request, book_id: str):
+        book = await self._run_in_executor(self.library_manager.get_book, book_id)
+        if book is None:
+            raise HTTPError(404, "Buku tidak ditemukan")
+        return self._result(True, "OK", book=book.to_dict())
+
+    async def _book_recommendations(self, request, book_id: str):
+        query = request["query"]
+        depth = self._int_param(query, "depth", 2, 1, self.MAX_DEPTH)
+        limit = self._int_param(query, "limit", 10, 1, self.SEARCH_LIMIT)
+        recommendations = await self._run_in_executor(
+            self.library_manager.get_recommendations, book_id, depth, limit
+        )
+        return self._result(True, "OK", recommendations=[
+            {"title": title, "score": score} for title, score in recommendations
+        ])
+
+    async def _user_recommendations(self, request):
+        user = await self._current_user(request)
+        limit = self._int_param(request["query"], "limit", 10, 1, self.SEARCH_LIMIT)
+        recommendations = await self._run_in_executor(
+            self.library_manager.get_user_recommendations, user.user_id, limit
+        )
+        return self._result(True, "OK", recommendations=[
+            {"title": title, "score": score} for title, score in recommendations
+        ])
+
+    async def _borrow(self, request):
+        user = await self._current_user(request)
+        data = request["data"]
+        book_ids = self._id_list(data, "book_id", "book_ids")
+        user_id = user.user_id
+        if data.get("user_id") and data["user_id"] != user.user_id:
+            if user.role not in STAFF_ROLES:
+                raise HTTPError(403, "Hanya staff yang dapat meminjamkan untuk user lain")
+            user_id = data["user_id"]
+        duration = data.get("duration_days", 7)
+        if not isinstance(duration, int) or duration <= 0:
+            raise HTTPError(400, "duration_days harus bilangan bulat positif")
+
+        if book_ids is not None:
+            results = await self._mutate(self.library_manager.borrow_many, user_id, book_ids, duration)
+            return self._batch_result(book_ids, results, "book_id", "transaction_id")
+        success, message, transaction_id = await self._mutate(
+            self.library_manager.borrow_book, user_id, data["book_id"], duration
+        )
+        return self._result(success, message, transaction_id=transaction_id)
+
+    async def _return(self, request):
+        user = await self._current_user(request)
+        if user.role not in STAFF_ROLES:
+            raise HTTPError(403, "Hanya staff yang dapat memproses pengembalian")
+        data = request["data"]
+        transaction_ids = self._id_list(data, "transaction_id", "transaction_ids")
+        if transaction_ids is not None:
+            results = await self._mutate(self.library_manager.return_many, transaction_ids)
+            return self._batch_result(transaction_ids, results, "transaction_id", "fine_amount")
+        success, message, fine = await self._mutate(self.library_manager.return_book,
+                                              data["transaction_id"])
+        return self._result(success, message, fine_amount=fine)
+
+    async def _reserve(self, request):
+        user = await self._current_user(request)
+        data = request["data"]
+        self._require(data, "book_id")
+        success, message, reservation_id = await self._mutate(
+            self.library_manager.reserve_book, user.user_id, data["book_id"]
+        )
+        return self._result(success, message, reservation_id=reservation_id)
+
+    async def _review(self, request):
+        user = await self._current_user(request)
+        data = request["data"]
+        self._require(data, "book_id", "rating")
+        if not isinstance(data["rating"], int):
+            raise HTTPError(400, "rating harus berupa angka 1-5")
+        success, message = await self._mutate(self.library_manager.add_review, user.user_id,
+                                        data["book_id"], data["rating"],
+                                        data.get("review_text", ""))
+        return self._result(success, message)
+
+
+def main(argv=None) -> None:
+    """Jalankan API server dengan data dari folder data/ (disimpan di background)"""
+    import argparse
+    from src.persistence import BackgroundSaver, DataPersistence
+
+    parser = argparse.ArgumentParser(description="HTTP/JSON API Sistem Perpustakaan Digital")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--max-concurrent", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    library_manager = LibraryManager()
+    auth_manager = AuthenticationManager()
+    persistence = DataPersistence(args.data_dir)
+    success, message = persistence.load_all(library_manager, auth_manager, lazy=True)
+    print(message)
+
+    saver = BackgroundSaver(persistence, library_manager, auth_manager)
+    server = LibraryAPIServer(library_manager, auth_manager, args.host, args.port,
+                              max_concurrent=args.max_concurrent, saver=saver)
+    print(f"API server berjalan di http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        saver.stop()
+        auth_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,214 @@ Menangani user authentication dengan secure password hashing
 """
 
 import hashlib
+import math
+import os
 import secrets
-from typing import Optional, Tuple
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from src.data_structures import HashTable
+from src.data_structures import HashTable, MinHeap, LRUCache, SortedIndex
 from src.models import User, UserRole
 
 
+class SessionStore:
+    """
+    Penyimpanan session dengan expiry
+    - dict session_id -> (user_id, expiry_time) untuk lookup O(1)
+    - MinHeap (expiry, session_id) untuk sweeping session kadaluarsa O(log n)
+    - index user_id -> session_id untuk revoke O(k)
+    - jumlah session dibatasi max_sessions
+    Tidak thread-safe sendiri; AuthenticationManager memakainya di bawah lock
+    """
+
+    def __init__(self, max_sessions: int = 10000):
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, Tuple[str, datetime]] = {}
+        self._expiry_heap: MinHeap = MinHeap()  # Entry lama dibiarkan (lazy deletion)
+        self._by_user: Dict[str, set] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __getitem__(self, session_id: str) -> Tuple[str, datetime]:
+        return self._sessions[session_id]
+
+    def __delitem__(self, session_id: str) -> None:
+        if not self.remove(session_id):
+            raise KeyError(session_id)
+
+    def items(self):
+        """Get semua (session_id, (user_id, expiry_time))"""
+        return self._sessions.items()
+
+    def get(self, session_id: str) -> Optional[Tuple[str, datetime]]:
+        """Get (user_id, expiry_time) atau None"""
+        return self._sessions.get(session_id)
+
+    def create(self, session_id: str, user_id: str, expiry_time: datetime) -> None:
+        """Simpan session baru; session kadaluarsa di-sweep lebih dulu"""
+        self.sweep()
+        
+        # Batas ukuran: buang session yang paling cepat kadaluarsa
+        while len(self._sessions) >= self.max_sessions:
+            self._pop_earliest()
+        
+        self._sessions[session_id] = (user_id, expiry_time)
+        self._expiry_heap.insert((expiry_time.timestamp(), session_id))
+        self._by_user.setdefault(user_id, set()).add(session_id)
+
+    def remove(self, session_id: str) -> bool:
+        """Hapus satu session"""
+        entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        
+        user_id, _ = entry
+        user_sessions = self._by_user.get(user_id)
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self._by_user[user_id]
+        
+        self._compact_if_needed()
+        return True
+
+    def revoke_user(self, user_id: str) -> int:
+        """Hapus semua session milik user; Returns: jumlah session yang dihapus"""
+        session_ids = list(self._by_user.get(user_id, ()))
+        for session_id in session_ids:
+            self.remove(session_id)
+        return len(session_ids)
+
+    def user_sessions(self, user_id: str) -> List[str]:
+        """Get semua session_id milik user"""
+        return list(self._by_user.get(user_id, ()))
+
+    def _is_live(self, expiry: float, session_id: str) -> bool:
+        entry = self._sessions.get(session_id)
+        return entry is not None and entry[1].timestamp() == expiry
+
+    def _pop_earliest(self) -> None:
+        """Buang session aktif yang paling cepat kadaluarsa"""
+        while not self._expiry_heap.is_empty():
+            expiry, session_id = self._expiry_heap.extract_min()
+            if self._is_live(expiry, session_id):
+                self.remove(session_id)
+                return
+
+    def sweep(self, now: Optional[datetime] = None) -> int:
+        """
+        Hapus semua session yang sudah kadaluarsa
+        Hanya menyentuh entry di puncak heap, jadi murah dipanggil sering
+        Returns: jumlah session yang dihapus
+        """
+        now_ts = (now or datetime.now()).timestamp()
+        removed = 0
+        while not self._expiry_heap.is_empty() and self._expiry_heap.peek()[0] <= now_ts:
+            expiry, session_id = self._expiry_heap.extract_min()
+            if self._is_live(expiry, session_id):
+                self.remove(session_id)
+                removed += 1
+        return removed
+
+    def _compact_if_needed(self) -> None:
+        """Bangun ulang heap jika entry lama (logout/revoke) terlalu banyak"""
+        if self._expiry_heap.size() > 2 * len(self._sessions) + 64:
+            heap = MinHeap()
+            for session_id, (_, expiry_time) in self._sessions.items():
+                heap.insert((expiry_time.timestamp(), session_id))
+            self._expiry_heap = heap
+
+
+class LoginRateLimiter:
+    """
+    Rate limiter login dengan sliding window
+    Per username disimpan maksimal max_attempts timestamp gagal terakhir;
+    username diblokir jika semuanya jatuh dalam window_seconds terakhir.
+    Jumlah username yang dilacak dibatasi LRUCache, sehingga burst username
+    acak tidak bisa membengkakkan memori. Semua pengecekan O(1).
+    Tidak thread-safe sendiri; AuthenticationManager memakainya di bawah lock
+    """
+
+    def __init__(self, max_attempts: int = 5, window_seconds: int = 300,
+                 max_tracked: int = 10000):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self._failures: LRUCache = LRUCache(capacity=max_tracked)  # key -> deque timestamp
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> float:
+        """Detik sampai key boleh mencoba lagi (0 jika tidak diblokir)"""
+        failures = self._failures.get(key)
+        if failures is None or len(failures) < self.max_attempts:
+            return 0.0
+        now = time.time() if now is None else now
+        return max(0.0, failures[0] + self.window_seconds - now)
+
+    def is_blocked(self, key: str, now: Optional[float] = None) -> bool:
+        """Check apakah key sedang diblokir"""
+        return self.retry_after(key, now) > 0
+
+    def record_failure(self, key: str, now: Optional[float] = None) -> None:
+        """Catat satu percobaan gagal"""
+        failures = self._failures.get(key)
+        if failures is None:
+            failures = deque(maxlen=self.max_attempts)
+        failures.append(time.time() if now is None else now)
+        self._failures.put(key, failures)
+
+    def reset(self, key: str) -> None:
+        """Hapus riwayat gagal (mis. setelah login berhasil)"""
+        self._failures.delete(key)
+
+    def __len__(self) -> int:
+        return len(self._failures)
+
+
 class AuthenticationManager:
     """
     Manager untuk autentikasi user
     Menggunakan Hash Table untuk menyimpan user data
+    
+    Thread-safe: tabel user, session store dan rate limiter dijaga `lock`
+    (login_async/register_users_bulk berjalan di worker pool). Hashing PBKDF2
+    selalu dijalankan di luar lock agar login paralel tidak saling menunggu.
     """
     
-    def __init__(self):
-        self.users: HashTable = HashTable(capacity=200)
-        self.sessions: dict = {}  # session_id -> (user_id, expiry_time)
-        self.failed_login_attempts: dict = {}  # username -> (count, last_attempt_time)
+    # Key wajib per item register_users_bulk
+    BULK_USER_FIELDS = ("username", "password", "full_name", "email", "phone", "address", "user_id")
+    
+    def __init__(self, max_sessions: int = 10000):
+        self.users: HashTable = HashTable(capacity=200)  # username -> User
+        self.users_by_id: HashTable = HashTable(capacity=200)  # user_id -> User
+        self.users_by_email: HashTable = HashTable(capacity=200)  # email (lowercase) -> User
+        self.sessions: SessionStore = SessionStore(max_sessions)  # session_id -> (user_id, expiry_time)
+        self.rate_limiter: LoginRateLimiter = LoginRateLimiter()  # Batas login gagal per username
+        self._executor: Optional[ThreadPoolExecutor] = None  # Pool untuk hashing PBKDF2
+        self._usernames: Optional[SortedIndex] = None  # Username terurut untuk paging (dibangun saat dibutuhkan)
+        self.lock = threading.RLock()  # Tabel user, session & rate limiter
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Thread pool untuk hashing password
+        hashlib.pbkdf2_hmac melepas GIL, jadi thread cukup untuk memakai semua core
+        """
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=os.cpu_count(),
+                                                    thread_name_prefix="auth-hash")
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Hentikan worker pool hashing"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def hash_password(self, password: str, salt: Optional[str] = None) -> Tuple[str, str]:
         """
@@ -58,13 +249,36 @@ class AuthenticationManager:
         if len(password) < 8:
             return False, "Password minimal 8 karakter"
         
-        if self.users.search(username) is not None:
-            return False, "Username sudah terdaftar"
+        with self.lock:
+            conflict = self._find_conflict(username, user_id, email)
+            if conflict:
+                return False, conflict
         
-        # Hash password
+        # Hash password (di luar lock)
         password_hash, salt = self.hash_password(password)
         
-        # Buat user baru
+        # Buat user baru dan simpan ke hash table
+        with self.lock:
+            # Cek ulang: thread lain bisa mendaftarkan user yang sama selama hashing
+            conflict = self._find_conflict(username, user_id, email)
+            if conflict:
+                return False, conflict
+            self._insert_new_user(username, password_hash, salt, full_name, email,
+                                  phone, address, user_id, role)
+        
+        return True, "Registrasi berhasil"
+
+    def register_user_async(self, *args, **kwargs) -> Future:
+        """
+        register_user di worker pool (argumen sama) agar pemanggil tidak terblokir PBKDF2
+        Returns: Future yang menghasilkan (success, message)
+        """
+        return self._get_executor().submit(self.register_user, *args, **kwargs)
+
+    def _insert_new_user(self, username: str, password_hash: str, salt: str, full_name: str,
+                         email: str, phone: str, address: str, user_id: str,
+                         role: str = UserRole.MEMBER.value) -> User:
+        """Buat User dari password yang sudah di-hash dan simpan ke hash table"""
         user = User(
             user_id=user_id,
             username=username,
@@ -76,11 +290,96 @@ class AuthenticationManager:
             role=role,
             is_active=True
         )
+        self.add_user(user)
+        return user
+
+    def _find_conflict(self, username: str, user_id: str, email: str) -> Optional[str]:
+        """
+        Cek apakah username, user_id atau email sudah dipakai user lain
+        Returns: pesan error, atau None jika tidak bentrok (panggil di bawah lock)
+        """
+        if self.users.search(username) is not None:
+            return "Username sudah terdaftar"
+        if self.users_by_id.search(user_id) is not None:
+            return "User ID sudah terdaftar"
+        if email and self.users_by_email.search(email.lower()) is not None:
+            return "Email sudah terdaftar"
+        return None
+
+    def add_user(self, user: User) -> None:
+        """
+        Simpan User ke tabel username beserta index user_id dan email
+        Entry index milik user lain tidak ditimpa (data lama yang bentrok
+        tetap bisa dicari lewat user pertama yang memakainya)
+        """
+        with self.lock:
+            if self._usernames is not None and self.users.search(user.username) is None:
+                self._usernames.insert(user.username, user.username)
+            self.users.insert(user.username, user)
+            owner = self.users_by_id.search(user.user_id)
+            if owner is None or owner.username == user.username:
+                self.users_by_id.insert(user.user_id, user)
+            if user.email:
+                owner = self.users_by_email.search(user.email.lower())
+                if owner is None or owner.username == user.username:
+                    self.users_by_email.insert(user.email.lower(), user)
+
+    def register_users_bulk(self, users: List[Dict[str, str]]) -> List[Tuple[bool, str]]:
+        """
+        Register banyak user sekaligus (mis. import anggota)
+        users: list dict dengan key yang sama seperti argumen register_user
+        Hashing PBKDF2 dijalankan paralel di worker pool
+        Returns: list (success, message) dengan urutan yang sama seperti input
+        """
+        results: List[Optional[Tuple[bool, str]]] = [None] * len(users)
+        pending = []
+        seen_usernames, seen_ids, seen_emails = set(), set(), set()
         
-        # Simpan ke hash table
-        self.users.insert(username, user)
+        # Validasi dulu (termasuk key wajib) agar item yang ditolak tidak ikut di-hash
+        # dan tidak ada item yang gagal setelah item lain terlanjur disimpan
+        with self.lock:
+            for i, data in enumerate(users):
+                username = data.get("username", "")
+                missing = [key for key in self.BULK_USER_FIELDS if key not in data]
+                if missing:
+                    results[i] = (False, f"Data tidak lengkap: {', '.join(missing)}")
+                elif len(data["password"]) < 8:
+                    results[i] = (False, "Password minimal 8 karakter")
+                elif username in seen_usernames:
+                    results[i] = (False, "Username sudah terdaftar")
+                elif data["user_id"] in seen_ids:
+                    results[i] = (False, "User ID sudah terdaftar")
+                elif data["email"] and data["email"].lower() in seen_emails:
+                    results[i] = (False, "Email sudah terdaftar")
+                else:
+                    conflict = self._find_conflict(username, data["user_id"], data["email"])
+                    if conflict:
+                        results[i] = (False, conflict)
+                        continue
+                    seen_usernames.add(username)
+                    seen_ids.add(data["user_id"])
+                    seen_emails.add(data["email"].lower())
+                    pending.append(i)
         
-        return True, "Registrasi berhasil"
+        hashes = list(self._get_executor().map(
+            self.hash_password, [users[i]["password"] for i in pending]
+        ))
+        
+        with self.lock:
+            for i, (password_hash, salt) in zip(pending, hashes):
+                data = users[i]
+                conflict = self._find_conflict(data["username"], data["user_id"], data["email"])
+                if conflict:
+                    results[i] = (False, conflict)  # Didaftarkan thread lain
+                    continue
+                self._insert_new_user(
+                    data["username"], password_hash, salt, data["full_name"], data["email"],
+                    data["phone"], data["address"], data["user_id"],
+                    data.get("role", UserRole.MEMBER.value)
+                )
+                results[i] = (True, "Registrasi berhasil")
+        
+        return results
 
     def login(self, username: str, password: str, session_duration: int = 3600) -> Tuple[bool, str, Optional[str]]:
         """
@@ -88,77 +387,87 @@ class AuthenticationManager:
         session_duration: durasi session dalam detik (default 1 jam)
         Returns: (success, message, session_id)
         """
-        # Check failed attempts (simple rate limiting)
-        if username in self.failed_login_attempts:
-            attempts, last_time = self.failed_login_attempts[username]
-            if attempts >= 5:
-                if (datetime.now() - last_time).seconds < 300:  # 5 menit cooldown
-                    return False, "Terlalu banyak login gagal. Coba lagi dalam 5 menit", None
-            else:
-                self.failed_login_attempts[username] = (attempts + 1, datetime.now())
-        
-        # Cari user
-        user = self.users.search(username)
-        if user is None:
-            self.failed_login_attempts[username] = (1, datetime.now())
-            return False, "Username atau password salah", None
-        
-        # Verify password
-        try:
-            password_hash, salt = user.password_hash.split('$')
-            if not self.verify_password(password, password_hash, salt):
-                self.failed_login_attempts[username] = (1, datetime.now())
+        with self.lock:
+            # Rate limiting dicek sebelum PBKDF2 agar akun terkunci tidak memakan CPU
+            retry_after = self.rate_limiter.retry_after(username)
+            if retry_after > 0:
+                minutes = math.ceil(retry_after / 60)
+                return False, f"Terlalu banyak login gagal. Coba lagi dalam {minutes} menit", None
+            
+            # Cari user
+            user = self.users.search(username)
+            if user is None:
+                self.rate_limiter.record_failure(username)
                 return False, "Username atau password salah", None
+            stored_hash = user.password_hash
+        
+        # Verify password (di luar lock)
+        try:
+            password_hash, salt = stored_hash.split('$')
+            valid = self.verify_password(password, password_hash, salt)
         except Exception as e:
             return False, f"Error verifikasi: {str(e)}", None
         
-        # Check user active
-        if not user.is_active:
-            return False, "User tidak aktif", None
-        
-        # Create session
-        session_id = secrets.token_hex(32)
-        expiry_time = datetime.now() + timedelta(seconds=session_duration)
-        self.sessions[session_id] = (user.user_id, expiry_time)
-        
-        # Clear failed attempts
-        if username in self.failed_login_attempts:
-            del self.failed_login_attempts[username]
+        with self.lock:
+            if not valid:
+                self.rate_limiter.record_failure(username)
+                return False, "Username atau password salah", None
+            
+            # Check user active
+            if not user.is_active:
+                return False, "User tidak aktif", None
+            
+            # Create session
+            session_id = secrets.token_hex(32)
+            expiry_time = datetime.now() + timedelta(seconds=session_duration)
+            self.sessions.create(session_id, user.user_id, expiry_time)
+            
+            # Clear failed attempts
+            self.rate_limiter.reset(username)
         
         return True, "Login berhasil", session_id
 
+    def login_async(self, username: str, password: str, session_duration: int = 3600) -> Future:
+        """
+        Login di worker pool agar pemanggil (mis. thread GUI) tidak terblokir PBKDF2
+        Returns: Future yang menghasilkan (success, message, session_id)
+        """
+        return self._get_executor().submit(self.login, username, password, session_duration)
+
     def logout(self, session_id: str) -> bool:
         """Logout user"""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            return True
-        return False
+        with self.lock:
+            return self.sessions.remove(session_id)
 
     def validate_session(self, session_id: str) -> Tuple[bool, Optional[str]]:
         """
         Validate session
         Returns: (is_valid, user_id)
         """
-        if session_id not in self.sessions:
-            return False, None
-        
-        user_id, expiry_time = self.sessions[session_id]
-        
-        if datetime.now() > expiry_time:
-            del self.sessions[session_id]
-            return False, None
-        
-        return True, user_id
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                return False, None
+            
+            user_id, expiry_time = entry
+            
+            if datetime.now() > expiry_time:
+                self.sessions.remove(session_id)
+                return False, None
+            
+            return True, user_id
 
     def change_password(self, username: str, old_password: str, new_password: str) -> Tuple[bool, str]:
         """Change password user"""
-        user = self.users.search(username)
-        if user is None:
-            return False, "User tidak ditemukan"
+        with self.lock:
+            user = self.users.search(username)
+            if user is None:
+                return False, "User tidak ditemukan"
+            stored_hash = user.password_hash
         
-        # Verify old password
+        # Verify old password (di luar lock)
         try:
-            password_hash, salt = user.password_hash.split('$')
+            password_hash, salt = stored_hash.split('$')
             if not self.verify_password(old_password, password_hash, salt):
                 return False, "Password lama tidak sesuai"
         except Exception as e:
@@ -173,57 +482,109 @@ class AuthenticationManager:
         
         # Hash new password
         new_hash, new_salt = self.hash_password(new_password)
-        user.password_hash = f"{new_hash}${new_salt}"
         
         # Update user
-        self.users.insert(username, user)
+        with self.lock:
+            user.password_hash = f"{new_hash}${new_salt}"
+            self.users.insert(username, user)
         
         return True, "Password berhasil diubah"
 
     def get_user(self, username: str) -> Optional[User]:
         """Get user data"""
-        return self.users.search(username)
+        with self.lock:
+            return self.users.search(username)
+
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Get user berdasarkan user_id (O(1), mis. dari Transaction.user_id)"""
+        with self.lock:
+            return self.users_by_id.search(user_id)
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get user berdasarkan email (case-insensitive)"""
+        with self.lock:
+            return self.users_by_email.search(email.lower())
 
     def get_all_users(self) -> dict:
         """Get semua user"""
-        return self.users.get_all()
+        with self.lock:
+            return self.users.get_all()
 
-    def update_user(self, username: str, **kwargs) -> Tuple[bool, str]:
-        """Update user data (kecuali password)"""
-        user = self.users.search(username)
-        if user is None:
-            return False, "User tidak ditemukan"
-        
-        # Update fields
-        for key, value in kwargs.items():
-            if key != 'password_hash' and hasattr(user, key):
-                setattr(user, key, value)
-        
-        self.users.insert(username, user)
-        return True, "User berhasil diupdate"
+    def get_users_page(self, offset: int = 0, limit: int = 50) -> Tuple[List[User], int]:
+        """
+        Get satu halaman user terurut berdasarkan username
+        Index username dibangun saat pertama dipanggil lalu dijaga oleh add_user
+        Returns: (list User, total user)
+        """
+        with self.lock:
+            if self._usernames is None:
+                self._usernames = SortedIndex((username, username) for username in self.users.keys())
+            users = []
+            for username in self._usernames.page(offset, limit):
+                user = self.users.search(username)
+                if user is not None:
+                    users.append(user)
+            return users, len(self._usernames)
+
+    def update_user(self, username: str, /, **kwargs) -> Tuple[bool, str]:
+        """Update user data (kecuali password dan username)"""
+        with self.lock:
+            user = self.users.search(username)
+            if user is None:
+                return False, "User tidak ditemukan"
+            
+            # Username adalah key tabel & index paging; tidak bisa diganti lewat update
+            if kwargs.get('username', username) != username:
+                return False, "Username tidak dapat diubah"
+            
+            old_user_id = user.user_id
+            old_email = user.email.lower()
+            
+            # Tolak user_id/email baru yang sudah dipakai user lain
+            owner = self.users_by_id.search(kwargs.get('user_id', old_user_id))
+            if owner is not None and owner.username != username:
+                return False, "User ID sudah terdaftar"
+            new_email = kwargs.get('email', user.email)
+            owner = self.users_by_email.search(new_email.lower()) if new_email else None
+            if owner is not None and owner.username != username:
+                return False, "Email sudah terdaftar"
+            
+            # Update fields
+            for key, value in kwargs.items():
+                if key != 'password_hash' and hasattr(user, key):
+                    setattr(user, key, value)
+            
+            # Hapus key index lama jika berubah
+            if user.user_id != old_user_id:
+                self.users_by_id.delete(old_user_id)
+            if user.email.lower() != old_email:
+                self.users_by_email.delete(old_email)
+            
+            self.add_user(user)
+            return True, "User berhasil diupdate"
 
     def deactivate_user(self, username: str) -> Tuple[bool, str]:
         """Deactivate user account"""
-        user = self.users.search(username)
-        if user is None:
-            return False, "User tidak ditemukan"
-        
-        user.is_active = False
-        self.users.insert(username, user)
-        
-        # Logout semua session user ini
-        sessions_to_remove = [sid for sid, (uid, _) in self.sessions.items() if uid == user.user_id]
-        for sid in sessions_to_remove:
-            del self.sessions[sid]
+        with self.lock:
+            user = self.users.search(username)
+            if user is None:
+                return False, "User tidak ditemukan"
+            
+            user.is_active = False
+            self.users.insert(username, user)
+            
+            # Logout semua session user ini
+            self.sessions.revoke_user(user.user_id)
         
         return True, "User berhasil dinonaktifkan"
 
     def activate_user(self, username: str) -> Tuple[bool, str]:
         """Activate user account"""
-        user = self.users.search(username)
-        if user is None:
-            return False, "User tidak ditemukan"
-        
-        user.is_active = True
-        self.users.insert(username, user)
+        with self.lock:
+            user = self.users.search(username)
+            if user is None:
+                return False, "User tidak ditemukan"
+            
+            user.is_active = True
+            self.users.insert(username, user)
         return True, "User berhasil diaktifkan"
@@ -0,0 +1,207 @@
+"""
+Module Katalog Memory-Mapped untuk Sistem Perpustakaan Digital
+File katalog buku read-only yang bisa di-share antar process lewat page cache
+
+Layout file (little-endian):
+    header   : magic, version, count, record_size, index_offset, records_offset, heap_offset
+    index    : count entri (id_offset, id_length, record_offset), sorted by book_id
+    records  : count record fixed-layout; string disimpan sebagai (offset, length) ke heap
+    heap     : semua string UTF-8 berurutan
+"""
+
+import mmap
+import os
+import struct
+from dataclasses import fields
+from typing import Iterator, List, Optional
+from src.models import Book
+
+MAGIC = b"LCAT"
+VERSION = 1
+
+HEADER = struct.Struct("<4sIIIQQQ")
+INDEX_ENTRY = struct.Struct("<QIQ")
+
+# Format per field Book: string -> (offset, length) di heap
+FIELD_FORMATS = {str: "QI", int: "q", float: "d"}
+BOOK_FIELDS = [(f.name, f.type) for f in fields(Book)]
+RECORD = struct.Struct("<" + "".join(FIELD_FORMATS[t] for _, t in BOOK_FIELDS))
+
+
+def _field_slots():
+    """Posisi tiap field di tuple hasil RECORD.unpack (string memakai 2 slot: offset, length)"""
+    slots, slot = {}, 0
+    for name, type_ in BOOK_FIELDS:
+        slots[name] = slot
+        slot += 2 if type_ is str else 1
+    return slots
+
+
+FIELD_SLOTS = _field_slots()
+
+
+def write_catalog(path: str, books: List[Book]) -> int:
+    """
+    Tulis katalog buku ke file biner
+    File ditulis ke path sementara lalu di-rename, sehingga reader yang
+    masih me-map file lama tidak melihat data setengah jadi
+    Returns: jumlah buku yang ditulis
+    """
+    heap = bytearray()
+
+    def add_string(value: str):
+        data = value.encode("utf-8")
+        offset = len(heap)
+        heap.extend(data)
+        return offset, len(data)
+
+    count = len(books)
+    index_offset = HEADER.size
+    records_offset = index_offset + count * INDEX_ENTRY.size
+    heap_offset = records_offset + count * RECORD.size
+
+    records = bytearray()
+    keys = []
+    for i, book in enumerate(books):
+        values = []
+        for name, type_ in BOOK_FIELDS:
+            value = getattr(book, name)
+            if type_ is str:
+                values.extend(add_string(value))
+            else:
+                values.append(type_(value))
+        records.extend(RECORD.pack(*values))
+
+        id_offset, id_length = add_string(book.book_id)
+        keys.append((book.book_id.encode("utf-8"), id_offset, id_length,
+                     records_offset + i * RECORD.size))
+
+    keys.sort(key=lambda entry: entry[0])
+    index = bytearray()
+    for _, id_offset, id_length, record_offset in keys:
+        index.extend(INDEX_ENTRY.pack(id_offset, id_length, record_offset))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, count, RECORD.size,
+                            index_offset, records_offset, heap_offset))
+        f.write(index)
+        f.write(records)
+        f.write(heap)
+    os.replace(tmp_path, path)
+    return count
+
+
+class MmapCatalog:
+    """
+    Reader katalog memory-mapped
+    Book hanya di-materialize saat diminta (get), sehingga process tidak
+    perlu menyimpan semua instance Book di memori
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.count, record_size, self._index_offset,
+         self._records_offset, self._heap_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"File katalog tidak valid: {path}")
+        if record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError("Layout record katalog tidak cocok dengan model Book")
+
+    def close(self) -> None:
+        """Tutup mapping"""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, book_id: str) -> bool:
+        return self._find(book_id) is not None
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._heap_offset + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _key_at(self, position: int) -> bytes:
+        id_offset, id_length, _ = INDEX_ENTRY.unpack_from(
+            self._mm, self._index_offset + position * INDEX_ENTRY.size)
+        start = self._heap_offset + id_offset
+        return self._mm[start:start + id_length]
+
+    def _find(self, book_id: str) -> Optional[int]:
+        """Binary search di index; Returns: offset record atau None"""
+        key = book_id.encode("utf-8")
+        low, high = 0, self.count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            mid_key = self._key_at(mid)
+            if mid_key == key:
+                return INDEX_ENTRY.unpack_from(
+                    self._mm, self._index_offset + mid * INDEX_ENTRY.size)[2]
+            elif mid_key < key:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return None
+
+    def _materialize(self, record_offset: int) -> Book:
+        raw = RECORD.unpack_from(self._mm, record_offset)
+        values = {}
+        i = 0
+        for name, type_ in BOOK_FIELDS:
+            if type_ is str:
+                values[name] = self._string(raw[i], raw[i + 1])
+                i += 2
+            else:
+                values[name] = raw[i]
+                i += 1
+        return Book(**values)
+
+    def get(self, book_id: str) -> Optional[Book]:
+        """Get Book berdasarkan ID (O(log n), dibuat dari mmap)"""
+        record_offset = self._find(book_id)
+        if record_offset is None:
+            return None
+        return self._materialize(record_offset)
+
+    def search(self, title: str = "", author: str = "", category: str = "",
+               year: int = 0) -> Iterator[Book]:
+        """
+        Iterasi Book yang cocok dalam urutan book_id (kriteria sama dengan
+        LibraryManager.search_books_multi_criteria)
+        Hanya field yang difilter yang di-decode; Book dibuat untuk yang cocok saja
+        """
+        title, author = title.lower(), author.lower()
+        title_slot, author_slot = FIELD_SLOTS["title"], FIELD_SLOTS["author"]
+        category_slot, year_slot = FIELD_SLOTS["category"], FIELD_SLOTS["publication_year"]
+        
+        for position in range(self.count):
+            _, _, record_offset = INDEX_ENTRY.unpack_from(
+                self._mm, self._index_offset + position * INDEX_ENTRY.size)
+            raw = RECORD.unpack_from(self._mm, record_offset)
+            if year and raw[year_slot] != year:
+                continue
+            if category and self._string(raw[category_slot], raw[category_slot + 1]) != category:
+                continue
+            if title and title not in self._string(raw[title_slot], raw[title_slot + 1]).lower():
+                continue
+            if author and author not in self._string(raw[author_slot], raw[author_slot + 1]).lower():
+                continue
+            yield self._materialize(record_offset)
+
+    def iter_ids(self) -> Iterator[str]:
+        """Iterasi book_id dalam urutan sorted"""
+        for position in range(self.count):
+            yield self._key_at(position).decode("utf-8")
+
+    def iter_books(self) -> Iterator[Book]:
+        """Iterasi semua Book dalam urutan book_id (di-materialize satu per satu)"""
+        for position in range(self.count):
+            _, _, record_offset = INDEX_ENTRY.unpack_from(
+                self._mm, self._index_offset + position * INDEX_ENTRY.size)
+            yield self._materialize(record_offset)
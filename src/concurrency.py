@@ -0,0 +1,154 @@
+"""
+Module Concurrency untuk Sistem Perpustakaan Digital
+Primitive locking untuk LibraryManager yang diakses banyak thread sekaligus
+(API server, worker pencarian GUI, background saver)
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterable, Iterator
+
+
+class ReadWriteLock:
+    """
+    Reader-writer lock (writer-preferring)
+    Banyak reader boleh masuk bersamaan, writer eksklusif. Reader baru menunggu
+    selama ada writer yang antre sehingga writer tidak kelaparan.
+    Nested: thread pemegang write boleh read/write lagi, pemegang read boleh
+    read lagi. Upgrade read -> write tidak didukung (RuntimeError).
+    Pakai `with lock.read():` / `with lock.write():`
+    
+    Fast path reader tidak menyentuh Condition: reader mendaftar di dict
+    _active (operasi dict atomic) lalu mengecek writer; writer menandai antre
+    dulu lalu menunggu _active kosong. Condition hanya dipakai bila ada writer.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._active: Dict[int, int] = {}  # Ident thread reader -> depth nested read
+        self._writers_waiting = 0
+        self._writer = None  # Ident thread pemegang write lock
+        self._write_depth = 0  # Nested write/read di thread writer
+        self._read_guard = _Guard(self.acquire_read, self.release_read)
+        self._write_guard = _Guard(self.acquire_write, self.release_write)
+
+    def read(self) -> "_Guard":
+        """Context manager untuk membaca"""
+        return self._read_guard
+
+    def write(self) -> "_Guard":
+        """Context manager eksklusif untuk mengubah data"""
+        return self._write_guard
+
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        depth = self._active.get(me)
+        if depth:
+            self._active[me] = depth + 1
+            return
+        if self._writer == me:
+            self._write_depth += 1
+            return
+
+        self._active[me] = 1
+        if self._writer is None and not self._writers_waiting:
+            return
+
+        # Ada writer: mundur, bangunkan writer yang menunggu _active kosong, lalu antre
+        del self._active[me]
+        with self._cond:
+            self._cond.notify_all()
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._active[me] = 1
+
+    def release_read(self) -> None:
+        me = threading.get_ident()
+        depth = self._active.get(me)
+        if depth is None:  # Read di dalam write lock
+            self._write_depth -= 1
+            return
+        if depth > 1:
+            self._active[me] = depth - 1
+            return
+        del self._active[me]
+        if self._writers_waiting:
+            with self._cond:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if me in self._active:
+            raise RuntimeError("Upgrade read lock ke write lock tidak didukung")
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._active:
+                    self._cond.wait()
+                # _writer diset sebelum tanda antre dilepas: fast path reader
+                # tidak boleh melihat _writer None dan _writers_waiting 0 sekaligus
+                self._writer = me
+                self._write_depth = 1
+            finally:
+                self._writers_waiting -= 1
+                if self._writer != me:  # wait() gagal: bangunkan reader yang menunggu
+                    self._cond.notify_all()
+
+    def release_write(self) -> None:
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._cond:
+            self._writer = None
+            self._cond.notify_all()
+
+
+class _Guard:
+    """Context manager acquire/release tanpa state (dipakai ulang, tanpa alokasi per `with`)"""
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self) -> None:
+        self._acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self._release()
+
+
+class StripedLock:
+    """
+    Sekumpulan lock yang dipilih berdasarkan hash key (lock striping)
+    Operasi pada key berbeda umumnya jatuh ke stripe berbeda sehingga bisa
+    berjalan paralel, tanpa menyimpan satu lock per buku. Lock reentrant.
+    """
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def _index(self, key: Hashable) -> int:
+        return hash(key) % len(self._locks)
+
+    def hold(self, key: Hashable) -> threading.RLock:
+        """Lock stripe untuk key (dipakai dengan `with`)"""
+        return self._locks[self._index(key)]
+
+    @contextmanager
+    def hold_many(self, keys: Iterable[Hashable]) -> Iterator[None]:
+        """Pegang stripe untuk banyak key sekaligus (diambil urut index -> bebas deadlock)"""
+        indexes = sorted({self._index(key) for key in keys})
+        acquired = []
+        try:
+            for index in indexes:
+                self._locks[index].acquire()
+                acquired.append(index)
+            yield
+        finally:
+            for index in reversed(acquired):
+                self._locks[index].release()
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -4,8 +4,9 @@ Mengimplementasikan 6+ struktur data yang diperlukan
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Tuple, Optional, Dict, Set
-from collections import defaultdict
+from typing import Any, Callable, Iterable, Iterator, List, Tuple, Optional, Dict, Set
+from collections import defaultdict, OrderedDict
+import bisect
 import json
 
 
@@ -69,6 +70,30 @@ class BinarySearchTree:
         else:
             return self._search_recursive(node.right, key)
 
+    def search_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """
+        Cari banyak key dalam satu traversal
+        Key diurutkan lalu dibagi di setiap node (bisect): subtree hanya
+        dikunjungi jika masih ada key yang mungkin berada di sana, sehingga
+        path yang sama tidak di-descend berulang kali per key
+        Returns: dict key -> value (key yang tidak ada tidak dimasukkan)
+        """
+        sorted_keys = sorted(set(keys))
+        result = {}
+        stack = [(self.root, 0, len(sorted_keys))]
+        while stack:
+            node, low, high = stack.pop()
+            if node is None or low >= high:
+                continue
+            split = bisect.bisect_left(sorted_keys, node.key, low, high)
+            if split < high and sorted_keys[split] == node.key:
+                result[node.key] = node.value
+                stack.append((node.right, split + 1, high))
+            else:
+                stack.append((node.right, split, high))
+            stack.append((node.left, low, split))
+        return result
+
     def delete(self, key: Any) -> bool:
         """Hapus node dengan key tertentu"""
         old_size = self.size
@@ -121,12 +146,27 @@ class BinarySearchTree:
         """Get semua data"""
         return self.inorder_traversal()
 
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        """Iterasi inorder (key, value) secara lazy dengan stack eksplisit"""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.value
+            node = node.right
+
 
 class HashTable:
     """
     Hash Table dengan chaining
     Digunakan untuk manajemen user dan indexing buku
     """
+    # Tabel diperbesar 2x jika size melebihi capacity * MAX_LOAD_FACTOR
+    MAX_LOAD_FACTOR = 0.75
+
     def __init__(self, capacity: int = 100):
         self.capacity = capacity
         self.table = [[] for _ in range(capacity)]
@@ -152,6 +192,18 @@ class HashTable:
         # Add new pair
         self.table[index].append((key, value))
         self.size += 1
+        
+        if self.size > self.capacity * self.MAX_LOAD_FACTOR:
+            self._resize(self.capacity * 2)
+
+    def _resize(self, new_capacity: int) -> None:
+        """Rehash semua pair ke tabel baru agar chain tetap pendek (O(1) rata-rata)"""
+        old_table = self.table
+        self.capacity = new_capacity
+        self.table = [[] for _ in range(new_capacity)]
+        for bucket in old_table:
+            for key, value in bucket:
+                self.table[self._hash(key)].append((key, value))
 
     def search(self, key: str) -> Optional[Any]:
         """Search value berdasarkan key"""
@@ -275,59 +327,185 @@ class GraphNode:
     def __init__(self, book_id: str, title: str):
         self.book_id = book_id
         self.title = title
-        self.neighbors = []  # List of (neighbor_node, weight)
+        self.neighbors: Dict[str, Tuple['GraphNode', float]] = {}  # neighbor_id -> (node, weight)
+        self.in_neighbors: Set[str] = set()  # ID node yang punya edge ke node ini
+
+    def add_edge(self, neighbor: 'GraphNode', weight: float = 1.0) -> bool:
+        """Add edge ke neighbor (O(1)); edge yang sudah ada tidak diubah"""
+        if neighbor.book_id in self.neighbors:
+            return False
+        self.neighbors[neighbor.book_id] = (neighbor, min(weight, 1.0))
+        neighbor.in_neighbors.add(self.book_id)
+        return True
 
-    def add_edge(self, neighbor: 'GraphNode', weight: float = 1.0) -> None:
-        """Add edge ke neighbor"""
-        if neighbor not in [n[0] for n in self.neighbors]:
-            self.neighbors.append((neighbor, weight))
+    def set_edge_weight(self, neighbor: 'GraphNode', weight: float) -> None:
+        """Add atau update bobot edge ke neighbor (O(1))"""
+        self.neighbors[neighbor.book_id] = (neighbor, min(weight, 1.0))
+        neighbor.in_neighbors.add(self.book_id)
 
-    def remove_edge(self, neighbor: 'GraphNode') -> None:
-        """Remove edge ke neighbor"""
-        self.neighbors = [(n, w) for n, w in self.neighbors if n != neighbor]
+    def remove_edge(self, neighbor: 'GraphNode') -> bool:
+        """Remove edge ke neighbor (O(1))"""
+        if self.neighbors.pop(neighbor.book_id, None) is None:
+            return False
+        neighbor.in_neighbors.discard(self.book_id)
+        return True
 
 
 class Graph:
     """
     Graph Implementation
     Digunakan untuk sistem rekomendasi berdasarkan hubungan antar buku
+    Adjacency disimpan sebagai dict per node, sehingga add/remove/update
+    edge O(1) dan hapus node O(derajat node)
+    Bobot edge adalah similarity: nilai > 1 dipotong menjadi 1.0 agar skor
+    rekomendasi tidak pernah naik sepanjang path
     """
     def __init__(self):
         self.nodes: Dict[str, GraphNode] = {}
+        # Naik setiap kali struktur/bobot berubah (untuk cache turunan, mis. CSR)
+        self.version = 0
 
     def add_node(self, book_id: str, title: str) -> GraphNode:
         """Add node ke graph"""
         if book_id not in self.nodes:
             self.nodes[book_id] = GraphNode(book_id, title)
+            self.version += 1
         return self.nodes[book_id]
 
+    def remove_node(self, book_id: str) -> bool:
+        """Remove node beserta semua edge masuk dan keluar"""
+        node = self.nodes.pop(book_id, None)
+        if node is None:
+            return False
+        
+        self.version += 1
+        for neighbor, _ in node.neighbors.values():
+            neighbor.in_neighbors.discard(book_id)
+        for source_id in node.in_neighbors:
+            source = self.nodes.get(source_id)
+            if source is not None:
+                source.neighbors.pop(book_id, None)
+        return True
+
     def add_edge(self, book_id1: str, book_id2: str, weight: float = 1.0) -> None:
         """Add edge antara dua buku"""
         if book_id1 in self.nodes and book_id2 in self.nodes:
-            self.nodes[book_id1].add_edge(self.nodes[book_id2], weight)
+            if self.nodes[book_id1].add_edge(self.nodes[book_id2], weight):
+                self.version += 1
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, float]]) -> int:
+        """
+        Bulk insert edge (book_id1, book_id2, weight)
+        Returns: jumlah edge baru yang ditambahkan
+        """
+        nodes = self.nodes
+        added = 0
+        for book_id1, book_id2, weight in edges:
+            source = nodes.get(book_id1)
+            target = nodes.get(book_id2)
+            if source is not None and target is not None and source.add_edge(target, weight):
+                added += 1
+        if added:
+            self.version += 1
+        return added
+
+    def set_edge_weight(self, book_id1: str, book_id2: str, weight: float) -> None:
+        """Add atau update bobot edge antara dua buku"""
+        if book_id1 in self.nodes and book_id2 in self.nodes:
+            self.nodes[book_id1].set_edge_weight(self.nodes[book_id2], weight)
+            self.version += 1
 
-    def get_recommendations(self, book_id: str, depth: int = 1) -> List[Tuple[str, float]]:
-        """Get rekomendasi buku berdasarkan book similarity"""
-        if book_id not in self.nodes:
+    def get_edge_weight(self, book_id1: str, book_id2: str) -> Optional[float]:
+        """Get bobot edge (None jika tidak ada)"""
+        node = self.nodes.get(book_id1)
+        if node is None or book_id2 not in node.neighbors:
+            return None
+        return node.neighbors[book_id2][1]
+
+    def remove_edge(self, book_id1: str, book_id2: str) -> bool:
+        """Remove edge antara dua buku"""
+        if book_id1 in self.nodes and book_id2 in self.nodes:
+            if self.nodes[book_id1].remove_edge(self.nodes[book_id2]):
+                self.version += 1
+                return True
+        return False
+
+    def to_csr(self) -> Tuple[List[str], List[int], List[int], List[float]]:
+        """
+        Export graph ke format CSR (compressed sparse row)
+        Returns: (node_ids, indptr, indices, weights); edge node_ids[i] ada di
+        indices[indptr[i]:indptr[i+1]] dengan bobot weights[...] yang sama
+        """
+        node_ids = list(self.nodes)
+        position = {book_id: i for i, book_id in enumerate(node_ids)}
+        indptr = [0]
+        indices = []
+        weights = []
+        for book_id in node_ids:
+            for neighbor_id, (_, weight) in self.nodes[book_id].neighbors.items():
+                indices.append(position[neighbor_id])
+                weights.append(weight)
+            indptr.append(len(indices))
+        return node_ids, indptr, indices, weights
+
+    def load_csr(self, node_ids: List[str], indptr: List[int], indices: List[int],
+                 weights: List[float]) -> int:
+        """
+        Bulk insert edge dari format CSR (hasil to_csr)
+        Edge ke/dari node yang tidak ada di graph diabaikan
+        Returns: jumlah edge yang ditambahkan
+        """
+        return self.add_edges(
+            (book_id, node_ids[indices[k]], weights[k])
+            for i, book_id in enumerate(node_ids)
+            for k in range(indptr[i], indptr[i + 1])
+        )
+
+    def get_recommendations(self, book_id: str, depth: int = 1,
+                            limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Get rekomendasi buku berdasarkan book similarity
+        Best-first search (Dijkstra pada -log bobot): skor buku adalah hasil
+        kali bobot pada path terkuat dengan maksimal `depth` edge. Dengan bobot
+        di (0, 1] skor tidak pernah naik sepanjang path, sehingga buku keluar
+        dari heap berurutan dari skor tertinggi dan pencarian berhenti setelah
+        `limit` hasil tanpa menjelajahi seluruh komponen (bobot > 1 sudah
+        dipotong saat edge ditambahkan). Edge dengan bobot <= 0 diabaikan.
+        """
+        if book_id not in self.nodes or depth <= 0:
             return []
 
+        frontier = MinHeap()  # (-skor, (book_id, jumlah hop))
+        frontier.insert((-1.0, (book_id, 0)))
+        best_score: Dict[str, float] = {}
+        expanded_hops: Dict[str, int] = {}  # hop paling sedikit saat node di-expand
         recommendations = []
-        visited = set()
-        
-        def dfs(node: GraphNode, current_depth: int, weight: float = 1.0):
-            if current_depth == 0:
-                return
-            
-            for neighbor, edge_weight in node.neighbors:
-                if neighbor.book_id not in visited:
-                    visited.add(neighbor.book_id)
-                    combined_weight = weight * edge_weight
-                    recommendations.append((neighbor.book_id, combined_weight))
-                    dfs(neighbor, current_depth - 1, combined_weight)
-
-        dfs(self.nodes[book_id], depth)
-        # Sort by weight (relevance) descending
-        recommendations.sort(key=lambda x: x[1], reverse=True)
+
+        while not frontier.is_empty():
+            neg_score, (current_id, hops) = frontier.extract_min()
+            score = -neg_score
+
+            if current_id not in best_score:
+                best_score[current_id] = score
+                if current_id != book_id:
+                    recommendations.append((current_id, score))
+                    if limit is not None and len(recommendations) >= limit:
+                        break
+            elif expanded_hops.get(current_id, depth + 1) <= hops:
+                # Sudah di-expand lewat path yang lebih kuat dan tidak lebih panjang
+                continue
+
+            expanded_hops[current_id] = hops
+            if hops == depth:
+                continue
+
+            for neighbor_id, (_, weight) in self.nodes[current_id].neighbors.items():
+                if weight <= 0 or neighbor_id == book_id:
+                    continue
+                if neighbor_id in best_score and expanded_hops.get(neighbor_id, depth + 1) <= hops + 1:
+                    continue
+                frontier.insert((-(score * weight), (neighbor_id, hops + 1)))
+
         return recommendations
 
 
@@ -345,20 +523,24 @@ class LinkedList:
     """
     def __init__(self):
         self.head = None
+        self.tail = None
         self.size = 0
 
     def append(self, data: Any) -> None:
-        """Add item ke akhir list"""
+        """Add item ke akhir list (O(1) dengan tail pointer)"""
         new_node = LinkedListNode(data)
         if self.head is None:
             self.head = new_node
         else:
-            current = self.head
-            while current.next is not None:
-                current = current.next
-            current.next = new_node
+            self.tail.next = new_node
+        self.tail = new_node
         self.size += 1
 
+    def extend(self, items: List[Any]) -> None:
+        """Add banyak item sekaligus ke akhir list"""
+        for data in items:
+            self.append(data)
+
     def insert_at(self, index: int, data: Any) -> bool:
         """Insert item di posisi tertentu"""
         if index < 0 or index > self.size:
@@ -368,6 +550,8 @@ class LinkedList:
             new_node = LinkedListNode(data)
             new_node.next = self.head
             self.head = new_node
+            if self.tail is None:
+                self.tail = new_node
             self.size += 1
             return True
 
@@ -378,6 +562,8 @@ class LinkedList:
         new_node = LinkedListNode(data)
         new_node.next = current.next
         current.next = new_node
+        if new_node.next is None:
+            self.tail = new_node
         self.size += 1
         return True
 
@@ -389,6 +575,8 @@ class LinkedList:
         if index == 0:
             data = self.head.data
             self.head = self.head.next
+            if self.head is None:
+                self.tail = None
             self.size -= 1
             return data
 
@@ -398,9 +586,29 @@ class LinkedList:
 
         data = current.next.data
         current.next = current.next.next
+        if current.next is None:
+            self.tail = current
         self.size -= 1
         return data
 
+    def remove(self, data: Any) -> bool:
+        """Remove item pertama yang sama dengan data (satu traversal)"""
+        previous = None
+        current = self.head
+        while current is not None:
+            if current.data is data or current.data == data:
+                if previous is None:
+                    self.head = current.next
+                else:
+                    previous.next = current.next
+                if current is self.tail:
+                    self.tail = previous
+                self.size -= 1
+                return True
+            previous = current
+            current = current.next
+        return False
+
     def get(self, index: int) -> Optional[Any]:
         """Get item di posisi tertentu"""
         if index < 0 or index >= self.size:
@@ -420,6 +628,65 @@ class LinkedList:
             current = current.next
         return result
 
+    def __iter__(self):
+        """Iterasi item tanpa menyalin list"""
+        current = self.head
+        while current is not None:
+            yield current.data
+            current = current.next
+
+
+class LazyLinkedList(LinkedList):
+    """
+    Linked List yang isinya baru dimuat saat pertama kali diakses
+    Digunakan untuk koleksi "dingin" (review, riwayat pencarian, transaksi)
+    agar tidak di-deserialize saat startup
+    """
+    def __init__(self, loader):
+        self._loader = loader  # Callable -> iterable item
+        self._loaded = False
+        super().__init__()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check apakah isi list sudah dimuat"""
+        return self._loaded
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            # Loader dijalankan dulu: jika gagal (mis. file rusak) error diteruskan ke
+            # pemanggil dan list tetap belum dimuat, sehingga tidak disimpan sebagai []
+            items = list(self._loader())
+            self._loaded = True
+            self.extend(items)
+
+    @property
+    def head(self):
+        self._ensure_loaded()
+        return self._head
+
+    @head.setter
+    def head(self, node):
+        self._head = node
+
+    @property
+    def tail(self):
+        self._ensure_loaded()
+        return self._tail
+
+    @tail.setter
+    def tail(self, node):
+        self._tail = node
+
+    @property
+    def size(self) -> int:
+        self._ensure_loaded()
+        return self._size
+
+    @size.setter
+    def size(self, value: int):
+        self._size = value
+
 
 # Priority Queue menggunakan Min Heap (untuk waiting list dengan prioritas)
 class MinHeap:
@@ -489,3 +756,98 @@ class MinHeap:
     def get_all(self) -> List[Tuple[int, Any]]:
         """Get semua items"""
         return self.heap.copy()
+
+
+class LRUCache:
+    """
+    LRU Cache dengan kapasitas terbatas
+    Digunakan untuk state yang harus dibatasi memorinya (rate limiter, cache)
+    Semua operasi O(1); item yang paling lama tidak diakses dibuang saat penuh
+    on_evict(key, value) (opsional) dipanggil untuk item yang dibuang karena penuh
+    """
+    def __init__(self, capacity: int = 1000,
+                 on_evict: Optional[Callable[[Any, Any], None]] = None):
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get value dan tandai sebagai baru diakses"""
+        if key not in self._data:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def hit_rate(self) -> float:
+        """Rasio get yang menemukan key (0.0 jika belum ada get)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def put(self, key: Any, value: Any) -> None:
+        """Insert/update value, buang item terlama jika melebihi kapasitas"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.capacity:
+            evicted_key, evicted_value = self._data.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, evicted_value)
+
+    def delete(self, key: Any) -> bool:
+        """Hapus key"""
+        if key in self._data:
+            del self._data[key]
+            return True
+        return False
+
+    def clear(self) -> None:
+        """Kosongkan cache"""
+        self._data.clear()
+
+    def keys(self) -> List[Any]:
+        """Get semua keys (terlama lebih dulu)"""
+        return list(self._data.keys())
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SortedIndex:
+    """
+    Index terurut (sort_key, item_id) berbasis bisect
+    Digunakan untuk paging & sort per kolom tanpa mengurutkan ulang seluruh data:
+    insert/remove O(log n + geser list), ambil halaman di offset mana pun O(limit)
+    """
+    def __init__(self, entries: Optional[Iterable[Tuple[Any, Any]]] = None):
+        self._entries: List[Tuple[Any, Any]] = sorted(entries) if entries is not None else []
+
+    def insert(self, key: Any, item_id: Any) -> None:
+        """Insert entri (key, item_id)"""
+        bisect.insort(self._entries, (key, item_id))
+
+    def remove(self, key: Any, item_id: Any) -> bool:
+        """Hapus entri (key, item_id)"""
+        position = bisect.bisect_left(self._entries, (key, item_id))
+        if position < len(self._entries) and self._entries[position] == (key, item_id):
+            del self._entries[position]
+            return True
+        return False
+
+    def page(self, offset: int, limit: int, descending: bool = False) -> List[Any]:
+        """Get item_id pada posisi [offset, offset + limit) dalam urutan index"""
+        if offset < 0 or limit <= 0:
+            return []
+        if descending:
+            end = max(len(self._entries) - offset, 0)
+            start = max(end - limit, 0)
+            return [item_id for _, item_id in reversed(self._entries[start:end])]
+        return [item_id for _, item_id in self._entries[offset:offset + limit]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
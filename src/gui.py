@@ -7,18 +7,30 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, scrolledtext
 from tkcalendar import DateEntry
 from datetime import datetime
+import threading
 import uuid
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from src.library_manager import LibraryManager
 from src.auth import AuthenticationManager
-from src.persistence import DataPersistence
+from src.persistence import BackgroundSaver, DataPersistence
 from src.models import Book, BookStatus, UserRole
 
 
 class LibraryGUI:
     """Main GUI class untuk Sistem Perpustakaan Digital"""
     
+    # Pencarian: jumlah hasil yang ditampilkan & jeda debounce saat mengetik
+    SEARCH_PAGE_SIZE = 20
+    SEARCH_DEBOUNCE_MS = 300
+    
+    # Jumlah baris per halaman di tampilan admin (user, reservasi)
+    ADMIN_PAGE_SIZE = 50
+    
+    # Jeda maksimum antara perubahan data dan penulisan ke disk
+    FLUSH_INTERVAL_MS = 1000
+    
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("Sistem Perpustakaan Digital")
@@ -29,14 +41,26 @@ class LibraryGUI:
         self.auth_manager = AuthenticationManager()
         self.persistence = DataPersistence()
         
-        # Load data
-        self.persistence.load_all(self.library_manager, self.auth_manager)
+        # Load data (riwayat & review dimuat saat pertama dibuka)
+        self.persistence.load_all(self.library_manager, self.auth_manager, lazy=True)
+        # Riwayat transaksi dimuat di background selagi user login, agar borrow/return
+        # pertama tidak men-deserialize seluruh riwayat di thread Tk
+        threading.Thread(target=self.library_manager.preload_lazy_collections,
+                         name="preload-transactions", daemon=True).start()
+        
+        # Perubahan disimpan di background (dikumpulkan per FLUSH_INTERVAL_MS)
+        self.saver = BackgroundSaver(self.persistence, self.library_manager, self.auth_manager,
+                                     flush_interval_ms=self.FLUSH_INTERVAL_MS)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Current user session
         self.current_user = None
         self.current_session_id = None
         self.current_user_role = None
         
+        # Worker pencarian (dibuat saat pertama dipakai)
+        self._search_executor: Optional[ThreadPoolExecutor] = None
+        
         # Create login frame
         self.create_login_frame()
 
@@ -85,16 +109,28 @@ class LibraryGUI:
                                    "\n".join([f"- {u[0]}" for u in self.auth_manager.users.get_all()]))
                 return
             
-            success, message, session_id = self.auth_manager.login(username, password)
-            if success:
-                user = self.auth_manager.get_user(username)
-                self.current_user = user
-                self.current_session_id = session_id
-                self.current_user_role = user.role
-                messagebox.showinfo("Success", message)
-                self.create_main_menu()
-            else:
-                messagebox.showerror("Login Failed", message)
+            # Hashing PBKDF2 berjalan di worker pool; UI tetap responsif
+            login_btn.config(state="disabled")
+            future = self.auth_manager.login_async(username, password)
+            
+            def check_login():
+                if not future.done():
+                    self.root.after(50, check_login)
+                    return
+                
+                login_btn.config(state="normal")
+                success, message, session_id = future.result()
+                if success:
+                    user = self.auth_manager.get_user(username)
+                    self.current_user = user
+                    self.current_session_id = session_id
+                    self.current_user_role = user.role
+                    messagebox.showinfo("Success", message)
+                    self.create_main_menu()
+                else:
+                    messagebox.showerror("Login Failed", message)
+            
+            check_login()
         
         login_btn = ttk.Button(form_frame, text="Login", command=login_action)
         login_btn.pack(pady=10)
@@ -169,20 +205,39 @@ class LibraryGUI:
                     return
                 
                 user_id = str(uuid.uuid4())[:8]
-                success, message = self.auth_manager.register_user(
+                # Hashing PBKDF2 di worker pool, tanpa memegang saver.lock: register_user
+                # menyimpan user di bawah auth_manager.lock, snapshot membaca lewat lock yang sama
+                register_btn.config(state="disabled")
+                future = self.auth_manager.register_user_async(
                     username, password, full_name, email, phone, address, user_id
                 )
+            except Exception as e:
+                messagebox.showerror("Error", f"Error: {str(e)}")
+                return
+            
+            def check_register():
+                if not future.done():
+                    self.root.after(50, check_register)
+                    return
                 
+                try:
+                    success, message = future.result()
+                except Exception as e:
+                    register_btn.config(state="normal")
+                    messagebox.showerror("Error", f"Error: {str(e)}")
+                    return
                 if success:
+                    self.saver.mark_dirty()
                     messagebox.showinfo("Success", message)
                     self.create_login_frame()
                 else:
+                    register_btn.config(state="normal")
                     messagebox.showerror("Error", message)
-            except Exception as e:
-                messagebox.showerror("Error", f"Error: {str(e)}")
+            
+            check_register()
         
-        ttk.Button(button_frame, text="Registrasi", 
-                  command=register_submit).pack(side="left", padx=5)
+        register_btn = ttk.Button(button_frame, text="Registrasi", command=register_submit)
+        register_btn.pack(side="left", padx=5)
         ttk.Button(button_frame, text="Kembali", 
                   command=self.create_login_frame).pack(side="left", padx=5)
 
@@ -276,45 +331,101 @@ class LibraryGUI:
         category_var = tk.StringVar()
         ttk.Entry(frame, textvariable=category_var, width=40).pack(pady=5)
         
-        def search_action():
-            results = self.library_manager.search_books_multi_criteria(
-                title=title_var.get(),
-                author=author_var.get(),
-                category=category_var.get()
-            )
-            
+        # Status pencarian: generation naik tiap query baru, hasil query lama dibuang
+        state = {"generation": 0, "after_id": None, "future": None, "stop": None}
+        
+        def render_results(results):
             # Clear previous results
             for widget in results_frame.winfo_children():
                 widget.destroy()
             
             if not results:
                 ttk.Label(results_frame, text="Tidak ada hasil pencarian").pack(pady=10)
-            else:
-                for book in results:
-                    book_text = f"{book.title} by {book.author} ({book.publication_year})\n" \
-                               f"Tersedia: {book.available_copies}/{book.total_copies} | " \
-                               f"Rating: {book.rating:.1f}★"
-                    
-                    book_frame = ttk.LabelFrame(results_frame, text=book.book_id, padding="5")
-                    book_frame.pack(fill="x", pady=5)
-                    
-                    ttk.Label(book_frame, text=book_text, wraplength=400, justify="left").pack()
-                    
-                    if book.available_copies > 0:
-                        ttk.Button(book_frame, text="Pinjam", 
-                                  command=lambda b=book: self.quick_borrow(b.book_id)).pack()
-                    
-                    ttk.Button(book_frame, text="Lihat Detail", 
-                              command=lambda b=book: self.show_book_detail(b)).pack()
+                return
+            
+            for book in results[:self.SEARCH_PAGE_SIZE]:
+                book_text = f"{book.title} by {book.author} ({book.publication_year})\n" \
+                           f"Tersedia: {book.available_copies}/{book.total_copies} | " \
+                           f"Rating: {book.rating:.1f}★"
+                
+                book_frame = ttk.LabelFrame(results_frame, text=book.book_id, padding="5")
+                book_frame.pack(fill="x", pady=5)
+                
+                ttk.Label(book_frame, text=book_text, wraplength=400, justify="left").pack()
+                
+                if book.available_copies > 0:
+                    ttk.Button(book_frame, text="Pinjam", 
+                              command=lambda b=book: self.quick_borrow(b.book_id)).pack()
+                
+                ttk.Button(book_frame, text="Lihat Detail", 
+                          command=lambda b=book: self.show_book_detail(b)).pack()
+            
+            if len(results) > self.SEARCH_PAGE_SIZE:
+                ttk.Label(results_frame, text=f"Menampilkan {self.SEARCH_PAGE_SIZE} hasil pertama, "
+                                              "persempit kriteria pencarian").pack(pady=5)
+        
+        def search_action():
+            state["after_id"] = None
+            
+            # Batalkan query sebelumnya (yang masih antre maupun yang sedang berjalan)
+            if state["future"] is not None:
+                state["future"].cancel()
+                state["stop"].set()
+            state["generation"] += 1
+            generation = state["generation"]
+            stop = threading.Event()
+            state["stop"] = stop
+            
+            status_label.config(text="Mencari...")
+            future = self._get_search_executor().submit(
+                self.library_manager.search_books_multi_criteria,
+                title=title_var.get(),
+                author=author_var.get(),
+                category=category_var.get(),
+                limit=self.SEARCH_PAGE_SIZE + 1,
+                should_stop=stop.is_set
+            )
+            state["future"] = future
+            
+            def check_search():
+                if generation != state["generation"] or not search_window.winfo_exists():
+                    return
+                if not future.done():
+                    search_window.after(50, check_search)
+                    return
+                
+                state["future"] = None
+                status_label.config(text="")
+                render_results(future.result())
+            
+            check_search()
+        
+        def schedule_search(*_):
+            # Debounce: query baru dijalankan setelah user berhenti mengetik
+            if state["after_id"] is not None:
+                search_window.after_cancel(state["after_id"])
+            state["after_id"] = search_window.after(self.SEARCH_DEBOUNCE_MS, search_action)
+        
+        for var in (title_var, author_var, category_var):
+            var.trace_add("write", schedule_search)
         
         ttk.Button(frame, text="Cari", command=search_action).pack(pady=10)
         
         # Results area
         ttk.Label(frame, text="Hasil Pencarian:", font=("Helvetica", 12, "bold")).pack(pady=10)
+        status_label = ttk.Label(frame, text="")
+        status_label.pack()
         
         results_frame = ttk.Frame(frame)
         results_frame.pack(fill="both", expand=True)
 
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """Worker thread untuk pencarian (satu thread; query lama dibatalkan)"""
+        if self._search_executor is None:
+            self._search_executor = ThreadPoolExecutor(max_workers=1,
+                                                       thread_name_prefix="search")
+        return self._search_executor
+
     def open_book_list(self):
         """Show list of all books"""
         list_window = tk.Toplevel(self.root)
@@ -324,14 +435,62 @@ class LibraryGUI:
         frame = ttk.Frame(list_window, padding="10")
         frame.pack(fill="both", expand=True)
         
-        # Create treeview
+        # Treeview virtual: hanya baris yang terlihat yang dibuat; halaman diambil
+        # dari index terurut LibraryManager saat user scroll
+        visible_rows = 15
         tree = ttk.Treeview(frame, columns=("ID", "Judul", "Author", "Kategori", "Tersedia", "Rating"),
-                           height=15)
+                           height=visible_rows)
+        sort_columns = {"ID": "book_id", "Judul": "title", "Author": "author", "Kategori": "category"}
+        state = {"offset": 0, "total": 0, "sort_by": "book_id", "descending": False}
+        
+        def render():
+            books, total = self.library_manager.get_books_page(
+                state["offset"], visible_rows, state["sort_by"], state["descending"]
+            )
+            state["total"] = total
+            tree.delete(*tree.get_children())
+            for idx, book in enumerate(books, state["offset"] + 1):
+                tree.insert("", "end", text=str(idx),
+                           values=(book.book_id, book.title, book.author, book.category,
+                                  f"{book.available_copies}/{book.total_copies}", f"{book.rating:.1f}"))
+            if total:
+                scrollbar.set(state["offset"] / total, (state["offset"] + len(books)) / total)
+            else:
+                scrollbar.set(0, 1)
+        
+        def scroll_to(offset):
+            offset = max(0, min(int(offset), state["total"] - visible_rows))
+            if offset != state["offset"]:
+                state["offset"] = offset
+                render()
+        
+        def on_scrollbar(action, amount, unit=None):
+            if action == "moveto":
+                scroll_to(float(amount) * state["total"])
+            elif action == "scroll":
+                step = visible_rows if unit == "pages" else 1
+                scroll_to(state["offset"] + int(amount) * step)
+        
+        def on_mousewheel(event):
+            if event.num == 4 or event.delta > 0:
+                scroll_to(state["offset"] - 3)
+            else:
+                scroll_to(state["offset"] + 3)
+        
+        def sort_by(column):
+            # Klik kolom yang sama membalik urutan
+            if state["sort_by"] == sort_columns[column]:
+                state["descending"] = not state["descending"]
+            else:
+                state["sort_by"], state["descending"] = sort_columns[column], False
+            state["offset"] = 0
+            render()
+        
         tree.heading("#0", text="No")
-        tree.heading("ID", text="Book ID")
-        tree.heading("Judul", text="Judul")
-        tree.heading("Author", text="Author")
-        tree.heading("Kategori", text="Kategori")
+        tree.heading("ID", text="Book ID", command=lambda: sort_by("ID"))
+        tree.heading("Judul", text="Judul", command=lambda: sort_by("Judul"))
+        tree.heading("Author", text="Author", command=lambda: sort_by("Author"))
+        tree.heading("Kategori", text="Kategori", command=lambda: sort_by("Kategori"))
         tree.heading("Tersedia", text="Tersedia")
         tree.heading("Rating", text="Rating")
         
@@ -343,14 +502,15 @@ class LibraryGUI:
         tree.column("Tersedia", width=60)
         tree.column("Rating", width=50)
         
-        # Add books
-        books = self.library_manager.get_all_books()
-        for idx, (book_id, book) in enumerate(books, 1):
-            tree.insert("", "end", text=str(idx),
-                       values=(book_id, book.title, book.author, book.category,
-                              f"{book.available_copies}/{book.total_copies}", f"{book.rating:.1f}"))
-        
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=on_scrollbar)
+        scrollbar.pack(side="right", fill="y", pady=10)
         tree.pack(fill="both", expand=True, pady=10)
+        
+        tree.bind("<MouseWheel>", on_mousewheel)
+        tree.bind("<Button-4>", on_mousewheel)
+        tree.bind("<Button-5>", on_mousewheel)
+        
+        render()
 
     def show_book_detail(self, book: Book):
         """Show detailed book information"""
@@ -384,15 +544,41 @@ class LibraryGUI:
         text_widget.config(state="disabled")
         text_widget.pack(fill="both", expand=True)
 
+        # Index TF-IDF bisa dibangun saat pertama dipakai; jalankan di worker
+        # pencarian dan isi "Buku Serupa" lewat after() agar window tidak freeze
+        similar_frame = ttk.Frame(frame)
+        similar_frame.pack(fill="x")
+        future = self._get_search_executor().submit(
+            self.library_manager.get_similar_books, book.book_id, 5
+        )
+        
+        def check_similar():
+            if not detail_window.winfo_exists():
+                return
+            if not future.done():
+                detail_window.after(50, check_similar)
+                return
+            
+            similar = future.result()
+            if similar:
+                ttk.Label(similar_frame, text="Buku Serupa",
+                          font=("Helvetica", 11, "bold")).pack(anchor="w", pady=(10, 0))
+                for similar_book, score in similar:
+                    ttk.Button(similar_frame, text=f"{similar_book.title} - {similar_book.author}",
+                              command=lambda b=similar_book: self.show_book_detail(b)).pack(fill="x", pady=1)
+        
+        check_similar()
+
     def quick_borrow(self, book_id: str):
         """Quick borrow action"""
         if self.current_user_role != UserRole.MEMBER.value:
             messagebox.showerror("Error", "Hanya member yang dapat meminjam")
             return
         
-        success, message, trans_id = self.library_manager.borrow_book(
-            self.current_user.user_id, book_id
-        )
+        with self.saver.mutation():
+            success, message, trans_id = self.library_manager.borrow_book(
+                self.current_user.user_id, book_id
+            )
         
         if success:
             messagebox.showinfo("Success", message)
@@ -424,7 +610,7 @@ class LibraryGUI:
         frame = ttk.Frame(trans_window, padding="10")
         frame.pack(fill="both", expand=True)
         
-        transactions = self.library_manager.get_user_transactions(self.current_user.user_id)
+        transactions = self.library_manager.get_user_transaction_views(self.current_user.user_id)
         
         tree = ttk.Treeview(frame, columns=("Tipe", "Buku", "Tanggal", "Deadline", "Status"),
                            height=15)
@@ -435,8 +621,7 @@ class LibraryGUI:
         tree.heading("Deadline", text="Deadline")
         tree.heading("Status", text="Status")
         
-        for trans in transactions:
-            book = self.library_manager.get_book(trans.book_id)
+        for trans, book in transactions:
             book_title = book.title if book else "Unknown"
             tree.insert("", "end", text=trans.transaction_id,
                        values=(trans.transaction_type, book_title,
@@ -499,7 +684,8 @@ class LibraryGUI:
                     pages=int(vars_dict["pages"].get() or 0)
                 )
                 
-                success, message = self.library_manager.add_book(book)
+                with self.saver.mutation():
+                    success, message = self.library_manager.add_book(book)
                 if success:
                     messagebox.showinfo("Success", message)
                     add_window.destroy()
@@ -600,8 +786,7 @@ class LibraryGUI:
             def save_changes():
                 """Save changes to book"""
                 try:
-                    success, message = self.library_manager.update_book(
-                        book_id,
+                    changes = dict(
                         title=title_var.get(),
                         author=author_var.get(),
                         category=category_var.get(),
@@ -610,10 +795,11 @@ class LibraryGUI:
                         total_copies=int(total_var.get()),
                         description=desc_text.get("1.0", "end-1c")
                     )
+                    with self.saver.mutation():
+                        success, message = self.library_manager.update_book(book_id, **changes)
                     
                     if success:
                         messagebox.showinfo("Success", message)
-                        self.persistence.save_all(self.library_manager, self.auth_manager)
                         edit_window.destroy()
                         manage_window.destroy()
                         self.open_manage_books()  # Refresh
@@ -636,11 +822,11 @@ class LibraryGUI:
             
             # Confirmation dialog
             if messagebox.askyesno("Konfirmasi", f"Hapus buku {book_id}?\nIni tidak dapat dibatalkan!"):
-                success, message = self.library_manager.delete_book(book_id)
+                with self.saver.mutation():
+                    success, message = self.library_manager.delete_book(book_id)
                 
                 if success:
                     messagebox.showinfo("Success", message)
-                    self.persistence.save_all(self.library_manager, self.auth_manager)
                     manage_window.destroy()
                     self.open_manage_books()  # Refresh
                 else:
@@ -654,7 +840,7 @@ class LibraryGUI:
         """Process book borrowing (librarian)"""
         borrow_window = tk.Toplevel(self.root)
         borrow_window.title("Proses Peminjaman")
-        borrow_window.geometry("400x200")
+        borrow_window.geometry("400x320")
         
         frame = ttk.Frame(borrow_window, padding="10")
         frame.pack(fill="both", expand=True)
@@ -663,18 +849,29 @@ class LibraryGUI:
         user_id_var = tk.StringVar()
         ttk.Entry(frame, textvariable=user_id_var, width=40).pack(pady=5)
         
-        ttk.Label(frame, text="Book ID:").pack(pady=5)
-        book_id_var = tk.StringVar()
-        ttk.Entry(frame, textvariable=book_id_var, width=40).pack(pady=5)
+        ttk.Label(frame, text="Book ID (satu per baris untuk banyak buku):").pack(pady=5)
+        book_ids_text = tk.Text(frame, width=40, height=6)
+        book_ids_text.pack(pady=5)
         
         def process_borrow():
-            success, message, trans_id = self.library_manager.borrow_book(
-                user_id_var.get(), book_id_var.get()
-            )
+            book_ids = self._parse_ids(book_ids_text.get("1.0", "end"))
+            if not book_ids:
+                messagebox.showerror("Error", "Book ID harus diisi")
+                return
+            
+            if len(book_ids) > 1:
+                with self.saver.mutation():
+                    results = self.library_manager.borrow_many(user_id_var.get(), book_ids)
+                self._show_batch_results("Peminjaman", book_ids, results)
+                return
+            
+            with self.saver.mutation():
+                success, message, trans_id = self.library_manager.borrow_book(
+                    user_id_var.get(), book_ids[0]
+                )
             
             if success:
                 messagebox.showinfo("Success", message)
-                self.persistence.save_all(self.library_manager, self.auth_manager)
             else:
                 messagebox.showerror("Error", message)
         
@@ -684,26 +881,60 @@ class LibraryGUI:
         """Process book return (librarian)"""
         return_window = tk.Toplevel(self.root)
         return_window.title("Proses Pengembalian")
-        return_window.geometry("400x200")
+        return_window.geometry("400x280")
         
         frame = ttk.Frame(return_window, padding="10")
         frame.pack(fill="both", expand=True)
         
-        ttk.Label(frame, text="Transaction ID:").pack(pady=5)
-        trans_id_var = tk.StringVar()
-        ttk.Entry(frame, textvariable=trans_id_var, width=40).pack(pady=5)
+        ttk.Label(frame, text="Transaction ID (satu per baris untuk banyak buku):").pack(pady=5)
+        trans_ids_text = tk.Text(frame, width=40, height=6)
+        trans_ids_text.pack(pady=5)
         
         def process_return():
-            success, message, fine = self.library_manager.return_book(trans_id_var.get())
+            trans_ids = self._parse_ids(trans_ids_text.get("1.0", "end"))
+            if not trans_ids:
+                messagebox.showerror("Error", "Transaction ID harus diisi")
+                return
+            
+            if len(trans_ids) > 1:
+                with self.saver.mutation():
+                    results = self.library_manager.return_many(trans_ids)
+                total_fine = sum(fine for success, _, fine in results if success)
+                self._show_batch_results("Pengembalian", trans_ids, results,
+                                         f"Total denda: Rp {total_fine:,.0f}")
+                return
+            
+            with self.saver.mutation():
+                success, message, fine = self.library_manager.return_book(trans_ids[0])
             
             if success:
                 messagebox.showinfo("Success", f"{message}\nDenda: Rp {fine:,.0f}")
-                self.persistence.save_all(self.library_manager, self.auth_manager)
             else:
                 messagebox.showerror("Error", message)
         
         ttk.Button(frame, text="Proses Pengembalian", command=process_return).pack(pady=10)
 
+    @staticmethod
+    def _parse_ids(text: str) -> List[str]:
+        """ID dari input (dipisah baris, spasi, atau koma; mis. hasil scan barcode)"""
+        return text.replace(",", " ").split()
+
+    def _show_batch_results(self, action: str, ids: List[str], results: list, extra: str = ""):
+        """Ringkasan hasil batch: jumlah berhasil dan alasan item yang gagal"""
+        failed = [f"- {item_id}: {message}"
+                  for item_id, (success, message, _) in zip(ids, results) if not success]
+        lines = [f"{action} berhasil: {len(ids) - len(failed)}/{len(ids)}"]
+        if extra:
+            lines.append(extra)
+        if failed:
+            lines.append("\nGagal:")
+            lines.extend(failed[:20])
+            if len(failed) > 20:
+                lines.append(f"... dan {len(failed) - 20} lainnya")
+            messagebox.showwarning(action, "\n".join(lines))
+        else:
+            messagebox.showinfo(action, "\n".join(lines))
+
     def open_manage_reservations(self):
         """Manage book reservations"""
         res_window = tk.Toplevel(self.root)
@@ -713,22 +944,27 @@ class LibraryGUI:
         frame = ttk.Frame(res_window, padding="10")
         frame.pack(fill="both", expand=True)
         
-        reservations = self.library_manager.reservation_list.get_all()
-        
         tree = ttk.Treeview(frame, columns=("User", "Buku", "Tanggal", "Status"),
                            height=15)
         tree.heading("#0", text="ID Reservasi")
-        tree.heading("User", text="User ID")
-        tree.heading("Buku", text="Book ID")
+        tree.heading("User", text="User")
+        tree.heading("Buku", text="Buku")
         tree.heading("Tanggal", text="Tanggal")
         tree.heading("Status", text="Status")
+        tree.pack(fill="both", expand=True, pady=10)
         
-        for res in reservations:
-            tree.insert("", "end", text=res.reservation_id,
-                       values=(res.user_id, res.book_id,
-                              res.reservation_date[:10], res.status))
+        def render(offset):
+            views, total = self.library_manager.get_reservation_views(offset, self.ADMIN_PAGE_SIZE)
+            tree.delete(*tree.get_children())
+            for res, book in views:
+                user = self.auth_manager.get_user_by_id(res.user_id)
+                tree.insert("", "end", text=res.reservation_id,
+                           values=(user.full_name if user else res.user_id,
+                                  book.title if book else res.book_id,
+                                  res.reservation_date[:10], res.status))
+            return total
         
-        tree.pack(fill="both", expand=True, pady=10)
+        self._add_pager(frame, render)
 
     def open_manage_users(self):
         """Manage users (admin)"""
@@ -739,8 +975,6 @@ class LibraryGUI:
         frame = ttk.Frame(users_window, padding="10")
         frame.pack(fill="both", expand=True)
         
-        all_users = self.auth_manager.get_all_users()
-        
         tree = ttk.Treeview(frame, columns=("Nama", "Email", "Role", "Aktif"),
                            height=15)
         tree.heading("#0", text="Username")
@@ -748,13 +982,47 @@ class LibraryGUI:
         tree.heading("Email", text="Email")
         tree.heading("Role", text="Role")
         tree.heading("Aktif", text="Aktif")
+        tree.pack(fill="both", expand=True, pady=10)
         
-        for username, user in all_users.items():
-            tree.insert("", "end", text=username,
-                       values=(user.full_name, user.email, user.role,
-                              "Ya" if user.is_active else "Tidak"))
+        def render(offset):
+            users, total = self.auth_manager.get_users_page(offset, self.ADMIN_PAGE_SIZE)
+            tree.delete(*tree.get_children())
+            for user in users:
+                tree.insert("", "end", text=user.username,
+                           values=(user.full_name, user.email, user.role,
+                                  "Ya" if user.is_active else "Tidak"))
+            return total
         
-        tree.pack(fill="both", expand=True, pady=10)
+        self._add_pager(frame, render)
+
+    def _add_pager(self, parent, render):
+        """
+        Tombol halaman sebelumnya/berikutnya untuk tampilan ber-halaman
+        render(offset) mengisi ulang tampilan dan mengembalikan total baris
+        """
+        pager = ttk.Frame(parent)
+        pager.pack(fill="x")
+        state = {"offset": 0, "total": 0}
+        
+        def show(offset):
+            state["offset"] = offset
+            state["total"] = render(offset)
+            page_count = max(1, -(-state["total"] // self.ADMIN_PAGE_SIZE))
+            page_label.config(text=f"Halaman {offset // self.ADMIN_PAGE_SIZE + 1}/{page_count} "
+                                   f"({state['total']} data)")
+            prev_btn.config(state="normal" if offset > 0 else "disabled")
+            next_btn.config(state="normal" if offset + self.ADMIN_PAGE_SIZE < state["total"] else "disabled")
+        
+        prev_btn = ttk.Button(pager, text="< Sebelumnya",
+                              command=lambda: show(state["offset"] - self.ADMIN_PAGE_SIZE))
+        prev_btn.pack(side="left")
+        next_btn = ttk.Button(pager, text="Berikutnya >",
+                              command=lambda: show(state["offset"] + self.ADMIN_PAGE_SIZE))
+        next_btn.pack(side="right")
+        page_label = ttk.Label(pager)
+        page_label.pack()
+        
+        show(0)
 
     def open_statistics(self):
         """Show statistics and reports (admin)"""
@@ -849,19 +1117,29 @@ Tanggal Generate: {stats.generated_date[:10]}
             rating = rating_var.get()
             review = review_text.get("1.0", "end-1c")
             
-            success, message = self.library_manager.add_review(
-                self.current_user.user_id, book_id, rating, review
-            )
+            with self.saver.mutation():
+                success, message = self.library_manager.add_review(
+                    self.current_user.user_id, book_id, rating, review
+                )
             
             if success:
                 messagebox.showinfo("Success", message)
                 review_window.destroy()
-                self.persistence.save_all(self.library_manager, self.auth_manager)
             else:
                 messagebox.showerror("Error", message)
         
         ttk.Button(frame, text="Submit Review", command=submit_review).pack(pady=10)
 
+    def on_close(self):
+        """Simpan perubahan tersisa sebelum aplikasi ditutup"""
+        self.saver.stop()
+        if not self.saver.last_result[0]:
+            messagebox.showerror("Error", self.saver.last_result[1])
+        if self._search_executor is not None:
+            self._search_executor.shutdown(wait=False)
+        self.auth_manager.shutdown()
+        self.root.destroy()
+
     def clear_frame(self):
         """Clear all widgets from root frame"""
         for widget in self.root.winfo_children():
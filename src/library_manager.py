@@ -3,12 +3,19 @@ Module LibraryManager untuk Sistem Perpustakaan Digital
 Core business logic untuk manajemen buku, transaksi, dan rekomendasi
 """
 
+import heapq
+import itertools
+import threading
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Iterable, Iterator, List, Dict, Tuple, Optional
 from src.data_structures import (
     BinarySearchTree, HashTable, Queue, Stack, Graph, 
-    LinkedList, MinHeap
+    LinkedList, LazyLinkedList, MinHeap, LRUCache, SortedIndex
+)
+from src.concurrency import ReadWriteLock, StripedLock
+from src.recommender import (
+    ContentSimilarityIndex, PersonalizedPageRank, build_coborrow_similarities
 )
 from src.models import (
     Book, Transaction, Reservation, Review, SearchHistory, 
@@ -20,14 +27,40 @@ class LibraryManager:
     """
     Core manager untuk operasi perpustakaan
     Mengintegrasikan berbagai struktur data
+    
+    Thread-safe: urutan pengambilan lock selalu
+    book_locks (stripe per buku) -> index_lock -> records_lock
     """
     
+    # Koleksi "dingin" yang boleh dimuat secara lazy
+    LAZY_COLLECTIONS = ("transactions", "reviews", "search_history")
+    
+    # Interval (jumlah buku) pengecekan should_stop pada pencarian
+    SEARCH_STOP_CHECK = 1024
+    
+    # Field yang menjadi key index (hash title/author, kategori, index terurut,
+    # TF-IDF); update field lain tidak perlu menyentuh index
+    INDEXED_FIELDS = ("title", "author", "category", "description")
+    
+    # Kolom yang bisa dipakai untuk sort di get_books_page
+    SORT_KEYS = {
+        "book_id": lambda book: book.book_id,
+        "title": lambda book: book.title.lower(),
+        "author": lambda book: book.author.lower(),
+        "category": lambda book: book.category.lower(),
+    }
+
+    # Rekomendasi dengan depth lebih besar tidak di-cache: radius invalidasi
+    # (BFS mundur di bawah write lock) dibatasi nilai ini
+    MAX_CACHED_DEPTH = 6
+
     def __init__(self):
         # Data structures untuk berbagai keperluan
         self.books_bst: BinarySearchTree = BinarySearchTree()  # Books by ID
         self.books_hash: HashTable = HashTable(capacity=500)  # Books by title
         self.books_by_category: dict = {}  # Category -> books list
         self.books_by_author: HashTable = HashTable(capacity=500)  # Books by author
+        self.sorted_indexes: Dict[str, SortedIndex] = {}  # Kolom -> index terurut (dibangun saat dibutuhkan)
         
         self.transactions: LinkedList = LinkedList()  # Riwayat transaksi
         self.transaction_queue: Queue = Queue()  # Queue transaksi yang diproses
@@ -40,159 +73,477 @@ class LibraryManager:
         self.search_history: LinkedList = LinkedList()  # Riwayat pencarian
         
         self.recommendation_graph: Graph = Graph()  # Graph untuk rekomendasi
+        self.recommendation_cache: LRUCache = LRUCache(  # (book_id, depth, limit) -> hasil
+            capacity=1024, on_evict=self._forget_recommendation)
+        self._recommendation_variants: Dict[str, set] = {}  # book_id -> {(depth, limit)} yang ada di cache
+        self._ppr: Optional[PersonalizedPageRank] = None  # CSR untuk rekomendasi per user
+        self._ppr_version: int = -1  # Versi graph saat _ppr dibangun
+        self.content_index: Optional[ContentSimilarityIndex] = None  # TF-IDF (dibangun saat dibutuhkan)
+        
+        # Backend yang bisa di-query langsung untuk koleksi lazy yang belum dimuat
+        self.cold_store = None
+        
+        # Katalog read-only memory-mapped (fallback untuk buku yang tidak ada di BST)
+        self.catalog = None
+        self.catalog_deleted: set = set()  # book_id katalog yang sudah dihapus (tombstone)
         
         self.borrow_count: int = 0
         self.return_count: int = 0
+        
+        # Penanda perubahan data buku (nilai unik baru setiap add/update/delete;
+        # next() pada itertools.count atomic sehingga aman tanpa lock tambahan)
+        self._change_ids = itertools.count(1)
+        self.books_version: int = 0
+        
+        # Locking untuk akses multi-thread (lihat docstring class untuk urutan lock)
+        self.book_locks: StripedLock = StripedLock()  # Read-check-write stok per buku
+        self.index_lock: ReadWriteLock = ReadWriteLock()  # Index buku, graph & index rekomendasi
+        self.records_lock = threading.RLock()  # Transaksi, reservasi, review, riwayat pencarian
+        self._cache_lock = threading.Lock()  # LRU cache rekomendasi (diakses banyak reader)
+
+    def attach_lazy_collections(self, loaders: Dict[str, Callable[[], Iterable]]) -> None:
+        """
+        Ganti koleksi dingin dengan LazyLinkedList
+        loaders: nama koleksi -> callable yang mengembalikan item koleksi,
+                 dipanggil sekali saat koleksi pertama kali diakses
+        """
+        for name, loader in loaders.items():
+            if name not in self.LAZY_COLLECTIONS:
+                raise ValueError(f"Koleksi '{name}' tidak mendukung lazy loading")
+            setattr(self, name, LazyLinkedList(loader))
+
+    def preload_lazy_collections(self, names: Iterable[str] = ("transactions",)) -> None:
+        """
+        Muat koleksi lazy sekarang (mis. dari background thread setelah startup)
+        Koleksi lazy dimuat utuh: borrow/return pertama menyentuh transactions,
+        sehingga tanpa preload mutasi pertama ikut men-deserialize seluruh riwayat
+        """
+        for name in names:
+            if name not in self.LAZY_COLLECTIONS:
+                raise ValueError(f"Koleksi '{name}' tidak mendukung lazy loading")
+            with self.records_lock:
+                getattr(self, name).size  # Akses pertama memicu loader
+
+    def attach_cold_store(self, store) -> None:
+        """
+        Pasang backend query data dingin (mis. SQLitePersistence)
+        Selama koleksi lazy belum dimuat, query per-user/per-buku diarahkan
+        ke backend ini alih-alih memuat seluruh koleksi ke memori
+        """
+        self.cold_store = store
+
+    def attach_catalog(self, catalog) -> None:
+        """
+        Pasang katalog memory-mapped (MmapCatalog)
+        Buku di katalog di-materialize oleh get_book saat diminta saja;
+        update_book menyalin buku yang diubah ke BST (copy-on-write),
+        delete_book menandai buku katalog di catalog_deleted
+        Setiap buku katalog mendapat node di recommendation_graph agar relasinya
+        bisa dimuat/ditambahkan (judul node diambil dari katalog saat dibutuhkan)
+        """
+        with self.index_lock.write():
+            self.catalog = catalog
+            self.catalog_deleted = set()
+            for book_id in catalog.iter_ids():
+                self.recommendation_graph.add_node(book_id, "")
+            self.sorted_indexes = {}  # Dibangun ulang termasuk buku katalog
+            self.books_version = next(self._change_ids)
+
+    def _catalog_get(self, book_id: str) -> Optional[Book]:
+        """Buku dari katalog mmap (None jika tidak ada katalog atau buku sudah dihapus)"""
+        if self.catalog is None or book_id in self.catalog_deleted:
+            return None
+        return self.catalog.get(book_id)
+
+    def _catalog_only(self, book_id: str) -> bool:
+        """Check apakah buku katalog belum disalin ke BST dan belum dihapus"""
+        return book_id not in self.catalog_deleted and self.books_bst.search(book_id) is None
+
+    def _iter_books(self) -> Iterator[Tuple[str, Book]]:
+        """
+        Iterasi (book_id, Book) urut book_id: BST digabung dengan buku katalog
+        yang belum disalin/dihapus (dipanggil di bawah index_lock)
+        """
+        if self.catalog is None:
+            return iter(self.books_bst)
+        catalog_books = ((book.book_id, book) for book in self.catalog.iter_books()
+                         if self._catalog_only(book.book_id))
+        return heapq.merge(self.books_bst, catalog_books, key=lambda item: item[0])
+
+    def _use_cold_store(self, collection) -> bool:
+        """Check apakah query koleksi sebaiknya diarahkan ke cold store"""
+        return (self.cold_store is not None and isinstance(collection, LazyLinkedList)
+                and not collection.is_loaded)
 
     # ==================== MANAJEMEN BUKU ====================
     
     def add_book(self, book: Book) -> Tuple[bool, str]:
         """Tambah buku baru ke sistem"""
-        if self.books_bst.search(book.book_id) is not None:
-            return False, "Book ID sudah terdaftar"
-        
-        # Insert ke berbagai struktur
-        self.books_bst.insert(book.book_id, book)
-        self.books_hash.insert(book.title.lower(), book)
-        self.books_by_author.insert(book.author.lower(), book)
-        
-        # Add ke category index
-        if book.category not in self.books_by_category:
-            self.books_by_category[book.category] = LinkedList()
-        self.books_by_category[book.category].append(book)
-        
-        # Add ke graph untuk rekomendasi
-        self.recommendation_graph.add_node(book.book_id, book.title)
+        with self.index_lock.write():
+            if self.books_bst.search(book.book_id) is not None or self._catalog_get(book.book_id) is not None:
+                return False, "Book ID sudah terdaftar"
+            
+            # Insert ke berbagai struktur
+            self.books_bst.insert(book.book_id, book)
+            self.catalog_deleted.discard(book.book_id)
+            self.books_hash.insert(book.title.lower(), book)
+            self.books_by_author.insert(book.author.lower(), book)
+            
+            # Add ke category index
+            if book.category not in self.books_by_category:
+                self.books_by_category[book.category] = LinkedList()
+            self.books_by_category[book.category].append(book)
+            
+            for column, index in self.sorted_indexes.items():
+                index.insert(self.SORT_KEYS[column](book), book.book_id)
+            
+            # Add ke graph untuk rekomendasi
+            self.recommendation_graph.add_node(book.book_id, book.title)
+            if self.content_index is not None:
+                self.content_index.add(book)
+            self.books_version = next(self._change_ids)
         
         return True, f"Buku '{book.title}' berhasil ditambahkan"
 
     def get_book(self, book_id: str) -> Optional[Book]:
         """Get buku berdasarkan ID"""
-        return self.books_bst.search(book_id)
+        with self.index_lock.read():
+            book = self.books_bst.search(book_id)
+            if book is None:
+                return self._catalog_get(book_id)
+            return book
 
     def search_book_by_title(self, title: str) -> Optional[Book]:
         """Search buku berdasarkan title"""
-        return self.books_hash.search(title.lower())
+        with self.index_lock.read():
+            return self.books_hash.search(title.lower())
 
     def search_book_by_author(self, author: str) -> Optional[Book]:
         """Search buku berdasarkan author"""
-        return self.books_by_author.search(author.lower())
+        with self.index_lock.read():
+            return self.books_by_author.search(author.lower())
 
     def search_books_by_category(self, category: str) -> List[Book]:
-        """Get semua buku dalam kategori tertentu"""
-        if category in self.books_by_category:
-            return self.books_by_category[category].get_all()
-        return []
+        """Get semua buku dalam kategori tertentu (termasuk buku katalog mmap)"""
+        with self.index_lock.read():
+            books = self.books_by_category[category].get_all() if category in self.books_by_category else []
+            if self.catalog is not None:
+                books.extend(book for book in self.catalog.search(category=category)
+                             if self._catalog_only(book.book_id))
+            return books
 
     def search_books_multi_criteria(self, title: str = "", author: str = "", 
-                                   category: str = "", year: int = 0) -> List[Book]:
+                                   category: str = "", year: int = 0,
+                                   limit: Optional[int] = None,
+                                   should_stop: Optional[Callable[[], bool]] = None) -> List[Book]:
         """
         Pencarian multi-kriteria
         Menggunakan kombinasi BST traversal, Hash Table, dan Array Operations
+        Traversal berhenti setelah `limit` hasil, atau saat should_stop() bernilai
+        True (dicek tiap SEARCH_STOP_CHECK buku; mis. query sudah basi di GUI)
+        Buku di katalog mmap yang belum disalin ke BST ikut dicari setelah BST
         """
         results = []
-        all_books = self.books_bst.get_all()
-        
-        for book_id, book in all_books:
-            # Filter berdasarkan kriteria
-            title_match = not title or title.lower() in book.title.lower()
-            author_match = not author or author.lower() in book.author.lower()
-            category_match = not category or category == book.category
-            year_match = not year or book.publication_year == year
+        
+        with self.index_lock.read():
+            for scanned, (book_id, book) in enumerate(self.books_bst, 1):
+                if should_stop is not None and scanned % self.SEARCH_STOP_CHECK == 0 and should_stop():
+                    return results
+                
+                # Filter berdasarkan kriteria
+                title_match = not title or title.lower() in book.title.lower()
+                author_match = not author or author.lower() in book.author.lower()
+                category_match = not category or category == book.category
+                year_match = not year or book.publication_year == year
+                
+                if title_match and author_match and category_match and year_match:
+                    results.append(book)
+                    if limit is not None and len(results) >= limit:
+                        return results
             
-            if title_match and author_match and category_match and year_match:
-                results.append(book)
+            if self.catalog is not None:
+                for book in self.catalog.search(title, author, category, year):
+                    if not self._catalog_only(book.book_id):
+                        continue  # Sudah ikut di-scan dari BST (copy-on-write) atau dihapus
+                    results.append(book)
+                    if limit is not None and len(results) >= limit:
+                        break
         
         return results
 
+    def get_books_many(self, book_ids: Iterable[str]) -> Dict[str, Book]:
+        """
+        Get banyak buku sekaligus (satu traversal BST, bukan satu pencarian per ID)
+        Returns: dict book_id -> Book; ID yang tidak ditemukan tidak dimasukkan
+        """
+        book_ids = set(book_ids)
+        with self.index_lock.read():
+            books = self.books_bst.search_many(book_ids)
+            if self.catalog is not None:
+                for book_id in book_ids - books.keys():
+                    book = self._catalog_get(book_id)
+                    if book is not None:
+                        books[book_id] = book
+        return books
+
     def get_all_books(self) -> List[Tuple[str, Book]]:
-        """Get semua buku (sorted by ID)"""
-        return self.books_bst.get_all()
+        """Get semua buku (sorted by ID), termasuk buku katalog mmap"""
+        with self.index_lock.read():
+            if self.catalog is None:
+                return self.books_bst.get_all()
+            return list(self._iter_books())
+
+    def get_books_page(self, offset: int = 0, limit: int = 50, sort_by: str = "book_id",
+                       descending: bool = False) -> Tuple[List[Book], int]:
+        """
+        Get satu halaman buku terurut berdasarkan kolom sort_by (lihat SORT_KEYS)
+        Index terurut per kolom dibangun dari BST (+ katalog mmap) saat pertama
+        diminta lalu dijaga incremental oleh add/update/delete_book
+        Returns: (list Book di halaman ini, total buku)
+        """
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"Kolom sort tidak dikenal: {sort_by}")
+        
+        with self.index_lock.read():
+            index = self.sorted_indexes.get(sort_by)
+        if index is None:
+            with self.index_lock.write():
+                index = self.sorted_indexes.get(sort_by)
+                if index is None:
+                    key = self.SORT_KEYS[sort_by]
+                    index = SortedIndex((key(book), book_id) for book_id, book in self._iter_books())
+                    self.sorted_indexes[sort_by] = index
+        
+        with self.index_lock.read():
+            books = []
+            for book_id in index.page(offset, limit, descending):
+                book = self.books_bst.search(book_id) or self._catalog_get(book_id)
+                if book is not None:
+                    books.append(book)
+            return books, len(index)
 
     def update_book(self, book_id: str, **kwargs) -> Tuple[bool, str]:
-        """Update informasi buku"""
-        book = self.get_book(book_id)
+        """
+        Update informasi buku
+        Index hanya disentuh bila field key-nya (INDEXED_FIELDS) berubah, dan key
+        lama dihapus. Update counter saja (stok, borrow_count, status, rating)
+        tidak menyentuh index maupun write lock.
+        """
+        with self.book_locks.hold(book_id):
+            if not any(field in self.INDEXED_FIELDS for field in kwargs):
+                # Counter dijaga stripe lock buku; read lock cukup untuk menemukan buku di BST
+                with self.index_lock.read():
+                    book = self.books_bst.search(book_id)
+                    if book is not None:
+                        for key, value in kwargs.items():
+                            if hasattr(book, key):
+                                setattr(book, key, value)
+                        self.books_version = next(self._change_ids)
+                        return True, "Buku berhasil diupdate"
+            
+            with self.index_lock.write():
+                return self._update_indexed_book(book_id, kwargs)
+
+    def _update_indexed_book(self, book_id: str, kwargs: Dict) -> Tuple[bool, str]:
+        """update_book untuk perubahan field index atau buku katalog (di bawah write lock)"""
+        book = self.books_bst.search(book_id)
+        in_memory = book is not None
+        if book is None:
+            book = self._catalog_get(book_id)
         if book is None:
             return False, "Buku tidak ditemukan"
         
+        old_values = {field: getattr(book, field) for field in self.INDEXED_FIELDS}
+        old_sort_keys = {column: self.SORT_KEYS[column](book) for column in self.sorted_indexes}
+        
         # Update fields
         for key, value in kwargs.items():
             if hasattr(book, key):
                 setattr(book, key, value)
+        changed = {field for field, value in old_values.items() if getattr(book, field) != value}
+        
+        if not in_memory:
+            # Copy-on-write buku dari katalog mmap: masuk BST & index untuk pertama kali
+            self.books_bst.insert(book_id, book)
+            self.books_hash.insert(book.title.lower(), book)
+            self.books_by_author.insert(book.author.lower(), book)
+            self.books_by_category.setdefault(book.category, LinkedList()).append(book)
+        else:
+            if "title" in changed:
+                self._unindex_key(self.books_hash, old_values["title"], book)
+                self.books_hash.insert(book.title.lower(), book)
+            if "author" in changed:
+                self._unindex_key(self.books_by_author, old_values["author"], book)
+                self.books_by_author.insert(book.author.lower(), book)
+            if "category" in changed:
+                old_category = self.books_by_category.get(old_values["category"])
+                if old_category is not None:
+                    old_category.remove(book)
+                self.books_by_category.setdefault(book.category, LinkedList()).append(book)
+        
+        # Index terurut sudah berisi buku katalog juga: cukup pindahkan key yang berubah
+        for column, index in self.sorted_indexes.items():
+            new_key = self.SORT_KEYS[column](book)
+            if old_sort_keys[column] != new_key:
+                index.remove(old_sort_keys[column], book_id)
+                index.insert(new_key, book_id)
         
-        # Update di semua struktur
-        self.books_bst.insert(book.book_id, book)
-        self.books_hash.insert(book.title.lower(), book)
-        self.books_by_author.insert(book.author.lower(), book)
+        # Judul tampil di hasil rekomendasi yang di-cache
+        if "title" in changed:
+            node = self.recommendation_graph.nodes.get(book_id)
+            if node is not None:
+                node.title = book.title
+            self._invalidate_recommendations(book_id, self._max_cached_depth())
+        if self.content_index is not None and changed:
+            self.content_index.add(book)
+        self.books_version = next(self._change_ids)
         
         return True, "Buku berhasil diupdate"
 
+    @staticmethod
+    def _unindex_key(table: HashTable, key: str, book: Book) -> None:
+        """Hapus key lama dari hash index jika masih menunjuk ke buku ini"""
+        if table.search(key.lower()) is book:
+            table.delete(key.lower())
+
     def delete_book(self, book_id: str) -> Tuple[bool, str]:
         """Hapus buku dari sistem"""
-        book = self.get_book(book_id)
-        if book is None:
-            return False, "Buku tidak ditemukan"
+        with self.book_locks.hold(book_id), self.index_lock.write():
+            book = self.get_book(book_id)
+            if book is None:
+                return False, "Buku tidak ditemukan"
         
-        # Hapus dari berbagai struktur
-        self.books_bst.delete(book_id)
-        self.books_hash.delete(book.title.lower())
-        self.books_by_author.delete(book.author.lower())
+            # Hapus dari berbagai struktur
+            self.books_bst.delete(book_id)
+            if self.catalog is not None:
+                self.catalog_deleted.add(book_id)  # Versi katalog (jika ada) tidak muncul lagi
+            for column, index in self.sorted_indexes.items():
+                index.remove(self.SORT_KEYS[column](book), book_id)
+            category = self.books_by_category.get(book.category)
+            if category is not None:
+                category.remove(book)
+            self._unindex_key(self.books_hash, book.title, book)
+            self._unindex_key(self.books_by_author, book.author, book)
+            self._invalidate_recommendations(book_id, self._max_cached_depth())
+            self.recommendation_graph.remove_node(book_id)
+            if self.content_index is not None:
+                self.content_index.remove(book_id)
+            self.books_version = next(self._change_ids)
         
-        return True, "Buku berhasil dihapus"
+            return True, "Buku berhasil dihapus"
 
     # ==================== SISTEM TRANSAKSI ====================
     
     def borrow_book(self, user_id: str, book_id: str, duration_days: int = 7) -> Tuple[bool, str, Optional[str]]:
         """Proses peminjaman buku"""
-        book = self.get_book(book_id)
-        if book is None:
-            return False, "Buku tidak ditemukan", None
-        
-        if book.available_copies <= 0:
-            return False, "Buku tidak tersedia", None
+        # Cek stok dan pengurangannya atomic per buku (stripe lock)
+        with self.book_locks.hold(book_id):
+            book = self.get_book(book_id)
+            if book is None:
+                return False, "Buku tidak ditemukan", None
+            
+            if book.available_copies <= 0:
+                return False, "Buku tidak tersedia", None
+            
+            # Create transaction
+            transaction_id = str(uuid.uuid4())[:8]
+            due_date = (datetime.now() + timedelta(days=duration_days)).isoformat()
+            
+            transaction = Transaction(
+                transaction_id=transaction_id,
+                user_id=user_id,
+                book_id=book_id,
+                transaction_type=TransactionType.BORROW.value,
+                due_date=due_date,
+                status="Aktif"
+            )
+            
+            # Update buku
+            book.available_copies -= 1
+            book.borrow_count += 1
+            if book.available_copies == 0:
+                book.status = BookStatus.BORROWED.value
+            self.update_book(book_id, 
+                            available_copies=book.available_copies,
+                            borrow_count=book.borrow_count,
+                            status=book.status)
+            
+            self._record_borrows([(transaction, book)])
         
-        # Create transaction
-        transaction_id = str(uuid.uuid4())[:8]
+        return True, f"Peminjaman berhasil. Batas pengembalian: {due_date}", transaction_id
+
+    def borrow_many(self, user_id: str, book_ids: Iterable[str],
+                    duration_days: int = 7) -> List[Tuple[bool, str, Optional[str]]]:
+        """
+        Proses peminjaman banyak buku sekaligus untuk satu user (meja layanan)
+        Stripe semua buku dikunci sekali, buku diambil dengan satu traversal BST
+        dan transaksi dicatat sekaligus
+        Returns: hasil per item (format borrow_book), urutan sama dengan book_ids
+        """
+        book_ids = list(book_ids)
+        results = []
+        borrowed = []
+        changed = {}
         due_date = (datetime.now() + timedelta(days=duration_days)).isoformat()
         
-        transaction = Transaction(
-            transaction_id=transaction_id,
-            user_id=user_id,
-            book_id=book_id,
-            transaction_type=TransactionType.BORROW.value,
-            due_date=due_date,
-            status="Aktif"
-        )
-        
-        # Add ke queue untuk diproses
-        self.transaction_queue.enqueue(transaction)
-        
-        # Update buku
-        book.available_copies -= 1
-        book.borrow_count += 1
-        if book.available_copies == 0:
-            book.status = BookStatus.BORROWED.value
-        self.update_book(book_id, 
-                        available_copies=book.available_copies,
-                        borrow_count=book.borrow_count,
-                        status=book.status)
-        
-        # Tambah ke history
-        self.transactions.append(transaction)
-        self.transaction_history.push({
-            'action': 'borrow',
-            'transaction': transaction,
-            'book_before': book
-        })
-        
-        self.borrow_count += 1
+        with self.book_locks.hold_many(book_ids):
+            books = self.get_books_many(book_ids)
+            for book_id in book_ids:
+                book = books.get(book_id)
+                if book is None:
+                    results.append((False, "Buku tidak ditemukan", None))
+                    continue
+                if book.available_copies <= 0:
+                    results.append((False, "Buku tidak tersedia", None))
+                    continue
+                
+                transaction = Transaction(
+                    transaction_id=str(uuid.uuid4())[:8],
+                    user_id=user_id,
+                    book_id=book_id,
+                    transaction_type=TransactionType.BORROW.value,
+                    due_date=due_date,
+                    status="Aktif"
+                )
+                book.available_copies -= 1
+                book.borrow_count += 1
+                if book.available_copies == 0:
+                    book.status = BookStatus.BORROWED.value
+                changed[book_id] = book
+                borrowed.append((transaction, book))
+                results.append((True, f"Peminjaman berhasil. Batas pengembalian: {due_date}",
+                                transaction.transaction_id))
+            
+            for book_id, book in changed.items():
+                self.update_book(book_id,
+                                 available_copies=book.available_copies,
+                                 borrow_count=book.borrow_count,
+                                 status=book.status)
+            self._record_borrows(borrowed)
         
-        return True, f"Peminjaman berhasil. Batas pengembalian: {due_date}", transaction_id
+        return results
+
+    def _record_borrows(self, borrowed: List[Tuple[Transaction, Book]]) -> None:
+        """Catat transaksi peminjaman (queue, riwayat, undo stack, counter)"""
+        with self.records_lock:
+            for transaction, book in borrowed:
+                # Add ke queue untuk diproses
+                self.transaction_queue.enqueue(transaction)
+                
+                # Tambah ke history
+                self.transactions.append(transaction)
+                self.transaction_history.push({
+                    'action': 'borrow',
+                    'transaction': transaction,
+                    'book_before': book
+                })
+            
+            self.borrow_count += len(borrowed)
 
     def return_book(self, transaction_id: str) -> Tuple[bool, str, float]:
         """Proses pengembalian buku"""
         # Cari transaksi
-        transactions = self.transactions.get_all()
+        transactions = self.get_all_transactions()
         transaction = None
         for trans in transactions:
             if trans.transaction_id == transaction_id:
@@ -205,54 +556,133 @@ class LibraryManager:
         if transaction.transaction_type != TransactionType.BORROW.value:
             return False, "Transaksi bukan peminjaman", 0.0
         
-        if transaction.status != "Aktif":
-            return False, "Transaksi sudah ditutup", 0.0
-        
-        # Get buku
-        book = self.get_book(transaction.book_id)
-        if book is None:
-            return False, "Buku tidak ditemukan", 0.0
-        
-        # Create return transaction
-        transaction.return_date = datetime.now().isoformat()
-        transaction.status = "Selesai"
-        fine_amount = transaction.calculate_fine()
-        
-        # Update buku
-        book.available_copies += 1
-        if book.available_copies == book.total_copies:
-            book.status = BookStatus.AVAILABLE.value
-        self.update_book(transaction.book_id,
-                        available_copies=book.available_copies,
-                        status=book.status)
-        
-        # Tambah ke history
-        self.transaction_history.push({
-            'action': 'return',
-            'transaction': transaction,
-            'fine_amount': fine_amount
-        })
-        
-        self.return_count += 1
+        # Status dicek ulang di bawah lock buku agar transaksi tidak dikembalikan dua kali
+        with self.book_locks.hold(transaction.book_id):
+            if transaction.status != "Aktif":
+                return False, "Transaksi sudah ditutup", 0.0
+            
+            # Get buku
+            book = self.get_book(transaction.book_id)
+            if book is None:
+                return False, "Buku tidak ditemukan", 0.0
+            
+            # Create return transaction
+            transaction.return_date = datetime.now().isoformat()
+            transaction.status = "Selesai"
+            fine_amount = transaction.calculate_fine()
+            
+            # Update buku
+            book.available_copies += 1
+            if book.available_copies == book.total_copies:
+                book.status = BookStatus.AVAILABLE.value
+            self.update_book(transaction.book_id,
+                            available_copies=book.available_copies,
+                            status=book.status)
+            
+            self._record_returns([(transaction, fine_amount)])
         
         return True, "Pengembalian berhasil", fine_amount
 
+    def return_many(self, transaction_ids: Iterable[str]) -> List[Tuple[bool, str, float]]:
+        """
+        Proses pengembalian banyak buku sekaligus (mis. satu tumpukan di meja layanan)
+        Semua transaksi dicari dalam satu scan riwayat (bukan satu scan per item);
+        ID yang sama dua kali dalam batch hanya dikembalikan sekali
+        Returns: hasil per item (format return_book), urutan sama dengan transaction_ids
+        """
+        transaction_ids = list(transaction_ids)
+        wanted = set(transaction_ids)
+        found = {}
+        for trans in self.get_all_transactions():
+            if trans.transaction_id in wanted and trans.transaction_id not in found:
+                found[trans.transaction_id] = trans
+                if len(found) == len(wanted):
+                    break
+        
+        results = []
+        returned = []
+        changed = {}
+        book_ids = {trans.book_id for trans in found.values()}
+        
+        with self.book_locks.hold_many(book_ids):
+            books = self.get_books_many(book_ids)
+            for transaction_id in transaction_ids:
+                transaction = found.get(transaction_id)
+                if transaction is None:
+                    results.append((False, "Transaksi tidak ditemukan", 0.0))
+                    continue
+                if transaction.transaction_type != TransactionType.BORROW.value:
+                    results.append((False, "Transaksi bukan peminjaman", 0.0))
+                    continue
+                if transaction.status != "Aktif":
+                    results.append((False, "Transaksi sudah ditutup", 0.0))
+                    continue
+                book = books.get(transaction.book_id)
+                if book is None:
+                    results.append((False, "Buku tidak ditemukan", 0.0))
+                    continue
+                
+                transaction.return_date = datetime.now().isoformat()
+                transaction.status = "Selesai"
+                fine_amount = transaction.calculate_fine()
+                
+                book.available_copies += 1
+                if book.available_copies == book.total_copies:
+                    book.status = BookStatus.AVAILABLE.value
+                changed[book.book_id] = book
+                returned.append((transaction, fine_amount))
+                results.append((True, "Pengembalian berhasil", fine_amount))
+            
+            for book_id, book in changed.items():
+                self.update_book(book_id,
+                                 available_copies=book.available_copies,
+                                 status=book.status)
+            self._record_returns(returned)
+        
+        return results
+
+    def _record_returns(self, returned: List[Tuple[Transaction, float]]) -> None:
+        """Catat pengembalian (undo stack, counter)"""
+        with self.records_lock:
+            for transaction, fine_amount in returned:
+                # Tambah ke history
+                self.transaction_history.push({
+                    'action': 'return',
+                    'transaction': transaction,
+                    'fine_amount': fine_amount
+                })
+            
+            self.return_count += len(returned)
+
     def get_user_transactions(self, user_id: str) -> List[Transaction]:
         """Get transaksi user"""
-        all_trans = self.transactions.get_all()
+        with self.records_lock:
+            if self._use_cold_store(self.transactions):
+                return self.cold_store.get_user_transactions(user_id)
+            all_trans = self.transactions.get_all()
         return [t for t in all_trans if t.user_id == user_id]
 
+    def get_user_transaction_views(self, user_id: str) -> List[Tuple[Transaction, Optional[Book]]]:
+        """Get transaksi user beserta Book-nya (None jika buku sudah dihapus)"""
+        transactions = self.get_user_transactions(user_id)
+        books = self.get_books_many(t.book_id for t in transactions)
+        return [(t, books.get(t.book_id)) for t in transactions]
+
     def get_all_transactions(self) -> List[Transaction]:
         """Get semua transaksi"""
-        return self.transactions.get_all()
+        with self.records_lock:
+            return self.transactions.get_all()
 
     def get_pending_transactions(self) -> List[Transaction]:
         """Get transaksi yang masih pending (belum di-return)"""
-        all_trans = self.transactions.get_all()
+        all_trans = self.get_all_transactions()
         return [t for t in all_trans if t.status == "Aktif" and t.transaction_type == TransactionType.BORROW.value]
 
     def get_overdue_books(self) -> List[Transaction]:
         """Get buku yang overdue"""
+        with self.records_lock:
+            if self._use_cold_store(self.transactions):
+                return self.cold_store.get_overdue_transactions(datetime.now().isoformat())
         pending = self.get_pending_transactions()
         overdue = []
         for trans in pending:
@@ -264,48 +694,65 @@ class LibraryManager:
     
     def reserve_book(self, user_id: str, book_id: str) -> Tuple[bool, str, Optional[str]]:
         """Reservasi buku"""
-        book = self.get_book(book_id)
-        if book is None:
-            return False, "Buku tidak ditemukan", None
-        
-        if book.available_copies > 0:
-            return False, "Buku masih tersedia, tidak perlu reservasi", None
-        
-        # Create reservation
-        reservation_id = str(uuid.uuid4())[:8]
-        current_priority = self.reservations.size()
-        
-        reservation = Reservation(
-            reservation_id=reservation_id,
-            user_id=user_id,
-            book_id=book_id
-        )
-        
-        # Add ke priority queue
-        self.reservations.insert((current_priority, reservation))
-        self.reservation_list.append(reservation)
+        with self.book_locks.hold(book_id):
+            book = self.get_book(book_id)
+            if book is None:
+                return False, "Buku tidak ditemukan", None
+            
+            if book.available_copies > 0:
+                return False, "Buku masih tersedia, tidak perlu reservasi", None
+            
+            # Create reservation
+            reservation_id = str(uuid.uuid4())[:8]
+            reservation = Reservation(
+                reservation_id=reservation_id,
+                user_id=user_id,
+                book_id=book_id
+            )
+            
+            # Add ke priority queue
+            with self.records_lock:
+                current_priority = self.reservations.size()
+                self.reservations.insert((current_priority, reservation))
+                self.reservation_list.append(reservation)
         
         return True, f"Reservasi berhasil. Posisi: {current_priority + 1}", reservation_id
 
     def cancel_reservation(self, reservation_id: str) -> Tuple[bool, str]:
         """Cancel reservasi"""
-        reservations = self.reservation_list.get_all()
-        for i, res in enumerate(reservations):
-            if res.reservation_id == reservation_id:
-                res.status = "Dibatalkan"
-                self.reservation_list.insert_at(i, res)
-                return True, "Reservasi berhasil dibatalkan"
-        
-        return False, "Reservasi tidak ditemukan"
+        with self.records_lock:
+            reservations = self.reservation_list.get_all()
+            for i, res in enumerate(reservations):
+                if res.reservation_id == reservation_id:
+                    res.status = "Dibatalkan"
+                    self.reservation_list.insert_at(i, res)
+                    return True, "Reservasi berhasil dibatalkan"
+            
+            return False, "Reservasi tidak ditemukan"
 
     def get_user_reservations(self, user_id: str) -> List[Reservation]:
         """Get reservasi user"""
-        reservations = self.reservation_list.get_all()
+        with self.records_lock:
+            reservations = self.reservation_list.get_all()
         return [r for r in reservations if r.user_id == user_id and r.status == "Aktif"]
 
+    def get_reservation_views(self, offset: int = 0,
+                              limit: Optional[int] = None) -> Tuple[List[Tuple[Reservation, Optional[Book]]], int]:
+        """
+        Get satu halaman reservasi (urutan dibuat) beserta Book-nya
+        Returns: (list (Reservation, Book/None), total reservasi)
+        """
+        with self.records_lock:
+            reservations = self.reservation_list.get_all()
+        total = len(reservations)
+        page = reservations[offset:] if limit is None else reservations[offset:offset + limit]
+        books = self.get_books_many(r.book_id for r in page)
+        return [(r, books.get(r.book_id)) for r in page], total
+
     def get_next_reservation(self, book_id: str) -> Optional[Reservation]:
         """Get reservasi berikutnya untuk buku"""
-        heap_items = self.reservations.get_all()
+        with self.records_lock:
+            heap_items = self.reservations.get_all()
         
         for priority, res in sorted(heap_items, key=lambda x: x[0]):
             if res.book_id == book_id and res.status == "Aktif":
@@ -320,53 +767,245 @@ class LibraryManager:
         if rating < 1 or rating > 5:
             return False, "Rating harus antara 1-5"
         
-        book = self.get_book(book_id)
-        if book is None:
-            return False, "Buku tidak ditemukan"
-        
-        review_id = str(uuid.uuid4())[:8]
-        review = Review(
-            review_id=review_id,
-            book_id=book_id,
-            user_id=user_id,
-            rating=rating,
-            review_text=review_text
-        )
-        
-        self.reviews.append(review)
-        
-        # Update book rating (simple average)
-        all_reviews = self.reviews.get_all()
-        book_reviews = [r for r in all_reviews if r.book_id == book_id]
-        avg_rating = sum(r.rating for r in book_reviews) / len(book_reviews) if book_reviews else 0
-        self.update_book(book_id, rating=avg_rating)
+        with self.book_locks.hold(book_id):
+            book = self.get_book(book_id)
+            if book is None:
+                return False, "Buku tidak ditemukan"
+            
+            review_id = str(uuid.uuid4())[:8]
+            review = Review(
+                review_id=review_id,
+                book_id=book_id,
+                user_id=user_id,
+                rating=rating,
+                review_text=review_text
+            )
+            
+            with self.records_lock:
+                self.reviews.append(review)
+                all_reviews = self.reviews.get_all()
+            
+            # Update book rating (simple average)
+            book_reviews = [r for r in all_reviews if r.book_id == book_id]
+            avg_rating = sum(r.rating for r in book_reviews) / len(book_reviews) if book_reviews else 0
+            self.update_book(book_id, rating=avg_rating)
         
         return True, "Review berhasil ditambahkan"
 
     def get_book_reviews(self, book_id: str) -> List[Review]:
         """Get semua review untuk buku"""
-        all_reviews = self.reviews.get_all()
+        with self.records_lock:
+            if self._use_cold_store(self.reviews):
+                return self.cold_store.get_book_reviews(book_id)
+            all_reviews = self.reviews.get_all()
         return [r for r in all_reviews if r.book_id == book_id]
 
     # ==================== SISTEM REKOMENDASI ====================
     
     def add_book_relationship(self, book_id1: str, book_id2: str, similarity: float = 1.0) -> None:
         """Add hubungan antar buku (untuk rekomendasi)"""
-        self.recommendation_graph.add_edge(book_id1, book_id2, similarity)
+        with self.index_lock.write():
+            self.recommendation_graph.add_edge(book_id1, book_id2, similarity)
+            self._invalidate_recommendations(book_id1, self._max_cached_depth() - 1)
 
-    def get_recommendations(self, book_id: str, depth: int = 2) -> List[Tuple[str, float]]:
-        """Get rekomendasi buku berdasarkan similarity"""
-        recommendations = self.recommendation_graph.get_recommendations(book_id, depth)
+    def add_book_relationships(self, relationships: Iterable[Tuple[str, str, float]]) -> int:
+        """
+        Bulk add hubungan antar buku (book_id1, book_id2, similarity)
+        Returns: jumlah hubungan baru
+        """
+        relationships = list(relationships)
+        with self.index_lock.write():
+            added = self.recommendation_graph.add_edges(relationships)
+            
+            sources = {book_id1 for book_id1, _, _ in relationships}
+            if len(sources) > len(self.recommendation_cache):
+                with self._cache_lock:
+                    self.recommendation_cache.clear()
+                    self._recommendation_variants.clear()
+            else:
+                radius = self._max_cached_depth() - 1
+                for book_id in sources:
+                    self._invalidate_recommendations(book_id, radius)
+            return added
+
+    def get_recommendations(self, book_id: str, depth: int = 2,
+                            limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Get rekomendasi buku berdasarkan similarity (limit: top-K terkuat)
+        Hasil di-cache per (book_id, depth, limit) dan di-invalidate saat graph
+        di sekitar buku berubah
+        """
+        key = (book_id, depth, limit)
+        # Hasil di-put ke cache sebelum read lock dilepas, sehingga invalidasi
+        # (di bawah write lock) tidak pernah terlewat
+        with self.index_lock.read():
+            with self._cache_lock:
+                cached = self.recommendation_cache.get(key)
+            if cached is not None:
+                return list(cached)
+            
+            recommendations = self.recommendation_graph.get_recommendations(book_id, depth, limit)
+            
+            # Enrich dengan data buku
+            result = []
+            for rec_id, weight in recommendations:
+                book = self.get_book(rec_id)
+                if book:
+                    result.append((book.title, weight))
+            
+            if depth <= self.MAX_CACHED_DEPTH:
+                with self._cache_lock:
+                    self._recommendation_variants.setdefault(book_id, set()).add((depth, limit))
+                    self.recommendation_cache.put(key, result)
+        return list(result)
+
+    def get_user_recommendations(self, user_id: str, limit: int = 10,
+                                 alpha: float = 0.15,
+                                 epsilon: float = 1e-4) -> List[Tuple[str, float]]:
+        """
+        Get rekomendasi "untuk Anda" berdasarkan semua buku yang pernah dipinjam user
+        Personalized PageRank dengan seed buku-buku tersebut; buku yang sudah
+        pernah dipinjam tidak ikut direkomendasikan
+        """
+        borrowed = {}
+        for trans in self.get_user_transactions(user_id):
+            if trans.transaction_type == TransactionType.BORROW.value:
+                borrowed[trans.book_id] = borrowed.get(trans.book_id, 0) + 1
+        if not borrowed:
+            return []
         
-        # Enrich dengan data buku
-        result = []
-        for rec_id, weight in recommendations:
-            book = self.get_book(rec_id)
-            if book:
-                result.append((book.title, weight))
+        with self.index_lock.read():
+            # Dua reader bisa membangun CSR bersamaan; hasilnya sama, yang terakhir dipakai
+            ppr = self._ppr
+            if ppr is None or self._ppr_version != self.recommendation_graph.version:
+                ppr = PersonalizedPageRank.from_graph(self.recommendation_graph)
+                self._ppr, self._ppr_version = ppr, self.recommendation_graph.version
+            scores = ppr.rank(borrowed, alpha, epsilon)
+            
+            ranked = sorted(((score, book_id) for book_id, score in scores.items()
+                             if book_id not in borrowed), key=lambda x: (-x[0], x[1]))
+            result = []
+            for score, book_id in ranked:
+                book = self.get_book(book_id)
+                if book:
+                    result.append((book.title, score))
+                    if len(result) >= limit:
+                        break
+        return result
+
+    def build_content_index(self, max_df: float = 0.5) -> int:
+        """
+        Bangun index TF-IDF dari judul, deskripsi, author dan kategori semua buku
+        Returns: jumlah buku yang di-index
+        """
+        with self.index_lock.write():
+            books = [book for _, book in self.get_all_books()]
+            self.content_index = ContentSimilarityIndex(max_df)
+            return self.content_index.build(books)
+
+    def get_similar_books(self, book_id: str, limit: int = 5,
+                          min_similarity: float = 0.05) -> List[Tuple[Book, float]]:
+        """Get buku dengan konten paling mirip ("more like this")"""
+        if self.content_index is None:
+            self.build_content_index()
         
+        result = []
+        with self.index_lock.read():
+            for similar_id, score in self.content_index.similar(book_id, limit, min_similarity):
+                book = self.get_book(similar_id)
+                if book:
+                    result.append((book, score))
         return result
 
+    def add_content_relationships(self, top_k: int = 5, min_similarity: float = 0.2) -> int:
+        """
+        Isi recommendation_graph dengan relasi top-K dari similarity konten
+        Relasi yang sudah ada tidak ditimpa
+        Returns: jumlah relasi baru
+        """
+        if self.content_index is None:
+            self.build_content_index()
+        # top_k_edges adalah generator: materialize di bawah read lock, bukan
+        # saat dikonsumsi add_book_relationships
+        with self.index_lock.read():
+            edges = list(self.content_index.top_k_edges(top_k, min_similarity))
+        return self.add_book_relationships(edges)
+
+    def _iter_transactions(self) -> Iterator[Transaction]:
+        """
+        Iterasi riwayat transaksi tanpa menyalin list
+        records_lock dipegang sampai iterasi selesai (atau generator ditutup)
+        """
+        with self.records_lock:
+            yield from self.transactions
+
+    def build_coborrow_graph(self, max_items_per_user: int = 50, min_count: int = 2,
+                             top_k: int = 20, block_size: int = 2000) -> int:
+        """
+        Bangun relasi buku otomatis dari riwayat transaksi (co-borrow)
+        Relasi yang sudah ada (mis. dari add_book_relationship) tidak ditimpa
+        Returns: jumlah relasi baru
+        """
+        # Transaksi dibaca sekali di pass pertama; lock dilepas sebelum C dihitung
+        edges = build_coborrow_similarities(
+            self._iter_transactions(), max_items_per_user, min_count, top_k, block_size
+        )
+        return self.add_book_relationships(edges)
+
+    def get_recommendation_cache_stats(self) -> Dict[str, float]:
+        """Statistik cache rekomendasi (hits, misses, hit_rate, size)"""
+        cache = self.recommendation_cache
+        return {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": cache.hit_rate(),
+            "size": len(cache),
+            "capacity": cache.capacity,
+        }
+
+    def _forget_recommendation(self, key: Tuple[str, int, Optional[int]], _result) -> None:
+        """Callback LRU: buang (depth, limit) milik key yang tergeser dari cache"""
+        book_id, depth, limit = key
+        variants = self._recommendation_variants.get(book_id)
+        if variants is not None:
+            variants.discard((depth, limit))
+            if not variants:
+                del self._recommendation_variants[book_id]
+
+    def _max_cached_depth(self) -> int:
+        return max((depth for variants in self._recommendation_variants.values()
+                    for depth, _ in variants), default=0)
+
+    def _invalidate_recommendations(self, book_id: str, radius: int) -> None:
+        """
+        Hapus cache rekomendasi buku yang bisa mencapai book_id dalam `radius` hop
+        (BFS mundur lewat in_neighbors); buku lain tidak terpengaruh
+        """
+        if not self._recommendation_variants or radius < 0:
+            return
+        
+        affected = {book_id}
+        frontier = [book_id]
+        for _ in range(radius):
+            if not frontier:
+                break
+            next_frontier = []
+            for node_id in frontier:
+                node = self.recommendation_graph.nodes.get(node_id)
+                if node is None:
+                    continue
+                for source_id in node.in_neighbors:
+                    if source_id not in affected:
+                        affected.add(source_id)
+                        next_frontier.append(source_id)
+            frontier = next_frontier
+        
+        cached_ids = [source_id for source_id in self._recommendation_variants
+                      if source_id in affected]
+        for source_id in cached_ids:
+            for depth, limit in self._recommendation_variants.pop(source_id):
+                self.recommendation_cache.delete((source_id, depth, limit))
+
     # ==================== RIWAYAT PENCARIAN ====================
     
     def add_search_history(self, user_id: str, query: str, results_count: int) -> None:
@@ -378,29 +1017,34 @@ class LibraryManager:
             query=query,
             results_count=results_count
         )
-        self.search_history.append(search)
+        with self.records_lock:
+            self.search_history.append(search)
 
     def get_user_search_history(self, user_id: str) -> List[SearchHistory]:
         """Get riwayat pencarian user"""
-        all_history = self.search_history.get_all()
-        return [s for s in all_history if s.user_id == user_id]
+        with self.records_lock:
+            if self._use_cold_store(self.search_history):
+                return self.cold_store.get_user_search_history(user_id)
+            all_history = self.search_history.get_all()
+            return [s for s in all_history if s.user_id == user_id]
 
     # ==================== STATISTIK & ANALYTICS ====================
     
     def generate_statistics(self) -> LibraryStatistics:
         """Generate statistik perpustakaan"""
-        all_books = [b for _, b in self.books_bst.get_all()]
+        all_books = [b for _, b in self.get_all_books()]
         
         total_books = len(all_books)
         available_books = sum(1 for b in all_books if b.available_copies > 0)
         borrowed_books = total_books - available_books
         
-        all_trans = self.transactions.get_all()
+        all_trans = self.get_all_transactions()
         total_transactions = len(all_trans)
         total_fines = sum(t.fine_amount for t in all_trans)
         
         # Calculate average rating
-        all_reviews = self.reviews.get_all()
+        with self.records_lock:
+            all_reviews = self.reviews.get_all()
         avg_rating = (sum(r.rating for r in all_reviews) / len(all_reviews)) if all_reviews else 0
         
         # Most borrowed
@@ -429,21 +1073,22 @@ class LibraryManager:
 
     def get_popular_books(self, limit: int = 10) -> List[Book]:
         """Get buku paling populer berdasarkan borrow count"""
-        all_books = [b for _, b in self.books_bst.get_all()]
+        all_books = [b for _, b in self.get_all_books()]
         sorted_books = sorted(all_books, key=lambda b: b.borrow_count, reverse=True)
         return sorted_books[:limit]
 
     def get_highest_rated_books(self, limit: int = 10) -> List[Book]:
         """Get buku dengan rating tertinggi"""
-        all_books = [b for _, b in self.books_bst.get_all()]
+        all_books = [b for _, b in self.get_all_books()]
         sorted_books = sorted(all_books, key=lambda b: b.rating, reverse=True)
         return sorted_books[:limit]
 
     def process_transaction_queue(self) -> int:
         """Process semua transaksi dalam queue"""
-        processed = 0
-        while not self.transaction_queue.is_empty():
-            trans = self.transaction_queue.dequeue()
-            if trans:
-                processed += 1
-        return processed
+        with self.records_lock:
+            processed = 0
+            while not self.transaction_queue.is_empty():
+                trans = self.transaction_queue.dequeue()
+                if trans:
+                    processed += 1
+            return processed
@@ -5,12 +5,117 @@ Menangani penyimpanan dan loading data dari file JSON
 
 import json
 import os
-from typing import Tuple
+import struct
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import Any, Dict, List, Optional, Tuple
+from src.catalog_mmap import MmapCatalog, write_catalog
+from src.data_structures import LazyLinkedList
 from src.models import Book, User, Transaction, Reservation, Review, SearchHistory
 from src.library_manager import LibraryManager
 from src.auth import AuthenticationManager
 
 
+def _decode_collection(path: str, field_names: List[str]) -> Optional[List[Any]]:
+    """
+    Decode satu file JSON menjadi list baris yang ringkas
+    Dijalankan di worker process oleh load_all(parallel=True). Record yang
+    lengkap dikirim balik sebagai tuple (urutan field model) agar pickling
+    tidak mengulang nama key; record lain dikirim apa adanya sebagai dict.
+    Returns: None jika file tidak ada
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    rows = []
+    for record in records:
+        if len(record) == len(field_names):
+            try:
+                rows.append(tuple(record[name] for name in field_names))
+                continue
+            except KeyError:
+                pass
+        rows.append(record)
+    return rows
+
+
+def _build_models(model_cls, rows: List[Any]) -> List[Any]:
+    """Buat instance model dari baris hasil _decode_collection"""
+    return [model_cls(*row) if isinstance(row, tuple) else model_cls.from_dict(row)
+            for row in rows]
+
+
+GRAPH_MAGIC = b"RGRF"
+GRAPH_VERSION = 1
+GRAPH_HEADER = struct.Struct("<4sIIIQ")  # magic, version, n_nodes, n_edges, ids_bytes
+
+
+def _write_array(f, typecode: str, values) -> None:
+    """Tulis array numerik little-endian"""
+    data = array(typecode, values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    data.tofile(f)
+
+
+def _read_array(f, typecode: str, count: int) -> array:
+    """Baca array numerik little-endian"""
+    data = array(typecode)
+    data.fromfile(f, count)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def write_graph_file(path: str, csr: Tuple[List[str], List[int], List[int], List[float]]) -> None:
+    """
+    Tulis graph format CSR (hasil Graph.to_csr) secara atomic
+    Layout: header, book_id (UTF-8, dipisah newline), indptr (uint32),
+    indices (uint32), weights (float64)
+    """
+    node_ids, indptr, indices, weights = csr
+    ids_bytes = "\n".join(node_ids).encode('utf-8')
+    
+    tmp_file = path + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(GRAPH_HEADER.pack(GRAPH_MAGIC, GRAPH_VERSION, len(node_ids),
+                                  len(indices), len(ids_bytes)))
+        f.write(ids_bytes)
+        _write_array(f, 'I', indptr)
+        _write_array(f, 'I', indices)
+        _write_array(f, 'd', weights)
+    os.replace(tmp_file, path)
+
+
+def read_graph_file(path: str) -> Tuple[List[str], array, array, array]:
+    """Baca file graph CSR; Returns: (node_ids, indptr, indices, weights)"""
+    with open(path, 'rb') as f:
+        magic, version, n_nodes, n_edges, ids_len = GRAPH_HEADER.unpack(
+            f.read(GRAPH_HEADER.size))
+        if magic != GRAPH_MAGIC or version != GRAPH_VERSION:
+            raise ValueError("format file tidak dikenal")
+        
+        ids_bytes = f.read(ids_len)
+        node_ids = ids_bytes.decode('utf-8').split("\n") if n_nodes else []
+        indptr = _read_array(f, 'I', n_nodes + 1)
+        indices = _read_array(f, 'I', n_edges)
+        weights = _read_array(f, 'd', n_edges)
+    return node_ids, indptr, indices, weights
+
+
+def _is_unloaded(collection) -> bool:
+    """Check apakah koleksi lazy belum pernah dimuat (file tidak perlu ditulis ulang)"""
+    return isinstance(collection, LazyLinkedList) and not collection.is_loaded
+
+
 class DataPersistence:
     """Manager untuk menyimpan dan memuat data"""
     
@@ -22,6 +127,8 @@ class DataPersistence:
         self.reservations_file = os.path.join(data_dir, "reservations.json")
         self.reviews_file = os.path.join(data_dir, "reviews.json")
         self.search_history_file = os.path.join(data_dir, "search_history.json")
+        self.catalog_file = os.path.join(data_dir, "catalog.bin")
+        self.graph_file = os.path.join(data_dir, "recommendation_graph.bin")
         
         # Create data directory if not exists
         if not os.path.exists(data_dir):
@@ -33,7 +140,7 @@ class DataPersistence:
         """Save semua buku ke file"""
         try:
             books_data = []
-            for book_id, book in library_manager.books_bst.get_all():
+            for book_id, book in library_manager.get_all_books():
                 books_data.append(book.to_dict())
             
             with open(self.books_file, 'w', encoding='utf-8') as f:
@@ -47,7 +154,7 @@ class DataPersistence:
         """Save semua user ke file"""
         try:
             users_data = []
-            all_users = auth_manager.users.get_all()
+            all_users = auth_manager.get_all_users()
             for username, user in all_users.items():
                 users_data.append(user.to_dict())
             
@@ -60,6 +167,8 @@ class DataPersistence:
 
     def save_transactions(self, library_manager: LibraryManager) -> Tuple[bool, str]:
         """Save semua transaksi ke file"""
+        if _is_unloaded(library_manager.transactions):
+            return True, "Transaksi tidak berubah (belum dimuat)"
         try:
             trans_data = []
             all_trans = library_manager.transactions.get_all()
@@ -90,6 +199,8 @@ class DataPersistence:
 
     def save_reviews(self, library_manager: LibraryManager) -> Tuple[bool, str]:
         """Save semua review ke file"""
+        if _is_unloaded(library_manager.reviews):
+            return True, "Review tidak berubah (belum dimuat)"
         try:
             rev_data = []
             all_rev = library_manager.reviews.get_all()
@@ -105,6 +216,8 @@ class DataPersistence:
 
     def save_search_history(self, library_manager: LibraryManager) -> Tuple[bool, str]:
         """Save riwayat pencarian ke file"""
+        if _is_unloaded(library_manager.search_history):
+            return True, "Riwayat pencarian tidak berubah (belum dimuat)"
         try:
             hist_data = []
             all_hist = library_manager.search_history.get_all()
@@ -118,146 +231,435 @@ class DataPersistence:
         except Exception as e:
             return False, f"Error menyimpan riwayat pencarian: {str(e)}"
 
+    def save_recommendation_graph(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """
+        Save graph rekomendasi ke file biner CSR
+        Layout: header, book_id (UTF-8, dipisah newline), indptr (uint32),
+        indices (uint32), weights (float64)
+        """
+        return self._write_graph(library_manager.recommendation_graph.to_csr())
+
+    def _write_graph(self, csr: Tuple[List[str], List[int], List[int], List[float]]) -> Tuple[bool, str]:
+        """Tulis graph format CSR (hasil Graph.to_csr) secara atomic"""
+        try:
+            write_graph_file(self.graph_file, csr)
+            return True, f"Berhasil menyimpan {len(csr[2])} relasi buku"
+        except Exception as e:
+            return False, f"Error menyimpan relasi buku: {str(e)}"
+
     def save_all(self, library_manager: LibraryManager, auth_manager: AuthenticationManager) -> Tuple[bool, str]:
         """Save semua data"""
+        return self.write_snapshot(self.snapshot(library_manager, auth_manager))
+
+    def snapshot(self, library_manager: LibraryManager,
+                 auth_manager: AuthenticationManager) -> Dict[str, Any]:
+        """
+        Salin semua data yang akan disimpan ke dict/list biasa (tanpa I/O)
+        Dipanggil selagi data dikunci agar konsisten; hasilnya ditulis dengan
+        write_snapshot setelah lock dilepas. Koleksi lazy yang belum dimuat
+        bernilai None (file lama tidak ditulis ulang).
+        """
+        snapshot: Dict[str, Any] = {}
+        with library_manager.index_lock.read(), library_manager.records_lock:
+            for name, _, _, _ in self._collections():
+                items = self._collection_items(name, library_manager, auth_manager)
+                snapshot[name] = None if items is None else [item.to_dict() for item in items]
+            snapshot["graph"] = library_manager.recommendation_graph.to_csr()
+        return snapshot
+
+    def write_snapshot(self, snapshot: Dict[str, Any]) -> Tuple[bool, str]:
+        """Tulis hasil snapshot() ke file (setiap file ditulis atomic)"""
         results = []
+        for name, path, _, label in self._collections():
+            data = snapshot[name]
+            if data is None:
+                results.append((True, f"{label.capitalize()} tidak berubah (belum dimuat)"))
+                continue
+            try:
+                tmp_file = path + ".tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, path)
+                results.append((True, f"Berhasil menyimpan {len(data)} {label}"))
+            except Exception as e:
+                results.append((False, f"Error menyimpan {label}: {str(e)}"))
+        results.append(self._write_graph(snapshot["graph"]))
         
-        results.append(self.save_books(library_manager))
-        results.append(self.save_users(auth_manager))
-        results.append(self.save_transactions(library_manager))
-        results.append(self.save_reservations(library_manager))
-        results.append(self.save_reviews(library_manager))
-        results.append(self.save_search_history(library_manager))
+        if all(success for success, _ in results):
+            return True, f"Semua data berhasil disimpan ({len(results)}/{len(results)})"
+        messages = "\n".join([msg for _, msg in results])
+        return False, f"Error menyimpan data:\n{messages}"
+
+    def save_catalog(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Tulis katalog buku memory-mapped (read-only) ke catalog.bin"""
+        try:
+            books = [book for _, book in library_manager.get_all_books()]
+            count = write_catalog(self.catalog_file, books)
+            return True, f"Berhasil menulis katalog {count} buku"
+        except Exception as e:
+            return False, f"Error menulis katalog: {str(e)}"
+
+    # ==================== LOAD METHODS ====================
+
+    def _collections(self) -> List[Tuple[str, str, type, str]]:
+        """Daftar koleksi: (nama, path file, model, label pesan)"""
+        return [
+            ("books", self.books_file, Book, "buku"),
+            ("users", self.users_file, User, "user"),
+            ("transactions", self.transactions_file, Transaction, "transaksi"),
+            ("reservations", self.reservations_file, Reservation, "reservasi"),
+            ("reviews", self.reviews_file, Review, "review"),
+            ("search_history", self.search_history_file, SearchHistory, "riwayat pencarian"),
+        ]
+
+    def _merge_collection(self, name: str, models: List[Any], library_manager: LibraryManager,
+                          auth_manager: Optional[AuthenticationManager] = None) -> None:
+        """Masukkan model hasil load ke manager yang sesuai"""
+        if name == "books":
+            for book in models:
+                library_manager.add_book(book)
+        elif name == "users":
+            for user in models:
+                auth_manager.add_user(user)
+        elif name == "transactions":
+            library_manager.transactions.extend(models)
+        elif name == "reservations":
+            library_manager.reservation_list.extend(models)
+        elif name == "reviews":
+            library_manager.reviews.extend(models)
+        elif name == "search_history":
+            library_manager.search_history.extend(models)
+
+    def _collection_items(self, name: str, library_manager: LibraryManager,
+                          auth_manager: AuthenticationManager) -> Optional[List[Any]]:
+        """Model dalam satu koleksi (None jika koleksi lazy belum dimuat)"""
+        if name == "books":
+            # Termasuk buku katalog mmap yang belum disalin ke BST
+            return [book for _, book in library_manager.get_all_books()]
+        elif name == "users":
+            return list(auth_manager.get_all_users().values())
+        elif name == "reservations":
+            return library_manager.reservation_list.get_all()
         
-        success_count = sum(1 for success, _ in results if success)
-        all_success = all(success for success, _ in results)
+        collection = getattr(library_manager, name)
+        if _is_unloaded(collection):
+            return None
+        return collection.get_all()
+
+    def _read_models(self, name: str) -> Optional[List[Any]]:
+        """Baca file satu koleksi menjadi list model (None jika file tidak ada)"""
+        _, path, model_cls, _ = next(c for c in self._collections() if c[0] == name)
+        if not os.path.exists(path):
+            return None
         
-        if all_success:
-            return True, f"Semua data berhasil disimpan ({success_count}/6)"
-        else:
-            messages = "\n".join([msg for _, msg in results])
-            return False, f"Error menyimpan data:\n{messages}"
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        return [model_cls.from_dict(item) for item in data]
 
-    # ==================== LOAD METHODS ====================
-    
-    def load_books(self, library_manager: LibraryManager) -> Tuple[bool, str]:
-        """Load buku dari file"""
+    def _load_collection(self, name: str, library_manager: Optional[LibraryManager] = None,
+                         auth_manager: Optional[AuthenticationManager] = None) -> Tuple[bool, str]:
+        """Load satu koleksi secara sekuensial"""
+        label = next(c[3] for c in self._collections() if c[0] == name)
         try:
-            if not os.path.exists(self.books_file):
-                return True, "File buku tidak ada (baru)"
-            
-            with open(self.books_file, 'r', encoding='utf-8') as f:
-                books_data = json.load(f)
+            models = self._read_models(name)
+            if models is None:
+                return True, f"File {label} tidak ada (baru)"
             
-            for book_dict in books_data:
-                book = Book.from_dict(book_dict)
-                library_manager.add_book(book)
+            self._merge_collection(name, models, library_manager, auth_manager)
             
-            return True, f"Berhasil memuat {len(books_data)} buku"
+            return True, f"Berhasil memuat {len(models)} {label}"
         except Exception as e:
-            return False, f"Error memuat buku: {str(e)}"
+            return False, f"Error memuat {label}: {str(e)}"
+
+    def load_books(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Load buku dari file"""
+        return self._load_collection("books", library_manager)
 
     def load_users(self, auth_manager: AuthenticationManager) -> Tuple[bool, str]:
         """Load user dari file"""
-        try:
-            if not os.path.exists(self.users_file):
-                return True, "File user tidak ada (baru)"
-            
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                users_data = json.load(f)
-            
-            for user_dict in users_data:
-                user = User.from_dict(user_dict)
-                auth_manager.users.insert(user.username, user)
-            
-            return True, f"Berhasil memuat {len(users_data)} user"
-        except Exception as e:
-            return False, f"Error memuat user: {str(e)}"
+        return self._load_collection("users", auth_manager=auth_manager)
 
     def load_transactions(self, library_manager: LibraryManager) -> Tuple[bool, str]:
         """Load transaksi dari file"""
-        try:
-            if not os.path.exists(self.transactions_file):
-                return True, "File transaksi tidak ada (baru)"
-            
-            with open(self.transactions_file, 'r', encoding='utf-8') as f:
-                trans_data = json.load(f)
-            
-            for trans_dict in trans_data:
-                trans = Transaction.from_dict(trans_dict)
-                library_manager.transactions.append(trans)
-            
-            return True, f"Berhasil memuat {len(trans_data)} transaksi"
-        except Exception as e:
-            return False, f"Error memuat transaksi: {str(e)}"
+        return self._load_collection("transactions", library_manager)
 
     def load_reservations(self, library_manager: LibraryManager) -> Tuple[bool, str]:
         """Load reservasi dari file"""
-        try:
-            if not os.path.exists(self.reservations_file):
-                return True, "File reservasi tidak ada (baru)"
-            
-            with open(self.reservations_file, 'r', encoding='utf-8') as f:
-                res_data = json.load(f)
-            
-            for res_dict in res_data:
-                res = Reservation.from_dict(res_dict)
-                library_manager.reservation_list.append(res)
-            
-            return True, f"Berhasil memuat {len(res_data)} reservasi"
-        except Exception as e:
-            return False, f"Error memuat reservasi: {str(e)}"
+        return self._load_collection("reservations", library_manager)
 
     def load_reviews(self, library_manager: LibraryManager) -> Tuple[bool, str]:
         """Load review dari file"""
-        try:
-            if not os.path.exists(self.reviews_file):
-                return True, "File review tidak ada (baru)"
-            
-            with open(self.reviews_file, 'r', encoding='utf-8') as f:
-                rev_data = json.load(f)
-            
-            for rev_dict in rev_data:
-                rev = Review.from_dict(rev_dict)
-                library_manager.reviews.append(rev)
-            
-            return True, f"Berhasil memuat {len(rev_data)} review"
-        except Exception as e:
-            return False, f"Error memuat review: {str(e)}"
+        return self._load_collection("reviews", library_manager)
 
     def load_search_history(self, library_manager: LibraryManager) -> Tuple[bool, str]:
         """Load riwayat pencarian dari file"""
+        return self._load_collection("search_history", library_manager)
+
+    def load_recommendation_graph(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """
+        Load graph rekomendasi dari file CSR (bulk insert)
+        Harus dipanggil setelah load_books agar node buku sudah ada
+        """
         try:
-            if not os.path.exists(self.search_history_file):
-                return True, "File riwayat pencarian tidak ada (baru)"
-            
-            with open(self.search_history_file, 'r', encoding='utf-8') as f:
-                hist_data = json.load(f)
+            if not os.path.exists(self.graph_file):
+                return True, "File relasi buku tidak ada (baru)"
             
-            for hist_dict in hist_data:
-                hist = SearchHistory.from_dict(hist_dict)
-                library_manager.search_history.append(hist)
+            node_ids, indptr, indices, weights = read_graph_file(self.graph_file)
+            added = library_manager.recommendation_graph.load_csr(node_ids, indptr, indices, weights)
+            return True, f"Berhasil memuat {added} relasi buku"
+        except Exception as e:
+            return False, f"Error memuat relasi buku: {str(e)}"
+
+    def load_catalog(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """
+        Pasang catalog.bin sebagai katalog memory-mapped di LibraryManager
+        Buku tidak dimuat ke BST; get_book membaca langsung dari mmap
+        """
+        try:
+            if not os.path.exists(self.catalog_file):
+                return False, "File katalog tidak ada"
             
-            return True, f"Berhasil memuat {len(hist_data)} riwayat pencarian"
+            catalog = MmapCatalog(self.catalog_file)
+            library_manager.attach_catalog(catalog)
+            return True, f"Katalog {len(catalog)} buku dipasang"
         except Exception as e:
-            return False, f"Error memuat riwayat pencarian: {str(e)}"
+            return False, f"Error memuat katalog: {str(e)}"
 
-    def load_all(self, library_manager: LibraryManager, auth_manager: AuthenticationManager) -> Tuple[bool, str]:
-        """Load semua data"""
-        results = []
+    def _lazy_loader(self, name: str):
+        """Buat loader untuk LazyLinkedList dari satu koleksi"""
+        def loader():
+            models = self._read_models(name)
+            return models if models is not None else []
+        return loader
+
+    def _load_all_parallel(self, library_manager: LibraryManager, auth_manager: AuthenticationManager,
+                           max_workers: Optional[int] = None,
+                           skip: Tuple[str, ...] = ()) -> List[Tuple[bool, str]]:
+        """
+        Decode semua file secara paralel di process pool, lalu merge
+        ke manager secara berurutan di process utama
+        """
+        collections = [c for c in self._collections() if c[0] not in skip]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_decode_collection, path, [f.name for f in fields(model_cls)])
+                for _, path, model_cls, _ in collections
+            ]
+            
+            results = []
+            for (name, _, model_cls, label), future in zip(collections, futures):
+                try:
+                    rows = future.result()
+                    if rows is None:
+                        results.append((True, f"File {label} tidak ada (baru)"))
+                        continue
+                    models = _build_models(model_cls, rows)
+                    self._merge_collection(name, models, library_manager, auth_manager)
+                    results.append((True, f"Berhasil memuat {len(models)} {label}"))
+                except Exception as e:
+                    results.append((False, f"Error memuat {label}: {str(e)}"))
+        
+        return results
+
+    def load_all(self, library_manager: LibraryManager, auth_manager: AuthenticationManager,
+                 parallel: bool = False, max_workers: Optional[int] = None,
+                 lazy: bool = False) -> Tuple[bool, str]:
+        """
+        Load semua data
+        parallel: decode file-file JSON secara bersamaan di process pool
+        lazy: transaksi, review dan riwayat pencarian baru dimuat saat
+              pertama kali diakses (lihat LibraryManager.attach_lazy_collections)
+        """
+        skip = LibraryManager.LAZY_COLLECTIONS if lazy else ()
+        
+        if parallel:
+            results = self._load_all_parallel(library_manager, auth_manager, max_workers, skip)
+        else:
+            results = [self._load_collection(name, library_manager, auth_manager)
+                       for name, _, _, _ in self._collections() if name not in skip]
+        
+        if lazy:
+            library_manager.attach_lazy_collections(
+                {name: self._lazy_loader(name) for name in LibraryManager.LAZY_COLLECTIONS}
+            )
+            results.extend((True, f"Koleksi {name} dimuat saat dibutuhkan")
+                           for name in LibraryManager.LAZY_COLLECTIONS)
         
-        results.append(self.load_books(library_manager))
-        results.append(self.load_users(auth_manager))
-        results.append(self.load_transactions(library_manager))
-        results.append(self.load_reservations(library_manager))
-        results.append(self.load_reviews(library_manager))
-        results.append(self.load_search_history(library_manager))
+        # Relasi buku dimuat setelah node buku tersedia
+        results.append(self.load_recommendation_graph(library_manager))
         
         success_count = sum(1 for success, _ in results if success)
-        all_success = all(success for success, _ in results if success)
+        all_success = all(success for success, _ in results)
         
         if all_success:
-            return True, f"Semua data berhasil dimuat ({success_count}/6)"
+            return True, f"Semua data berhasil dimuat ({success_count}/{len(results)})"
         else:
             messages = "\n".join([msg for _, msg in results])
             return False, f"Error memuat data:\n{messages}"
+
+
+class BackgroundSaver:
+    """
+    Penyimpanan data di background thread
+    Perubahan dari GUI dikumpulkan lalu ditulis sekaligus: flush terjadi paling
+    cepat flush_interval_ms setelah perubahan pertama, atau segera setelah
+    max_pending perubahan. Snapshot diambil di bawah `lock` (yang juga dipegang
+    handler saat memutasi data), sedangkan penulisan file dilakukan di luar lock.
+    Jika penulisan gagal, perubahan tetap dihitung pending dan dicoba lagi
+    setelah flush_interval; stop() hanya mencoba sekali lagi lalu berhenti
+    (cek `pending` / `last_result` untuk mengetahui data yang belum tersimpan).
+    """
+
+    def __init__(self, persistence: DataPersistence, library_manager: LibraryManager,
+                 auth_manager: AuthenticationManager, flush_interval_ms: int = 500,
+                 max_pending: int = 50):
+        self.persistence = persistence
+        self.library_manager = library_manager
+        self.auth_manager = auth_manager
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        
+        # Lock data: dipegang selama mutasi dan selama snapshot
+        self.lock = threading.RLock()
+        self._cond = threading.Condition()
+        self._changes = 0          # Nomor urut perubahan terakhir
+        self._saved = 0            # Nomor urut perubahan yang sudah tertulis
+        self._first_change_at: Optional[float] = None
+        self._flush_requested = False
+        self._stopping = False
+        self._attempts = 0         # Jumlah percobaan tulis (berhasil maupun gagal)
+        self._retrying = False     # Tulis terakhir gagal: tunggu flush_interval sebelum retry
+        
+        self.flush_count = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.last_latency_ms = 0.0
+        self.last_snapshot_ms = 0.0
+        self.last_result: Tuple[bool, str] = (True, "")
+        self._total_flush_ms = 0.0
+        
+        self._thread = threading.Thread(target=self._run, name="background-saver", daemon=True)
+        self._thread.start()
+
+    @contextmanager
+    def mutation(self):
+        """
+        Context manager untuk mengubah data: memegang lock lalu menandai
+        perubahan saat selesai
+
+            with saver.mutation():
+                library_manager.borrow_book(user_id, book_id)
+        """
+        with self.lock:
+            yield
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """Tandai ada perubahan yang perlu disimpan"""
+        with self._cond:
+            self._changes += 1
+            if self._first_change_at is None:
+                self._first_change_at = time.monotonic()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Simpan sekarang dan tunggu sampai semua perubahan sebelumnya tertulis
+        Returns: False jika timeout atau penulisan gagal
+        """
+        with self._cond:
+            target = self._changes
+            if target > self._saved:
+                self._flush_requested = True
+                self._cond.notify_all()
+            attempts = self._attempts
+            self._cond.wait_for(
+                lambda: self._saved >= target
+                or (self._attempts > attempts and not self.last_result[0]), timeout)
+            return self._saved >= target
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush perubahan tersisa lalu hentikan thread"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    @property
+    def pending(self) -> int:
+        """Jumlah perubahan yang belum tertulis"""
+        with self._cond:
+            return self._changes - self._saved
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistik flush (durasi tulis & latensi dari perubahan pertama sampai tersimpan)"""
+        with self._cond:
+            return {
+                "flush_count": self.flush_count,
+                "pending": self._changes - self._saved,
+                "last_flush_ms": self.last_flush_ms,
+                "avg_flush_ms": self._total_flush_ms / self.flush_count if self.flush_count else 0.0,
+                "max_flush_ms": self.max_flush_ms,
+                "last_latency_ms": self.last_latency_ms,
+                "last_snapshot_ms": self.last_snapshot_ms,
+                "last_success": self.last_result[0],
+                "last_message": self.last_result[1],
+            }
+
+    def _due(self) -> bool:
+        if self._changes == self._saved:
+            return False
+        if self._flush_requested or self._stopping:
+            return True
+        if self._changes - self._saved >= self.max_pending and not self._retrying:
+            return True
+        return time.monotonic() - self._first_change_at >= self.flush_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._due():
+                    if self._stopping:
+                        return
+                    if self._changes == self._saved:
+                        self._cond.wait()
+                    else:
+                        remaining = self.flush_interval - (time.monotonic() - self._first_change_at)
+                        self._cond.wait(max(remaining, 0))
+                target = self._changes
+                first_change_at = self._first_change_at
+                self._flush_requested = False
+            
+            started = time.monotonic()
+            with self.lock:
+                snapshot = self.persistence.snapshot(self.library_manager, self.auth_manager)
+                # Perubahan setelah snapshot dihitung untuk flush berikutnya
+                with self._cond:
+                    target = self._changes
+                    self._first_change_at = None
+            snapshot_ms = (time.monotonic() - started) * 1000
+            result = self.persistence.write_snapshot(snapshot)
+            finished = time.monotonic()
+            
+            with self._cond:
+                self._attempts += 1
+                self._retrying = not result[0]
+                if result[0]:
+                    self._saved = target
+                    if self._changes > self._saved and self._first_change_at is None:
+                        self._first_change_at = finished
+                else:
+                    # Gagal: perubahan tetap pending, coba lagi setelah flush_interval
+                    self._first_change_at = finished
+                flush_ms = (finished - started) * 1000
+                self.flush_count += 1
+                self.last_flush_ms = flush_ms
+                self.max_flush_ms = max(self.max_flush_ms, flush_ms)
+                self._total_flush_ms += flush_ms
+                self.last_latency_ms = (finished - first_change_at) * 1000
+                self.last_snapshot_ms = snapshot_ms
+                self.last_result = result
+                self._cond.notify_all()
+                if self._stopping and not result[0]:
+                    return  # Jangan retry tanpa henti saat shutdown
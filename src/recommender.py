@@ -0,0 +1,324 @@
+"""
+Module Recommender untuk Sistem Perpustakaan Digital
+Batch job untuk membangun relasi buku otomatis dari data perpustakaan
+"""
+
+import heapq
+import math
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.models import Book, Transaction, TransactionType
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def build_coborrow_similarities(transactions: Iterable[Transaction],
+                                max_items_per_user: int = 50,
+                                min_count: int = 2,
+                                top_k: int = 20,
+                                block_size: int = 2000) -> List[Tuple[str, str, float]]:
+    """
+    Hitung similarity item-item dari riwayat peminjaman (co-borrow)
+
+    Secara konsep ini C = A^T A, dengan A matriks sparse user x buku (1 jika
+    user pernah meminjam buku). C dihitung per blok kolom: satu pass atas
+    baris A mengumpulkan hanya pasangan (a, b) dengan a < b dan a di dalam
+    blok block_size buku, lalu pasangan tersebut langsung diubah menjadi
+    similarity dan dibuang. Memori sementara dibatasi pasangan satu blok
+    ditambah top_k tetangga per buku, bukan seluruh C. User "berat" dibatasi
+    max_items_per_user buku terbaru agar satu user tidak menghasilkan O(n^2)
+    pasangan.
+
+    Similarity = cosine: C[a][b] / sqrt(deg(a) * deg(b)); pasangan dengan
+    C[a][b] < min_count dibuang, lalu disimpan top_k tetangga per buku.
+    Returns: list edge berarah (book_id1, book_id2, similarity)
+    """
+    # Pass 1: baris sparse A (user -> buku unik, urutan pinjam terakhir)
+    user_items: Dict[str, Dict[str, None]] = {}
+    borrow_type = TransactionType.BORROW.value
+    for trans in transactions:
+        if trans.transaction_type != borrow_type:
+            continue
+        items = user_items.setdefault(trans.user_id, {})
+        items.pop(trans.book_id, None)
+        items[trans.book_id] = None
+        if len(items) > max_items_per_user:
+            del items[next(iter(items))]
+
+    # Kolom A dipetakan ke index integer
+    book_index: Dict[str, int] = {}
+    book_ids: List[str] = []
+    degree: List[int] = []
+    rows: List[List[int]] = []
+    for items in user_items.values():
+        row = []
+        for book_id in items:
+            idx = book_index.get(book_id)
+            if idx is None:
+                idx = book_index[book_id] = len(book_ids)
+                book_ids.append(book_id)
+                degree.append(0)
+            degree[idx] += 1
+            row.append(idx)
+        if len(row) > 1:
+            rows.append(sorted(row))
+    user_items.clear()
+
+    # Urutan book_id untuk tie-break (rank kecil = book_id lebih dulu)
+    rank = [0] * len(book_ids)
+    for position, idx in enumerate(sorted(range(len(book_ids)), key=book_ids.__getitem__)):
+        rank[idx] = position
+
+    # Top-k per buku sebagai min-heap (similarity, -rank, b): root = kandidat terlemah
+    neighbors: Dict[int, List[Tuple[float, int, int]]] = {}
+
+    def offer(a: int, b: int, similarity: float) -> None:
+        heap = neighbors.setdefault(a, [])
+        item = (similarity, -rank[b], b)
+        if len(heap) < top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    # Pass 2: C = A^T A per blok kolom [lo, hi)
+    for lo in range(0, len(book_ids), block_size):
+        hi = lo + block_size
+        block_counts: Dict[Tuple[int, int], int] = {}
+        for row in rows:
+            for i in range(len(row) - 1):
+                a = row[i]
+                if a >= hi:
+                    break
+                if a < lo:
+                    continue
+                for b in row[i + 1:]:
+                    key = (a, b)
+                    block_counts[key] = block_counts.get(key, 0) + 1
+
+        # Cosine similarity + top_k per buku (dua arah)
+        for (a, b), count in block_counts.items():
+            if count < min_count:
+                continue
+            similarity = count / math.sqrt(degree[a] * degree[b])
+            offer(a, b, similarity)
+            offer(b, a, similarity)
+
+    edges = []
+    for a, heap in neighbors.items():
+        for similarity, _, b in sorted(heap, reverse=True):
+            edges.append((book_ids[a], book_ids[b], similarity))
+    return edges
+
+
+class PersonalizedPageRank:
+    """
+    Personalized PageRank (random walk with restart) di atas graph CSR
+    Matriks transisi dibangun sekali dari Graph.to_csr(): bobot edge
+    dinormalisasi per baris (edge dengan bobot <= 0 diabaikan)
+    """
+
+    def __init__(self, node_ids: List[str], indptr: List[int],
+                 indices: List[int], weights: List[float]):
+        self.node_ids = node_ids
+        self.position = {book_id: i for i, book_id in enumerate(node_ids)}
+        self.indptr = [0]
+        self.indices = []
+        self.probabilities = []
+        for i in range(len(node_ids)):
+            row = [(indices[k], weights[k]) for k in range(indptr[i], indptr[i + 1])
+                   if weights[k] > 0]
+            total = sum(weight for _, weight in row)
+            for target, weight in row:
+                self.indices.append(target)
+                self.probabilities.append(weight / total)
+            self.indptr.append(len(self.indices))
+
+    @classmethod
+    def from_graph(cls, graph) -> 'PersonalizedPageRank':
+        """Bangun dari Graph"""
+        return cls(*graph.to_csr())
+
+    def rank(self, seeds: Dict[str, float], alpha: float = 0.15,
+             epsilon: float = 1e-4) -> Dict[str, float]:
+        """
+        Hitung skor PPR dari seed (book_id -> bobot) dengan push approximation
+        (Andersen-Chung-Lang): residual node u di-push selama
+        r[u] > epsilon * derajat(u), sehingga hanya node di sekitar seed yang
+        disentuh. Mass dari node tanpa edge keluar kembali ke seed (restart).
+        Returns: dict book_id -> skor (seed ikut dihitung)
+        """
+        restart = {}
+        total = sum(weight for book_id, weight in seeds.items() if book_id in self.position)
+        if total <= 0:
+            return {}
+        for book_id, weight in seeds.items():
+            if book_id in self.position and weight > 0:
+                restart[self.position[book_id]] = weight / total
+
+        indptr, indices, probabilities = self.indptr, self.indices, self.probabilities
+        estimate: Dict[int, float] = {}
+        residual = dict(restart)
+        queue = deque(residual)
+        queued = set(residual)
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            r = residual.get(u, 0.0)
+            start, end = indptr[u], indptr[u + 1]
+            if r <= epsilon * max(end - start, 1):
+                continue
+            residual[u] = 0.0
+            estimate[u] = estimate.get(u, 0.0) + alpha * r
+            spread = (1 - alpha) * r
+            if start == end:
+                targets = [(v, spread * share) for v, share in restart.items()]
+            else:
+                targets = [(indices[k], spread * probabilities[k]) for k in range(start, end)]
+            for v, mass in targets:
+                residual[v] = residual.get(v, 0.0) + mass
+                if v not in queued and residual[v] > epsilon * max(indptr[v + 1] - indptr[v], 1):
+                    queue.append(v)
+                    queued.add(v)
+
+        return {self.node_ids[i]: score for i, score in estimate.items()}
+
+
+class ContentSimilarityIndex:
+    """
+    Index similarity konten buku (TF-IDF + cosine)
+    Vektor tiap buku disimpan sparse (dict term -> bobot, ternormalisasi L2)
+    bersama inverted index term -> {book_id: bobot}, sehingga query top-K
+    hanya menyentuh buku yang berbagi term dengan buku sumber
+    """
+
+    # Bobot kemunculan term per field
+    FIELD_WEIGHTS = {"title": 2, "description": 1}
+    # Term umum hanya dilewati bila posting-nya juga sebesar ini (katalog kecil tidak terpengaruh)
+    MIN_PRUNED_POSTINGS = 1000
+
+    def __init__(self, max_df: float = 0.5):
+        # Term yang muncul di > max_df bagian koleksi diabaikan saat query
+        self.max_df = max_df
+        self.doc_freq: Dict[str, int] = {}
+        self.vectors: Dict[str, Dict[str, float]] = {}
+        self.postings: Dict[str, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def __contains__(self, book_id: str) -> bool:
+        return book_id in self.vectors
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Pecah teks jadi token lowercase (minimal 2 karakter)"""
+        return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1]
+
+    def _term_counts(self, book: Book) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for field_name, weight in self.FIELD_WEIGHTS.items():
+            for token in self.tokenize(getattr(book, field_name)):
+                counts[token] = counts.get(token, 0) + weight
+        # Author dan kategori dipakai utuh agar "J. K. Rowling" != "Rowling Street"
+        for prefix, value in (("author:", book.author), ("category:", book.category)):
+            value = " ".join(self.tokenize(value))
+            if value:
+                counts[prefix + value] = counts.get(prefix + value, 0) + 1
+        return counts
+
+    def _idf(self, term: str) -> float:
+        n = len(self.vectors)
+        return math.log((1 + n) / (1 + self.doc_freq.get(term, 0))) + 1
+
+    def _vectorize(self, counts: Dict[str, int]) -> Dict[str, float]:
+        vector = {term: (1 + math.log(count)) * self._idf(term) for term, count in counts.items()}
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if norm == 0:
+            return {}
+        return {term: value / norm for term, value in vector.items()}
+
+    def build(self, books: Iterable[Book]) -> int:
+        """
+        Bangun ulang index dari seluruh koleksi (dua pass: document frequency, lalu vektor)
+        Returns: jumlah buku yang di-index
+        """
+        all_counts = [(book.book_id, self._term_counts(book)) for book in books]
+        self.doc_freq = {}
+        self.vectors = {book_id: {} for book_id, _ in all_counts}
+        self.postings = {}
+        for _, counts in all_counts:
+            for term in counts:
+                self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+        for book_id, counts in all_counts:
+            self._store(book_id, self._vectorize(counts))
+        return len(self.vectors)
+
+    def _store(self, book_id: str, vector: Dict[str, float]) -> None:
+        self.vectors[book_id] = vector
+        for term, value in vector.items():
+            self.postings.setdefault(term, {})[book_id] = value
+
+    def add(self, book: Book) -> None:
+        """
+        Tambah/update satu buku memakai statistik IDF saat ini
+        Bobot buku lain tidak dihitung ulang; panggil build() berkala untuk
+        menyegarkan IDF setelah banyak perubahan
+        """
+        self.remove(book.book_id)
+        counts = self._term_counts(book)
+        for term in counts:
+            self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+        self.vectors[book.book_id] = {}
+        self._store(book.book_id, self._vectorize(counts))
+
+    def remove(self, book_id: str) -> bool:
+        """Hapus buku dari index"""
+        vector = self.vectors.pop(book_id, None)
+        if vector is None:
+            return False
+        for term in vector:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(book_id, None)
+                if not posting:
+                    del self.postings[term]
+            self.doc_freq[term] -= 1
+            if self.doc_freq[term] <= 0:
+                del self.doc_freq[term]
+        return True
+
+    def _search(self, vector: Dict[str, float], limit: int, min_similarity: float,
+                exclude: Optional[str]) -> List[Tuple[str, float]]:
+        max_postings = max(self.max_df * len(self.vectors), self.MIN_PRUNED_POSTINGS)
+        scores: Dict[str, float] = {}
+        for term, value in vector.items():
+            posting = self.postings.get(term)
+            if posting is None or len(posting) > max_postings:
+                continue
+            for other_id, other_value in posting.items():
+                scores[other_id] = scores.get(other_id, 0.0) + value * other_value
+        scores.pop(exclude, None)
+        ranked = sorted(((book_id, score) for book_id, score in scores.items()
+                         if score >= min_similarity), key=lambda x: (-x[1], x[0]))
+        return ranked[:limit]
+
+    def similar(self, book_id: str, limit: int = 5,
+                min_similarity: float = 0.0) -> List[Tuple[str, float]]:
+        """Get top-K buku paling mirip dengan buku di index (book_id, cosine)"""
+        vector = self.vectors.get(book_id)
+        if not vector:
+            return []
+        return self._search(vector, limit, min_similarity, book_id)
+
+    def similar_to(self, book: Book, limit: int = 5,
+                   min_similarity: float = 0.0) -> List[Tuple[str, float]]:
+        """Get top-K buku paling mirip dengan Book (tidak harus ada di index)"""
+        vector = self._vectorize(self._term_counts(book))
+        return self._search(vector, limit, min_similarity, book.book_id)
+
+    def top_k_edges(self, k: int = 5, min_similarity: float = 0.2) -> Iterable[Tuple[str, str, float]]:
+        """Generate edge (book_id, similar_book_id, cosine) top-K untuk semua buku"""
+        for book_id in list(self.vectors):
+            for other_id, score in self.similar(book_id, k, min_similarity):
+                yield book_id, other_id, score
@@ -0,0 +1,215 @@
+"""
+Module Read Replica untuk Sistem Perpustakaan Digital
+Primary (LibraryManager yang menerima mutasi) mem-publish snapshot katalog ke
+file memory-mapped; process reader (mis. worker OPAC) me-map snapshot yang sama
+lewat page cache dan pindah ke snapshot baru saat versinya naik
+
+Isi direktori snapshot:
+    catalog.version          JSON {version, catalog, graph, books, published_at}
+    catalog-00000001.bin     katalog buku (format src.catalog_mmap)
+    graph-00000001.bin       graph rekomendasi CSR (format DataPersistence)
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from src.catalog_mmap import MmapCatalog, write_catalog
+from src.library_manager import LibraryManager
+from src.models import Book
+from src.persistence import read_graph_file, write_graph_file
+
+VERSION_FILE = "catalog.version"
+SNAPSHOT_PREFIXES = ("catalog-", "graph-")
+
+
+def read_version(directory: str) -> Optional[Dict[str, Any]]:
+    """Baca version file snapshot; Returns: dict info atau None jika belum ada snapshot"""
+    try:
+        with open(os.path.join(directory, VERSION_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class CatalogPublisher:
+    """
+    Publish snapshot katalog + graph rekomendasi dari primary LibraryManager
+    Setiap snapshot ditulis ke file baru bernomor versi, lalu version file
+    diganti secara atomic; reader yang masih me-map snapshot lama tidak terganggu
+    """
+
+    def __init__(self, library_manager: LibraryManager, directory: str, keep: int = 3):
+        self.library_manager = library_manager
+        self.directory = directory
+        self.keep = keep  # Jumlah snapshot terakhir yang disimpan di disk
+        os.makedirs(directory, exist_ok=True)
+
+        info = read_version(directory)
+        self.version = info["version"] if info else 0  # Lanjut dari versi terakhir setelah restart
+        self._published_state = None  # (books_version, graph.version) snapshot terakhir
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _state(self) -> Tuple[int, int]:
+        return self.library_manager.books_version, self.library_manager.recommendation_graph.version
+
+    def publish(self) -> Tuple[bool, str]:
+        """Tulis snapshot baru dan naikkan versi"""
+        lm = self.library_manager
+        try:
+            with lm.index_lock.read():
+                state = self._state()
+                books = [book for _, book in lm.get_all_books()]
+                csr = lm.recommendation_graph.to_csr()
+
+            version = self.version + 1
+            catalog_name = f"catalog-{version:08d}.bin"
+            graph_name = f"graph-{version:08d}.bin"
+            count = write_catalog(os.path.join(self.directory, catalog_name), books)
+            write_graph_file(os.path.join(self.directory, graph_name), csr)
+
+            info = {
+                "version": version,
+                "catalog": catalog_name,
+                "graph": graph_name,
+                "books": count,
+                "published_at": datetime.now().isoformat(),
+            }
+            version_file = os.path.join(self.directory, VERSION_FILE)
+            with open(version_file + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(info, f)
+            os.replace(version_file + ".tmp", version_file)
+
+            self.version = version
+            self._published_state = state
+            self._remove_old_snapshots()
+            return True, f"Snapshot versi {version} dipublish ({count} buku)"
+        except Exception as e:
+            return False, f"Error publish snapshot: {str(e)}"
+
+    def publish_if_changed(self) -> Tuple[bool, str]:
+        """Publish hanya jika buku atau graph berubah sejak snapshot terakhir"""
+        if self._state() == self._published_state:
+            return True, "Snapshot sudah terbaru"
+        return self.publish()
+
+    def start(self, interval: float = 5.0) -> None:
+        """Publish berkala di background thread (hanya jika ada perubahan)"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,),
+                                        name="catalog-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Hentikan thread publish berkala"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            self.publish_if_changed()
+
+    def _remove_old_snapshots(self) -> None:
+        """Hapus file snapshot di luar `keep` versi terakhir"""
+        for name in os.listdir(self.directory):
+            for prefix in SNAPSHOT_PREFIXES:
+                if not (name.startswith(prefix) and name.endswith(".bin")):
+                    continue
+                try:
+                    version = int(name[len(prefix):-len(".bin")])
+                except ValueError:
+                    continue
+                if version <= self.version - self.keep:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass  # Mis. Windows: file masih di-map reader
+
+
+class CatalogReplica:
+    """
+    Reader read-only di atas snapshot terbaru dari CatalogPublisher
+    Buku tidak dimuat ke memori process: LibraryManager replika hanya memegang
+    MmapCatalog (di-share antar process lewat page cache) dan graph rekomendasi.
+    Query mengecek versi baru paling sering tiap check_interval detik.
+    """
+
+    def __init__(self, directory: str, check_interval: float = 1.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self.version = 0
+        self.library_manager: Optional[LibraryManager] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Pindah ke snapshot terbaru jika versinya naik; Returns: apakah snapshot berganti"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            # Snapshot bisa sudah dihapus publisher jika replika tertinggal jauh: baca ulang versi
+            for _ in range(3):
+                info = read_version(self.directory)
+                if info is None or info["version"] <= self.version:
+                    return False
+                try:
+                    library_manager = self._open(info)
+                except FileNotFoundError:
+                    continue
+
+                # Snapshot lama tidak di-close: query yang masih berjalan memegang
+                # referensinya, mmap ditutup saat tidak direferensikan lagi
+                self.library_manager = library_manager
+                self.version = info["version"]
+                return True
+            return False
+
+    def maybe_refresh(self) -> bool:
+        """refresh() jika sudah lewat check_interval sejak pengecekan terakhir"""
+        if time.monotonic() - self._last_check < self.check_interval:
+            return False
+        return self.refresh()
+
+    def _open(self, info: Dict[str, Any]) -> LibraryManager:
+        library_manager = LibraryManager()
+        library_manager.attach_catalog(MmapCatalog(os.path.join(self.directory, info["catalog"])))
+
+        # attach_catalog sudah membuat node untuk setiap buku katalog
+        node_ids, indptr, indices, weights = read_graph_file(os.path.join(self.directory, info["graph"]))
+        library_manager.recommendation_graph.load_csr(node_ids, indptr, indices, weights)
+        return library_manager
+
+    def _current(self) -> Optional[LibraryManager]:
+        self.maybe_refresh()
+        return self.library_manager
+
+    # ==================== QUERY READ-ONLY ====================
+
+    def get_book(self, book_id: str) -> Optional[Book]:
+        """Get buku berdasarkan ID"""
+        library_manager = self._current()
+        return library_manager.get_book(book_id) if library_manager else None
+
+    def search_books(self, title: str = "", author: str = "", category: str = "",
+                     year: int = 0, limit: Optional[int] = None) -> List[Book]:
+        """Pencarian multi-kriteria di katalog snapshot"""
+        library_manager = self._current()
+        if library_manager is None:
+            return []
+        return library_manager.search_books_multi_criteria(title, author, category, year, limit)
+
+    def get_recommendations(self, book_id: str, depth: int = 2,
+                            limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Rekomendasi (judul, skor) dari graph snapshot"""
+        library_manager = self._current()
+        if library_manager is None:
+            return []
+        return library_manager.get_recommendations(book_id, depth, limit)
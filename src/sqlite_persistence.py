@@ -0,0 +1,445 @@
+"""
+Module Persistensi SQLite untuk Sistem Perpustakaan Digital
+Backend alternatif DataPersistence menggunakan sqlite3 (stdlib)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.data_structures import LazyLinkedList
+from src.models import Book, User, Transaction, Reservation, Review, SearchHistory, TransactionType
+from src.library_manager import LibraryManager
+from src.auth import AuthenticationManager
+
+
+# Nama tabel -> (model, kolom primary key)
+TABLES = {
+    "books": (Book, "book_id"),
+    "users": (User, "user_id"),
+    "transactions": (Transaction, "transaction_id"),
+    "reservations": (Reservation, "reservation_id"),
+    "reviews": (Review, "review_id"),
+    "search_history": (SearchHistory, "search_id"),
+}
+
+INDEXES = [
+    ("idx_users_username", "users", "username"),
+    ("idx_transactions_user", "transactions", "user_id"),
+    ("idx_transactions_book", "transactions", "book_id"),
+    ("idx_transactions_status", "transactions", "status"),
+    ("idx_transactions_due", "transactions", "due_date"),
+    ("idx_reservations_user", "reservations", "user_id"),
+    ("idx_reservations_book", "reservations", "book_id"),
+    ("idx_reservations_status", "reservations", "status"),
+    ("idx_reviews_book", "reviews", "book_id"),
+    ("idx_reviews_user", "reviews", "user_id"),
+    ("idx_search_history_user", "search_history", "user_id"),
+]
+
+SQL_TYPES = {int: "INTEGER", float: "REAL", bool: "INTEGER"}
+
+# Label pesan dan atribut LibraryManager per tabel
+TABLE_LABELS = {
+    "books": "buku", "users": "user", "transactions": "transaksi",
+    "reservations": "reservasi", "reviews": "review", "search_history": "riwayat pencarian",
+}
+COLLECTION_ATTRS = {
+    "transactions": "transactions", "reservations": "reservation_list",
+    "reviews": "reviews", "search_history": "search_history",
+}
+
+
+class SQLitePersistence:
+    """
+    Manager penyimpanan data berbasis SQLite
+    API save_*/load_*/snapshot/write_snapshot sama dengan DataPersistence
+    (bisa dipakai BackgroundSaver), ditambah operasi incremental (save_book,
+    save_transaction) dan query data dingin yang bisa dipakai langsung oleh
+    LibraryManager (cold store)
+
+    Penyimpanan incremental: baris terakhir yang ditulis/dimuat per tabel
+    diingat, sehingga save hanya meng-upsert baris yang berubah dan menghapus
+    baris yang hilang (satu transaksi SQLite). Koneksi dipakai bersama banyak
+    thread, jadi semua akses diserialisasi dengan `_lock`.
+    """
+
+    def __init__(self, db_path: str = os.path.join("data", "library.db")):
+        self.db_path = db_path
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self._lock = threading.RLock()  # Serialisasi akses koneksi (check_same_thread=False)
+        self._written: Dict[str, Dict[str, tuple]] = {}  # Tabel -> pk -> baris di database
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Buat tabel dan index jika belum ada"""
+        with self._lock, self.conn:
+            for table, (model_cls, pk) in TABLES.items():
+                columns = []
+                for f in fields(model_cls):
+                    column = f"{f.name} {SQL_TYPES.get(f.type, 'TEXT')}"
+                    if f.name == pk:
+                        column += " PRIMARY KEY"
+                    columns.append(column)
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+
+            for index, table, column in INDEXES:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table}({column})")
+
+    def close(self) -> None:
+        """Tutup koneksi database"""
+        with self._lock:
+            self.conn.close()
+
+    # ==================== HELPER ====================
+
+    def _insert_sql(self, table: str) -> str:
+        model_cls, _ = TABLES[table]
+        names = [f.name for f in fields(model_cls)]
+        placeholders = ", ".join("?" for _ in names)
+        return f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({placeholders})"
+
+    def _row(self, item: Any) -> tuple:
+        return tuple(getattr(item, f.name) for f in fields(type(item)))
+
+    def _rows_by_pk(self, table: str, items: Iterable[Any]) -> Dict[str, tuple]:
+        """Baris per primary key (tuple nilai primitif, aman dipakai sebagai snapshot)"""
+        model_cls, pk = TABLES[table]
+        position = [f.name for f in fields(model_cls)].index(pk)
+        rows = {}
+        for item in items:
+            row = self._row(item)
+            rows[row[position]] = row
+        return rows
+
+    def _to_model(self, table: str, row: tuple) -> Any:
+        model_cls, _ = TABLES[table]
+        values = [bool(value) if f.type is bool else value
+                  for f, value in zip(fields(model_cls), row)]
+        return model_cls(*values)
+
+    def _select(self, table: str, where: str = "", params: tuple = ()) -> List[Any]:
+        model_cls, _ = TABLES[table]
+        names = ", ".join(f.name for f in fields(model_cls))
+        sql = f"SELECT {names} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._to_model(table, row) for row in rows]
+
+    def _replace_table(self, table: str, items: List[Any]) -> None:
+        """Tulis ulang isi tabel dalam satu transaksi (dipakai migrasi)"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute(f"DELETE FROM {table}")
+                self.conn.executemany(self._insert_sql(table), (self._row(i) for i in items))
+            self._written.pop(table, None)
+
+    def _known_rows(self, table: str) -> Dict[str, tuple]:
+        """Baris yang ada di database (dibaca sekali jika tabel belum pernah dimuat/ditulis)"""
+        known = self._written.get(table)
+        if known is None:
+            known = self._rows_by_pk(table, self._select(table))
+            self._written[table] = known
+        return known
+
+    def _sync_rows(self, table: str, rows: Dict[str, tuple]) -> Tuple[int, int]:
+        """
+        Upsert baris yang berubah dan hapus baris yang hilang (panggil di dalam
+        transaksi, di bawah _lock). Returns: (jumlah upsert, jumlah delete)
+        """
+        known = self._known_rows(table)
+        changed = [row for key, row in rows.items() if known.get(key) != row]
+        removed = [(key,) for key in known if key not in rows]
+        if changed:
+            self.conn.executemany(self._insert_sql(table), changed)
+        if removed:
+            _, pk = TABLES[table]
+            self.conn.executemany(f"DELETE FROM {table} WHERE {pk} = ?", removed)
+        return len(changed), len(removed)
+
+    def _remember(self, table: str, rows: Dict[str, tuple]) -> None:
+        """Catat isi tabel setelah commit/load berhasil"""
+        with self._lock:
+            self._written[table] = dict(rows)
+
+    def _load_table(self, table: str) -> List[Any]:
+        """Baca seluruh tabel dan catat barisnya sebagai isi database terakhir"""
+        items = self._select(table)
+        self._remember(table, self._rows_by_pk(table, items))
+        return items
+
+    def _save_rows(self, table: str, rows: Optional[Dict[str, tuple]]) -> Tuple[bool, str]:
+        label = TABLE_LABELS[table]
+        if rows is None:
+            return True, f"{label.capitalize()} tidak berubah (belum dimuat)"
+        try:
+            with self._lock:
+                with self.conn:
+                    changed, removed = self._sync_rows(table, rows)
+                self._remember(table, rows)
+            return True, (f"Berhasil menyimpan {len(rows)} {label} "
+                          f"({changed} berubah, {removed} dihapus)")
+        except Exception as e:
+            with self._lock:
+                self._written.pop(table, None)  # Isi database tidak pasti; baca ulang saat save berikutnya
+            return False, f"Error menyimpan {label}: {str(e)}"
+
+    def _collection_items(self, table: str, library_manager: LibraryManager,
+                          auth_manager: Optional[AuthenticationManager]) -> Optional[List[Any]]:
+        """Model satu tabel (None jika koleksi lazy belum dimuat)"""
+        if table == "books":
+            return [book for _, book in library_manager.get_all_books()]
+        if table == "users":
+            return list(auth_manager.get_all_users().values())
+        collection = getattr(library_manager, COLLECTION_ATTRS[table])
+        if isinstance(collection, LazyLinkedList) and not collection.is_loaded:
+            return None
+        return collection.get_all()
+
+    # ==================== SAVE METHODS ====================
+
+    def save_books(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Save semua buku ke database (hanya baris yang berubah yang ditulis)"""
+        return self._save_rows("books", self._rows_by_pk(
+            "books", self._collection_items("books", library_manager, None)))
+
+    def save_users(self, auth_manager: AuthenticationManager) -> Tuple[bool, str]:
+        """Save semua user ke database"""
+        return self._save_rows("users", self._rows_by_pk(
+            "users", auth_manager.get_all_users().values()))
+
+    def _save_collection(self, table: str, library_manager: LibraryManager) -> Tuple[bool, str]:
+        items = self._collection_items(table, library_manager, None)
+        return self._save_rows(table, None if items is None else self._rows_by_pk(table, items))
+
+    def save_transactions(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Save semua transaksi ke database"""
+        return self._save_collection("transactions", library_manager)
+
+    def save_reservations(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Save semua reservasi ke database"""
+        return self._save_collection("reservations", library_manager)
+
+    def save_reviews(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Save semua review ke database"""
+        return self._save_collection("reviews", library_manager)
+
+    def save_search_history(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Save riwayat pencarian ke database"""
+        return self._save_collection("search_history", library_manager)
+
+    def save_all(self, library_manager: LibraryManager, auth_manager: AuthenticationManager) -> Tuple[bool, str]:
+        """Save semua data (incremental, satu transaksi)"""
+        return self.write_snapshot(self.snapshot(library_manager, auth_manager))
+
+    def snapshot(self, library_manager: LibraryManager,
+                 auth_manager: AuthenticationManager) -> Dict[str, Optional[Dict[str, tuple]]]:
+        """
+        Salin semua data ke baris per tabel (tanpa I/O), seperti DataPersistence.snapshot
+        Koleksi lazy yang belum dimuat bernilai None (tabel tidak disentuh)
+        """
+        snapshot = {}
+        with library_manager.index_lock.read(), library_manager.records_lock:
+            for table in TABLES:
+                items = self._collection_items(table, library_manager, auth_manager)
+                snapshot[table] = None if items is None else self._rows_by_pk(table, items)
+        return snapshot
+
+    def write_snapshot(self, snapshot: Dict[str, Optional[Dict[str, tuple]]]) -> Tuple[bool, str]:
+        """Tulis hasil snapshot(): hanya baris yang berubah, semua tabel dalam satu commit"""
+        results = []
+        try:
+            with self._lock:
+                with self.conn:
+                    for table, rows in snapshot.items():
+                        label = TABLE_LABELS[table]
+                        if rows is None:
+                            results.append((True, f"{label.capitalize()} tidak berubah (belum dimuat)"))
+                            continue
+                        changed, removed = self._sync_rows(table, rows)
+                        results.append((True, f"Berhasil menyimpan {len(rows)} {label} "
+                                              f"({changed} berubah, {removed} dihapus)"))
+                for table, rows in snapshot.items():
+                    if rows is not None:
+                        self._remember(table, rows)
+        except Exception as e:
+            with self._lock:
+                self._written.clear()  # Transaksi di-rollback; baca ulang isi database
+            return False, f"Error menyimpan data: {str(e)}"
+
+        return True, f"Semua data berhasil disimpan ({len(results)}/{len(results)})"
+
+    # ==================== INCREMENTAL SAVE ====================
+
+    def _upsert(self, items: List[Tuple[str, Any]]) -> None:
+        """Upsert beberapa (tabel, model) dalam satu commit"""
+        with self._lock:
+            with self.conn:
+                for table, item in items:
+                    self.conn.execute(self._insert_sql(table), self._row(item))
+            for table, item in items:
+                known = self._written.get(table)
+                if known is not None:
+                    known.update(self._rows_by_pk(table, [item]))
+
+    def save_book(self, book: Book) -> None:
+        """Upsert satu buku (tanpa menulis ulang seluruh katalog)"""
+        self._upsert([("books", book)])
+
+    def delete_book(self, book_id: str) -> None:
+        """Hapus satu buku dari database"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM books WHERE book_id = ?", (book_id,))
+            self._written.get("books", {}).pop(book_id, None)
+
+    def save_transaction(self, transaction: Transaction) -> None:
+        """Upsert satu transaksi"""
+        self._upsert([("transactions", transaction)])
+
+    def save_borrow_or_return(self, book: Book, transaction: Transaction) -> None:
+        """Upsert buku dan transaksi hasil borrow/return dalam satu commit"""
+        self._upsert([("books", book), ("transactions", transaction)])
+
+    # ==================== LOAD METHODS ====================
+
+    def load_books(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Load buku dari database"""
+        try:
+            books = self._load_table("books")
+            for book in books:
+                library_manager.add_book(book)
+            return True, f"Berhasil memuat {len(books)} buku"
+        except Exception as e:
+            return False, f"Error memuat buku: {str(e)}"
+
+    def load_users(self, auth_manager: AuthenticationManager) -> Tuple[bool, str]:
+        """Load user dari database"""
+        try:
+            users = self._load_table("users")
+            for user in users:
+                auth_manager.add_user(user)
+            return True, f"Berhasil memuat {len(users)} user"
+        except Exception as e:
+            return False, f"Error memuat user: {str(e)}"
+
+    def _load_collection(self, table: str, collection, label: str) -> Tuple[bool, str]:
+        try:
+            items = self._load_table(table)
+            collection.extend(items)
+            return True, f"Berhasil memuat {len(items)} {label}"
+        except Exception as e:
+            return False, f"Error memuat {label}: {str(e)}"
+
+    def load_transactions(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Load transaksi dari database"""
+        return self._load_collection("transactions", library_manager.transactions, "transaksi")
+
+    def load_reservations(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Load reservasi dari database"""
+        return self._load_collection("reservations", library_manager.reservation_list, "reservasi")
+
+    def load_reviews(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Load review dari database"""
+        return self._load_collection("reviews", library_manager.reviews, "review")
+
+    def load_search_history(self, library_manager: LibraryManager) -> Tuple[bool, str]:
+        """Load riwayat pencarian dari database"""
+        return self._load_collection("search_history", library_manager.search_history,
+                                     "riwayat pencarian")
+
+    def load_all(self, library_manager: LibraryManager, auth_manager: AuthenticationManager,
+                 lazy: bool = False) -> Tuple[bool, str]:
+        """
+        Load semua data
+        lazy: koleksi dingin tidak dimuat; LibraryManager meng-query
+              database ini langsung (cold store) sampai koleksi diakses
+        """
+        results = []
+
+        results.append(self.load_books(library_manager))
+        results.append(self.load_users(auth_manager))
+        results.append(self.load_reservations(library_manager))
+
+        if lazy:
+            library_manager.attach_lazy_collections({
+                name: (lambda table=name: self._load_table(table))
+                for name in LibraryManager.LAZY_COLLECTIONS
+            })
+            library_manager.attach_cold_store(self)
+            results.extend((True, f"Koleksi {name} dimuat saat dibutuhkan")
+                           for name in LibraryManager.LAZY_COLLECTIONS)
+        else:
+            results.append(self.load_transactions(library_manager))
+            results.append(self.load_reviews(library_manager))
+            results.append(self.load_search_history(library_manager))
+
+        success_count = sum(1 for success, _ in results if success)
+        all_success = all(success for success, _ in results)
+
+        if all_success:
+            return True, f"Semua data berhasil dimuat ({success_count}/6)"
+        else:
+            messages = "\n".join([msg for _, msg in results])
+            return False, f"Error memuat data:\n{messages}"
+
+    # ==================== QUERY DATA DINGIN ====================
+
+    def get_user_transactions(self, user_id: str) -> List[Transaction]:
+        """Get transaksi user (pakai index user_id)"""
+        return self._select("transactions", "user_id = ?", (user_id,))
+
+    def get_overdue_transactions(self, now_iso: str) -> List[Transaction]:
+        """Get transaksi aktif yang melewati due_date (pakai index status/due_date)"""
+        return self._select("transactions",
+                            "status = 'Aktif' AND transaction_type = ? AND due_date < ?",
+                            (TransactionType.BORROW.value, now_iso))
+
+    def get_book_reviews(self, book_id: str) -> List[Review]:
+        """Get review untuk buku (pakai index book_id)"""
+        return self._select("reviews", "book_id = ?", (book_id,))
+
+    def get_user_search_history(self, user_id: str) -> List[SearchHistory]:
+        """Get riwayat pencarian user (pakai index user_id)"""
+        return self._select("search_history", "user_id = ?", (user_id,))
+
+
+def migrate_json_to_sqlite(data_dir: str = "data", db_path: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Migrasi layout data/*.json ke database SQLite
+    Returns: (success, message)
+    """
+    if db_path is None:
+        db_path = os.path.join(data_dir, "library.db")
+
+    store = SQLitePersistence(db_path)
+    counts = []
+    try:
+        for table in TABLES:
+            path = os.path.join(data_dir, f"{table}.json")
+            if not os.path.exists(path):
+                continue
+
+            with open(path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+
+            model_cls, _ = TABLES[table]
+            store._replace_table(table, [model_cls.from_dict(r) for r in records])
+            counts.append(f"{len(records)} {table}")
+
+        return True, f"Migrasi berhasil: {', '.join(counts) or 'tidak ada data'}"
+    except Exception as e:
+        return False, f"Error migrasi: {str(e)}"
+    finally:
+        store.close()
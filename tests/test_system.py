@@ -3,9 +3,14 @@ Unit Tests untuk Sistem Perpustakaan Digital
 Test untuk semua struktur data dan fitur utama
 """
 
+import asyncio
+import json
 import unittest
 import sys
 import os
+import random
+import threading
+import time
 from datetime import datetime, timedelta
 
 # Add src directory to path
@@ -13,12 +18,17 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.data_structures import (
     BinarySearchTree, HashTable, Queue, Stack, Graph,
-    LinkedList, MinHeap
+    LinkedList, LazyLinkedList, MinHeap, LRUCache
 )
-from src.models import Book, User, Transaction, UserRole, BookStatus
-from src.auth import AuthenticationManager
+from src.models import Book, User, Transaction, UserRole, BookStatus, TransactionType
+from src.auth import AuthenticationManager, SessionStore, LoginRateLimiter
 from src.library_manager import LibraryManager
-from src.persistence import DataPersistence
+from src.concurrency import ReadWriteLock, StripedLock
+from src.recommender import build_coborrow_similarities
+from src.persistence import BackgroundSaver, DataPersistence
+from src.sqlite_persistence import SQLitePersistence, migrate_json_to_sqlite
+from src.api_server import LibraryAPIServer
+from src.replica import CatalogPublisher, CatalogReplica
 
 
 class TestDataStructures(unittest.TestCase):
@@ -43,6 +53,15 @@ class TestDataStructures(unittest.TestCase):
         self.assertEqual(bst.size, 2)
         self.assertIsNone(bst.search("book1"))
 
+    def test_bst_search_many(self):
+        """Test BST mencari banyak key dalam satu traversal"""
+        bst = BinarySearchTree()
+        for key in ["m", "c", "x", "a", "e", "q", "z"]:
+            bst.insert(key, key.upper())
+        
+        self.assertEqual(bst.search_many(["z", "a", "e", "b", "a"]), {"a": "A", "e": "E", "z": "Z"})
+        self.assertEqual(bst.search_many([]), {})
+
     def test_hash_table(self):
         """Test Hash Table operations"""
         ht = HashTable(capacity=50)
@@ -60,6 +79,16 @@ class TestDataStructures(unittest.TestCase):
         self.assertTrue(ht.delete("key1"))
         self.assertEqual(ht.size, 1)
 
+    def test_hash_table_resize(self):
+        """Test Hash Table membesar saat load factor terlampaui"""
+        ht = HashTable(capacity=4)
+        for i in range(100):
+            ht.insert(f"key{i}", i)
+        
+        self.assertGreaterEqual(ht.capacity, 100 / HashTable.MAX_LOAD_FACTOR)
+        self.assertEqual(ht.size, 100)
+        self.assertEqual(ht.search("key42"), 42)
+
     def test_queue(self):
         """Test Queue operations"""
         queue = Queue()
@@ -108,6 +137,58 @@ class TestDataStructures(unittest.TestCase):
         ll.insert_at(1, 15)
         self.assertEqual(ll.get(1), 15)
         self.assertEqual(ll.size, 4)
+        
+        # Test remove (tail ikut diperbarui)
+        self.assertTrue(ll.remove(30))
+        self.assertFalse(ll.remove(99))
+        ll.append(40)
+        self.assertEqual(ll.get_all(), [10, 15, 20, 40])
+
+    def test_lazy_linked_list(self):
+        """Test LazyLinkedList hanya memuat isi saat pertama diakses"""
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return ["a", "b"]
+        
+        ll = LazyLinkedList(loader)
+        self.assertFalse(ll.is_loaded)
+        self.assertEqual(calls, [])
+        
+        ll.append("c")
+        self.assertTrue(ll.is_loaded)
+        self.assertEqual(ll.get_all(), ["a", "b", "c"])
+        self.assertEqual(ll.size, 3)
+        self.assertEqual(len(calls), 1)
+
+    def test_lazy_linked_list_loader_error(self):
+        """Test loader yang gagal tidak menandai list sebagai sudah dimuat"""
+        attempts = []
+        
+        def loader():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ValueError("file rusak")
+            return ["a"]
+        
+        ll = LazyLinkedList(loader)
+        with self.assertRaises(ValueError):
+            ll.get_all()
+        self.assertFalse(ll.is_loaded)
+        self.assertEqual(ll.get_all(), ["a"])
+
+    def test_lru_cache(self):
+        """Test LRU Cache membuang item terlama saat penuh"""
+        cache = LRUCache(capacity=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "a" jadi paling baru
+        cache.put("c", 3)
+        
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.keys(), ["a", "c"])
+        self.assertEqual(len(cache), 2)
 
     def test_min_heap(self):
         """Test Min Heap operations"""
@@ -144,6 +225,154 @@ class TestDataStructures(unittest.TestCase):
         self.assertEqual(len(recs), 2)
         self.assertEqual(recs[0][0], "book2")  # Highest weight first
 
+    def test_graph_recommendations_strongest_path(self):
+        """Test rekomendasi memakai path terkuat, bukan path pertama"""
+        graph = Graph()
+        for book_id in ("A", "B", "C", "D"):
+            graph.add_node(book_id, book_id)
+        graph.add_edge("A", "C", 0.1)
+        graph.add_edge("A", "B", 0.9)
+        graph.add_edge("B", "C", 0.9)
+        graph.add_edge("C", "D", 0.5)
+        graph.add_edge("C", "A", 1.0)
+        
+        recs = dict(graph.get_recommendations("A", depth=2))
+        self.assertAlmostEqual(recs["C"], 0.81)
+        self.assertAlmostEqual(recs["D"], 0.05)  # via A->C (0.81 path butuh 3 hop)
+        self.assertNotIn("A", recs)
+        
+        top = graph.get_recommendations("A", depth=3, limit=2)
+        self.assertEqual([book_id for book_id, _ in top], ["B", "C"])
+
+    def test_graph_weights_clamped_for_limit(self):
+        """Test bobot > 1 dipotong sehingga hasil dengan limit tetap top-K"""
+        graph = Graph()
+        for book_id in ("S", "B", "C", "D"):
+            graph.add_node(book_id, book_id)
+        graph.add_edge("S", "B", 0.5)
+        graph.add_edge("B", "C", 1.9)
+        graph.add_edge("S", "D", 0.4)
+        self.assertEqual(graph.get_edge_weight("B", "C"), 1.0)
+        graph.set_edge_weight("S", "D", 3.0)
+        self.assertEqual(graph.get_edge_weight("S", "D"), 1.0)
+        
+        full = graph.get_recommendations("S", depth=2)
+        top = graph.get_recommendations("S", depth=2, limit=2)
+        self.assertEqual(top, full[:2])
+        self.assertEqual([score for _, score in full],
+                         sorted((score for _, score in full), reverse=True))
+
+    def test_graph_recommendations_deep_chain(self):
+        """Test graph dalam tidak terkena batas rekursi"""
+        graph = Graph()
+        n = 5000
+        for i in range(n):
+            graph.add_node(f"b{i}", f"Title {i}")
+        graph.add_edges((f"b{i}", f"b{i + 1}", 1.0) for i in range(n - 1))
+        
+        recs = graph.get_recommendations("b0", depth=n)
+        self.assertEqual(len(recs), n - 1)
+
+    def test_graph_edge_updates(self):
+        """Test update, remove edge dan remove node pada Graph"""
+        graph = Graph()
+        for i in range(1, 4):
+            graph.add_node(f"book{i}", f"Title {i}")
+        
+        self.assertEqual(graph.add_edges([("book1", "book2", 0.8), ("book3", "book2", 0.5),
+                                          ("book1", "book2", 0.1), ("book1", "book9", 1.0)]), 2)
+        self.assertEqual(graph.get_edge_weight("book1", "book2"), 0.8)
+        
+        graph.set_edge_weight("book1", "book2", 0.3)
+        self.assertEqual(graph.get_edge_weight("book1", "book2"), 0.3)
+        
+        self.assertTrue(graph.remove_edge("book3", "book2"))
+        self.assertIsNone(graph.get_edge_weight("book3", "book2"))
+        
+        graph.add_edge("book2", "book3", 0.9)
+        self.assertTrue(graph.remove_node("book2"))
+        self.assertEqual(graph.nodes["book1"].neighbors, {})
+        self.assertEqual(graph.nodes["book3"].in_neighbors, set())
+
+
+class TestConcurrency(unittest.TestCase):
+    """Test primitive locking"""
+
+    def test_read_write_lock(self):
+        """Test reader bersamaan, writer eksklusif, dan nested lock"""
+        lock = ReadWriteLock()
+        both_reading = threading.Barrier(2, timeout=5)
+        
+        def reader():
+            with lock.read():
+                both_reading.wait()  # Timeout jika reader saling menunggu
+        
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        events = []
+        
+        def late_reader():
+            with lock.read():
+                events.append("read")
+        
+        with lock.write():
+            t = threading.Thread(target=late_reader)
+            t.start()
+            t.join(0.1)
+            self.assertEqual(events, [])  # Reader menunggu writer
+            with lock.read(), lock.write():  # Nested di thread pemegang write
+                events.append("nested")
+        t.join(5)
+        self.assertEqual(events, ["nested", "read"])
+        
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                with lock.write():
+                    pass
+
+    def test_reader_cannot_enter_while_writer_takes_lock(self):
+        """Test fast path reader tidak lolos saat writer selesai menunggu"""
+        class GapLock(ReadWriteLock):
+            on_dequeue = None
+            
+            def __setattr__(self, name, value):
+                super().__setattr__(name, value)
+                if name == "_writers_waiting" and value == 0 and self.on_dequeue:
+                    hook, self.on_dequeue = self.on_dequeue, None
+                    hook()
+        
+        lock = GapLock()
+        entered = threading.Event()
+        
+        def reader():
+            with lock.read():
+                entered.set()
+        
+        t = threading.Thread(target=reader)
+        
+        def start_reader():
+            # Reader mencoba masuk tepat saat writer melepas tanda antre
+            t.start()
+            t.join(0.1)
+        
+        lock.on_dequeue = start_reader
+        with lock.write():
+            self.assertFalse(entered.is_set())  # Writer dan reader tidak boleh bersamaan
+        self.assertTrue(entered.wait(5))
+        t.join(5)
+
+    def test_striped_lock(self):
+        """Test stripe per key dan hold_many"""
+        locks = StripedLock(stripes=4)
+        self.assertIs(locks.hold("book1"), locks.hold("book1"))
+        with locks.hold_many(["book1", "book2", "book1"]):
+            with locks.hold("book2"):  # Reentrant
+                pass
+
 
 class TestAuthentication(unittest.TestCase):
     """Test authentication system"""
@@ -208,6 +437,265 @@ class TestAuthentication(unittest.TestCase):
         self.assertTrue(success)
 
 
+    def test_login_async(self):
+        """Test registrasi & login lewat worker pool"""
+        success, msg = self.auth.register_user_async(
+            "testuser", "password123", "Test User",
+            "test@email.com", "08123456789", "Jl. Test",
+            "user001"
+        ).result(timeout=30)
+        self.assertTrue(success, msg)
+        
+        success, msg, session_id = self.auth.login_async("testuser", "password123").result(timeout=30)
+        self.auth.shutdown()
+        self.assertTrue(success)
+        self.assertTrue(self.auth.validate_session(session_id)[0])
+
+    def test_register_users_bulk(self):
+        """Test registrasi banyak user sekaligus"""
+        base = {"full_name": "Test User", "email": "test@email.com",
+                "phone": "08123456789", "address": "Jl. Test"}
+        results = self.auth.register_users_bulk([
+            dict(base, username="user_a", password="password123", user_id="u1"),
+            dict(base, username="user_b", password="short", user_id="u2"),
+            dict(base, username="user_a", password="password456", user_id="u3"),
+        ])
+        self.auth.shutdown()
+        
+        self.assertEqual([ok for ok, _ in results], [True, False, False])
+        self.assertTrue(self.auth.login("user_a", "password123")[0])
+        self.assertIsNone(self.auth.get_user("user_b"))
+
+    def test_register_users_bulk_missing_fields(self):
+        """Test item bulk tanpa key wajib ditolak tanpa membatalkan item lain"""
+        results = self.auth.register_users_bulk([
+            {"username": "user_a", "password": "password123", "full_name": "A",
+             "email": "a@email.com", "phone": "0812", "address": "Jl. A", "user_id": "u1"},
+            {"username": "user_b", "password": "password123", "full_name": "B"},
+        ])
+        self.auth.shutdown()
+        
+        self.assertEqual(results[0], (True, "Registrasi berhasil"))
+        self.assertFalse(results[1][0])
+        self.assertIn("email", results[1][1])
+        self.assertIsNotNone(self.auth.get_user("user_a"))
+        self.assertIsNone(self.auth.get_user("user_b"))
+
+    def test_duplicate_user_id_and_email_rejected(self):
+        """Test user_id/email ganda ditolak dan index user lama tidak tertimpa"""
+        self.auth.register_user("user_a", "password123", "A", "a@email.com",
+                                "0812", "Jl. A", "u1")
+        
+        success, message = self.auth.register_user("user_b", "password123", "B",
+                                                    "b@email.com", "0812", "Jl. B", "u1")
+        self.assertFalse(success)
+        self.assertEqual(message, "User ID sudah terdaftar")
+        success, message = self.auth.register_user("user_c", "password123", "C",
+                                                   "A@Email.com", "0812", "Jl. C", "u3")
+        self.assertFalse(success)
+        self.assertEqual(message, "Email sudah terdaftar")
+        
+        results = self.auth.register_users_bulk([
+            {"username": "user_d", "password": "password123", "full_name": "D",
+             "email": "d@email.com", "phone": "0812", "address": "Jl. D", "user_id": "u1"},
+            {"username": "user_e", "password": "password123", "full_name": "E",
+             "email": "e@email.com", "phone": "0812", "address": "Jl. E", "user_id": "u5"},
+            {"username": "user_f", "password": "password123", "full_name": "F",
+             "email": "E@email.com", "phone": "0812", "address": "Jl. F", "user_id": "u6"},
+        ])
+        self.auth.shutdown()
+        self.assertEqual([ok for ok, _ in results], [False, True, False])
+        
+        success, _ = self.auth.update_user("user_e", user_id="u1")
+        self.assertFalse(success)
+        self.assertEqual(self.auth.get_user_by_id("u1").username, "user_a")
+        self.assertEqual(self.auth.get_user_by_email("a@email.com").username, "user_a")
+        self.assertEqual(self.auth.get_user_by_id("u5").username, "user_e")
+        self.assertIsNone(self.auth.get_user("user_b"))
+
+    def test_update_user_rejects_username_change(self):
+        """Test update_user tidak membuat dua username untuk satu akun"""
+        self.auth.register_user("user_a", "password123", "A", "a@email.com",
+                                "0812", "Jl. A", "u1")
+        success, message = self.auth.update_user("user_a", username="user_z", full_name="Z")
+        self.assertFalse(success)
+        self.assertEqual(message, "Username tidak dapat diubah")
+        self.assertIsNone(self.auth.get_user("user_z"))
+        self.assertEqual(self.auth.get_user("user_a").full_name, "A")
+        self.assertEqual(len(self.auth.get_all_users()), 1)
+        
+        success, _ = self.auth.update_user("user_a", username="user_a", full_name="Z")
+        self.assertTrue(success)
+        self.assertEqual(self.auth.get_user_by_id("u1").full_name, "Z")
+
+    def test_concurrent_logins_serialize_rate_limiter(self):
+        """Test rate limiter tidak pernah diakses dua thread login sekaligus"""
+        class TrackingLimiter(LoginRateLimiter):
+            active = max_active = 0
+            
+            def _enter(self):
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                time.sleep(0.001)  # Beri kesempatan thread lain masuk
+                self.active -= 1
+            
+            def retry_after(self, key, now=None):
+                self._enter()
+                return super().retry_after(key, now)
+            
+            def record_failure(self, key, now=None):
+                self._enter()
+                super().record_failure(key, now)
+        
+        self.auth.rate_limiter = TrackingLimiter(max_attempts=3, max_tracked=4)
+        errors = []
+        
+        def worker(seed):
+            try:
+                for i in range(20):
+                    self.auth.login(f"ghost{(seed + i) % 6}", "password123")
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(self.auth.rate_limiter.max_active, 1)
+        self.assertLessEqual(len(self.auth.rate_limiter), 4)
+
+
+    def test_deactivate_user_revokes_sessions(self):
+        """Test deactivate user menghapus semua session user"""
+        self.auth.register_user(
+            "testuser", "password123", "Test User",
+            "test@email.com", "08123456789", "Jl. Test",
+            "user001"
+        )
+        _, _, session1 = self.auth.login("testuser", "password123")
+        _, _, session2 = self.auth.login("testuser", "password123")
+        
+        self.auth.deactivate_user("testuser")
+        self.assertFalse(self.auth.validate_session(session1)[0])
+        self.assertFalse(self.auth.validate_session(session2)[0])
+        self.assertEqual(len(self.auth.sessions), 0)
+
+
+    def test_lockout_skips_password_hashing(self):
+        """Test akun terkunci ditolak tanpa menjalankan PBKDF2"""
+        self.auth.register_user(
+            "testuser", "password123", "Test User",
+            "test@email.com", "08123456789", "Jl. Test",
+            "user001"
+        )
+        for _ in range(5):
+            self.assertFalse(self.auth.login("testuser", "wrongpass")[0])
+        
+        calls = []
+        original = self.auth.hash_password
+        self.auth.hash_password = lambda *args: calls.append(1) or original(*args)
+        success, msg, _ = self.auth.login("testuser", "password123")
+        self.assertFalse(success)
+        self.assertIn("Terlalu banyak login gagal", msg)
+        self.assertEqual(calls, [])
+
+
+    def test_user_id_and_email_index(self):
+        """Test lookup user berdasarkan user_id dan email"""
+        self.auth.register_user(
+            "testuser", "password123", "Test User",
+            "Test@Email.com", "08123456789", "Jl. Test",
+            "user001"
+        )
+        self.assertEqual(self.auth.get_user_by_id("user001").username, "testuser")
+        self.assertEqual(self.auth.get_user_by_email("test@email.com").username, "testuser")
+        
+        self.auth.update_user("testuser", email="baru@email.com")
+        self.assertIsNone(self.auth.get_user_by_email("test@email.com"))
+        self.assertEqual(self.auth.get_user_by_email("baru@email.com").user_id, "user001")
+
+
+    def test_users_page(self):
+        """Test daftar user ber-halaman terurut username"""
+        for username in ["charlie", "alice", "bob"]:
+            self.auth.add_user(User(f"id_{username}", username, "hash", username.title(),
+                                    f"{username}@email.com", "0812", "Jl. Test"))
+        
+        users, total = self.auth.get_users_page(0, 2)
+        self.assertEqual(total, 3)
+        self.assertEqual([u.username for u in users], ["alice", "bob"])
+        
+        self.auth.add_user(User("id_aaron", "aaron", "hash", "Aaron", "aaron@email.com",
+                                "0812", "Jl. Test"))
+        users, total = self.auth.get_users_page(2, 2)
+        self.assertEqual(total, 4)
+        self.assertEqual([u.username for u in users], ["bob", "charlie"])
+
+
+class TestLoginRateLimiter(unittest.TestCase):
+    """Test sliding window rate limiter"""
+
+    def test_sliding_window(self):
+        """Test blokir hanya jika max_attempts gagal dalam window"""
+        limiter = LoginRateLimiter(max_attempts=3, window_seconds=60)
+        for t in (0, 10, 20):
+            limiter.record_failure("user", now=t)
+        self.assertTrue(limiter.is_blocked("user", now=30))
+        self.assertFalse(limiter.is_blocked("user", now=61))
+        
+        limiter.reset("user")
+        self.assertFalse(limiter.is_blocked("user", now=30))
+
+    def test_bounded_memory(self):
+        """Test jumlah username yang dilacak dibatasi"""
+        limiter = LoginRateLimiter(max_tracked=100)
+        for i in range(1000):
+            limiter.record_failure(f"random{i}")
+        self.assertEqual(len(limiter), 100)
+
+
+class TestSessionStore(unittest.TestCase):
+    """Test session store dengan expiry heap"""
+
+    def test_sweep_expired_sessions(self):
+        """Test sweep hanya menghapus session kadaluarsa"""
+        store = SessionStore()
+        now = datetime.now()
+        store.create("s1", "user1", now - timedelta(seconds=1))
+        store.create("s2", "user1", now + timedelta(hours=1))
+        store.create("s3", "user2", now + timedelta(minutes=1))
+        
+        self.assertEqual(store.sweep(now + timedelta(minutes=5)), 1)
+        self.assertEqual(len(store), 1)
+        self.assertIn("s2", store)
+        self.assertEqual(store.user_sessions("user2"), [])
+
+    def test_bounded_size(self):
+        """Test session paling cepat kadaluarsa dibuang saat penuh"""
+        store = SessionStore(max_sessions=2)
+        now = datetime.now()
+        store.create("s1", "user1", now + timedelta(hours=2))
+        store.create("s2", "user2", now + timedelta(hours=1))
+        store.create("s3", "user3", now + timedelta(hours=3))
+        
+        self.assertEqual(len(store), 2)
+        self.assertNotIn("s2", store)
+
+    def test_revoke_user(self):
+        """Test revoke semua session milik satu user"""
+        store = SessionStore()
+        expiry = datetime.now() + timedelta(hours=1)
+        store.create("s1", "user1", expiry)
+        store.create("s2", "user1", expiry)
+        store.create("s3", "user2", expiry)
+        
+        self.assertEqual(store.revoke_user("user1"), 2)
+        self.assertEqual(len(store), 1)
+
+
 class TestLibraryManager(unittest.TestCase):
     """Test library manager operations"""
 
@@ -290,6 +778,172 @@ class TestLibraryManager(unittest.TestCase):
         self.assertTrue(success)
         self.assertIsNotNone(res_id)
 
+    def test_delete_book_removes_graph_node(self):
+        """Test hapus buku juga menghapus relasi rekomendasinya"""
+        self.library.add_book(self.book)
+        other = Book(
+            book_id="book002", title="Other Book", author="Other Author",
+            publisher="Test Publisher", isbn="987654321", publication_year=2022,
+            category="Fiction", total_copies=1, available_copies=1, location="Rak A2"
+        )
+        self.library.add_book(other)
+        self.library.add_book_relationship("book002", "book001", 0.9)
+        
+        self.library.delete_book("book001")
+        self.assertEqual(self.library.get_recommendations("book002"), [])
+        self.assertNotIn("book001", self.library.recommendation_graph.nodes)
+
+    def test_recommendation_cache_invalidation(self):
+        """Test cache rekomendasi hanya di-invalidate di sekitar perubahan graph"""
+        for book_id in ("b1", "b2", "b3", "x1", "x2"):
+            self.library.add_book(Book(
+                book_id=book_id, title=f"Title {book_id}", author="Author",
+                publisher="Publisher", isbn="1", publication_year=2020,
+                category="Fiction", total_copies=1, available_copies=1, location="Rak"
+            ))
+        self.library.add_book_relationship("b1", "b2", 0.9)
+        self.library.add_book_relationship("x1", "x2", 0.5)
+        
+        self.assertEqual(self.library.get_recommendations("b1"), [("Title b2", 0.9)])
+        self.library.get_recommendations("x1")
+        self.library.get_recommendations("b1")
+        self.assertEqual(self.library.get_recommendation_cache_stats()["hits"], 1)
+        
+        # Edge baru b2 -> b3 mempengaruhi b1 (depth 2) tetapi tidak x1
+        self.library.add_book_relationship("b2", "b3", 0.5)
+        self.assertNotIn(("b1", 2, None), self.library.recommendation_cache)
+        self.assertIn(("x1", 2, None), self.library.recommendation_cache)
+        self.assertEqual(len(self.library.get_recommendations("b1")), 2)
+        
+        # Ganti judul buku yang muncul di hasil
+        self.library.update_book("b3", title="Judul Baru")
+        self.assertIn(("Judul Baru", 0.45), self.library.get_recommendations("b1"))
+
+    def test_recommendation_cache_bounded(self):
+        """Test depth besar tidak di-cache dan varian (depth, limit) ikut tergeser LRU"""
+        for book_id in ("b1", "b2"):
+            self.library.add_book(Book(
+                book_id=book_id, title=f"Title {book_id}", author="Author",
+                publisher="Publisher", isbn="1", publication_year=2020,
+                category="Fiction", total_copies=1, available_copies=1, location="Rak"
+            ))
+        self.library.add_book_relationship("b1", "b2", 0.9)
+        
+        self.library.get_recommendations("b1", 20_000_000, 5)
+        self.assertEqual(len(self.library.recommendation_cache), 0)
+        self.assertEqual(self.library._max_cached_depth(), 0)
+        
+        self.library.recommendation_cache.capacity = 4
+        for limit in range(1, 50):
+            self.library.get_recommendations("b1", 2, limit)
+        self.assertEqual(len(self.library.recommendation_cache), 4)
+        self.assertEqual(len(self.library._recommendation_variants["b1"]), 4)
+        
+        self.library.add_book_relationship("b2", "b1", 0.5)
+        self.assertEqual(len(self.library.recommendation_cache), 0)
+        self.assertEqual(self.library._recommendation_variants, {})
+
+    def test_build_coborrow_graph(self):
+        """Test relasi co-borrow dibangun dari riwayat transaksi"""
+        for book_id in ("b1", "b2", "b3"):
+            self.library.add_book(Book(
+                book_id=book_id, title=f"Title {book_id}", author="Author",
+                publisher="Publisher", isbn="1", publication_year=2020,
+                category="Fiction", total_copies=5, available_copies=5, location="Rak"
+            ))
+        borrows = [("u1", "b1"), ("u1", "b2"), ("u2", "b1"), ("u2", "b2"),
+                   ("u2", "b3"), ("u3", "b3"), ("u3", "b1")]
+        for i, (user_id, book_id) in enumerate(borrows):
+            self.library.transactions.append(Transaction(
+                f"t{i}", user_id, book_id, TransactionType.BORROW.value))
+        self.library.transactions.append(Transaction("r0", "u1", "b3", "RETURN"))
+
+        self.library.get_recommendations("b1")
+        added = self.library.build_coborrow_graph(min_count=2)
+
+        # Hanya pasangan b1-b2 (2 user) dan b1-b3 (2 user) yang lolos min_count
+        self.assertEqual(added, 4)
+        graph = self.library.recommendation_graph
+        self.assertAlmostEqual(graph.get_edge_weight("b1", "b2"), 2 / (3 * 2) ** 0.5)
+        self.assertIsNone(graph.get_edge_weight("b2", "b3"))
+        self.assertEqual(len(self.library.get_recommendations("b1", depth=1)), 2)
+
+        # User berat dibatasi ke buku terakhirnya
+        edges = build_coborrow_similarities(self.library.transactions,
+                                            max_items_per_user=1, min_count=1)
+        self.assertEqual(edges, [])
+
+    def test_coborrow_block_size_does_not_change_result(self):
+        """Test pemrosesan per blok kolom memberi hasil sama dengan satu blok"""
+        rng = random.Random(7)
+        transactions = [
+            Transaction(f"t{i}", f"u{rng.randrange(40)}", f"b{rng.randrange(30)}",
+                        TransactionType.BORROW.value)
+            for i in range(400)
+        ]
+        expected = build_coborrow_similarities(transactions, min_count=2, top_k=3,
+                                               block_size=1000)
+        self.assertTrue(expected)
+        for block_size in (1, 7):
+            edges = build_coborrow_similarities(transactions, min_count=2, top_k=3,
+                                                block_size=block_size)
+            self.assertEqual(sorted(edges), sorted(expected))
+
+    def test_user_recommendations(self):
+        """Test rekomendasi per user (personalized PageRank)"""
+        for book_id in ("b1", "b2", "b3", "b4", "x1"):
+            self.library.add_book(Book(
+                book_id=book_id, title=f"Title {book_id}", author="Author",
+                publisher="Publisher", isbn="1", publication_year=2020,
+                category="Fiction", total_copies=5, available_copies=5, location="Rak"
+            ))
+        self.library.add_book_relationships([
+            ("b1", "b2", 0.9), ("b2", "b1", 0.9), ("b1", "b3", 0.2),
+            ("b2", "b4", 0.8), ("x1", "b1", 1.0)
+        ])
+        self.assertEqual(self.library.get_user_recommendations("user001"), [])
+
+        self.library.borrow_book("user001", "b1")
+        recs = self.library.get_user_recommendations("user001", limit=3)
+        titles = [title for title, _ in recs]
+        self.assertEqual(titles[0], "Title b2")
+        self.assertNotIn("Title b1", titles)
+        self.assertNotIn("Title x1", titles)  # tidak terjangkau dari b1
+
+        # Graph berubah -> CSR dibangun ulang
+        self.library.add_book_relationship("b1", "x1", 1.0)
+        titles = [title for title, _ in self.library.get_user_recommendations("user001")]
+        self.assertEqual(titles[0], "Title x1")
+
+    def test_content_similarity(self):
+        """Test index TF-IDF untuk buku dengan konten mirip"""
+        data = [
+            ("c1", "Belajar Python untuk Pemula", "Andi", "Teknologi", "pemrograman python dasar"),
+            ("c2", "Python Lanjutan", "Budi", "Teknologi", "pemrograman python dan data"),
+            ("c3", "Resep Masakan Nusantara", "Citra", "Kuliner", "masakan tradisional"),
+            ("c4", "Masakan Padang", "Citra", "Kuliner", "resep rendang"),
+        ]
+        for book_id, title, author, category, description in data:
+            self.library.add_book(Book(
+                book_id=book_id, title=title, author=author, publisher="Publisher",
+                isbn="1", publication_year=2020, category=category, total_copies=1,
+                available_copies=1, location="Rak", description=description
+            ))
+
+        similar = self.library.get_similar_books("c1", limit=2)
+        self.assertEqual(similar[0][0].book_id, "c2")
+        self.assertNotIn("c3", [book.book_id for book, _ in similar])
+
+        # Index ikut diperbarui saat buku diubah / dihapus
+        self.library.update_book("c3", title="Python dan Resep", description="python")
+        self.assertIn("c3", [book.book_id for book, _ in self.library.get_similar_books("c1")])
+        self.library.delete_book("c2")
+        self.assertNotIn("c2", self.library.content_index)
+
+        added = self.library.add_content_relationships(top_k=1, min_similarity=0.1)
+        self.assertGreater(added, 0)
+        self.assertIsNotNone(self.library.recommendation_graph.get_edge_weight("c4", "c3"))
+
     def test_search_multi_criteria(self):
         """Test multi-criteria search"""
         self.library.add_book(self.book)
@@ -300,6 +954,169 @@ class TestLibraryManager(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].book_id, "book001")
 
+    def test_search_limit_and_stop(self):
+        """Test pencarian berhenti di limit atau saat dibatalkan"""
+        ids = list(range(2000))
+        random.Random(0).shuffle(ids)  # BST tidak seimbang; hindari insert berurutan
+        for i in ids:
+            self.library.add_book(Book(
+                book_id=f"b{i:04d}", title=f"Buku {i}", author="Author",
+                publisher="Publisher", isbn="1", publication_year=2020,
+                category="Fiction", total_copies=1, available_copies=1, location="Rak"
+            ))
+        
+        results = self.library.search_books_multi_criteria(title="buku", limit=5)
+        self.assertEqual([b.book_id for b in results], [f"b{i:04d}" for i in range(5)])
+        
+        results = self.library.search_books_multi_criteria(title="buku", should_stop=lambda: True)
+        self.assertEqual(len(results), LibraryManager.SEARCH_STOP_CHECK - 1)
+
+    def test_batched_book_views(self):
+        """Test lookup buku sekaligus untuk riwayat transaksi dan reservasi"""
+        self.library.add_book(self.book)
+        self.library.add_book(Book(
+            book_id="book002", title="Other Book", author="Test Author",
+            publisher="Test Publisher", isbn="1", publication_year=2023,
+            category="Fiction", total_copies=1, available_copies=1, location="Rak"
+        ))
+        self.library.borrow_book("user001", "book001")
+        self.library.borrow_book("user001", "book002")
+        self.library.reserve_book("user002", "book002")
+        self.library.delete_book("book001")
+        
+        books = self.library.get_books_many(["book002", "book001", "book999"])
+        self.assertEqual(list(books), ["book002"])
+        
+        views = self.library.get_user_transaction_views("user001")
+        self.assertEqual([(t.book_id, b.title if b else None) for t, b in views],
+                         [("book001", None), ("book002", "Other Book")])
+        
+        reservations, total = self.library.get_reservation_views(0, 10)
+        self.assertEqual(total, 1)
+        self.assertEqual(reservations[0][1].book_id, "book002")
+
+    def test_books_page_sorted(self):
+        """Test paging buku terurut per kolom tetap konsisten setelah perubahan"""
+        for book_id, title, author in [("b3", "Cinta", "Zaki"), ("b1", "Algoritma", "Yuni"),
+                                       ("b2", "Basis Data", "Xena")]:
+            self.library.add_book(Book(
+                book_id=book_id, title=title, author=author, publisher="Publisher",
+                isbn="1", publication_year=2020, category="Fiction",
+                total_copies=1, available_copies=1, location="Rak"
+            ))
+        
+        books, total = self.library.get_books_page(0, 2, sort_by="title")
+        self.assertEqual(total, 3)
+        self.assertEqual([b.book_id for b in books], ["b1", "b2"])
+        books, _ = self.library.get_books_page(0, 2, sort_by="author", descending=True)
+        self.assertEqual([b.book_id for b in books], ["b3", "b1"])
+        
+        self.library.update_book("b3", title="Aksara")
+        self.library.delete_book("b1")
+        self.library.add_book(Book(
+            book_id="b0", title="Zebra", author="Wati", publisher="Publisher",
+            isbn="1", publication_year=2020, category="Fiction",
+            total_copies=1, available_copies=1, location="Rak"
+        ))
+        books, total = self.library.get_books_page(1, 10, sort_by="title")
+        self.assertEqual(total, 3)
+        self.assertEqual([b.book_id for b in books], ["b2", "b0"])
+        books, _ = self.library.get_books_page(0, 10, sort_by="author")
+        self.assertEqual([b.book_id for b in books], ["b0", "b2", "b3"])
+
+    def test_update_book_reindexes_changed_fields(self):
+        """Test update_book memindahkan key index yang berubah dan melewati update counter"""
+        self.library.add_book(self.book)
+        self.library.get_books_page(0, 10, sort_by="title")
+        
+        self.library._update_indexed_book = lambda *args: self.fail("counter update menyentuh index")
+        self.library.update_book("book001", available_copies=3, status=BookStatus.BORROWED.value)
+        self.assertEqual(self.library.get_book("book001").available_copies, 3)
+        del self.library._update_indexed_book
+        
+        self.library.update_book("book001", title="New Title", author="New Author", category="History")
+        self.assertIsNone(self.library.search_book_by_title("Test Book"))
+        self.assertIsNone(self.library.search_book_by_author("Test Author"))
+        self.assertEqual(self.library.search_book_by_title("new title").book_id, "book001")
+        self.assertEqual(self.library.search_book_by_author("new author").book_id, "book001")
+        self.assertEqual(self.library.search_books_by_category("Fiction"), [])
+        self.assertEqual([b.book_id for b in self.library.search_books_by_category("History")],
+                         ["book001"])
+        self.assertEqual(self.library.get_books_page(0, 10, sort_by="title")[0][0].title, "New Title")
+        
+        self.library.delete_book("book001")
+        self.assertEqual(self.library.search_books_by_category("History"), [])
+        self.assertIsNone(self.library.search_book_by_title("new title"))
+
+    def test_borrow_and_return_many(self):
+        """Test peminjaman & pengembalian batch dengan hasil per item"""
+        self.library.add_book(self.book)  # 5 eksemplar
+        
+        results = self.library.borrow_many(self.user.user_id, ["book001"] * 6 + ["missing"])
+        self.assertEqual([success for success, _, _ in results], [True] * 5 + [False, False])
+        self.assertEqual(results[5][1], "Buku tidak tersedia")
+        self.assertEqual(results[6][1], "Buku tidak ditemukan")
+        self.assertEqual(self.library.get_book("book001").available_copies, 0)
+        self.assertEqual(self.library.get_book("book001").status, BookStatus.BORROWED.value)
+        self.assertEqual(self.library.borrow_count, 5)
+        
+        trans_ids = [trans_id for success, _, trans_id in results if success]
+        results = self.library.return_many(trans_ids + trans_ids[:1] + ["unknown"])
+        self.assertEqual([success for success, _, _ in results], [True] * 5 + [False, False])
+        self.assertEqual(results[5][1], "Transaksi sudah ditutup")
+        self.assertEqual(results[6][1], "Transaksi tidak ditemukan")
+        self.assertEqual(self.library.get_book("book001").available_copies, 5)
+        self.assertEqual(self.library.get_book("book001").status, BookStatus.AVAILABLE.value)
+        self.assertEqual(self.library.return_count, 5)
+        self.assertEqual(self.library.get_pending_transactions(), [])
+
+    def test_concurrent_borrow_and_return(self):
+        """Test banyak thread meminjam/mengembalikan buku yang sama tanpa double-lend"""
+        self.library.add_book(self.book)  # 5 eksemplar
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Paksa context switch sesering mungkin
+        try:
+            start = threading.Barrier(16)
+            borrowed = []
+            
+            def borrow(i):
+                start.wait()
+                for _ in range(20):
+                    success, _, trans_id = self.library.borrow_book(f"user{i:03d}", "book001")
+                    if success:
+                        borrowed.append(trans_id)
+            
+            threads = [threading.Thread(target=borrow, args=(i,)) for i in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(len(borrowed), 5)
+            self.assertEqual(self.library.get_book("book001").available_copies, 0)
+            
+            # Setiap transaksi dikembalikan dua kali bersamaan: hanya satu yang berhasil
+            start = threading.Barrier(10)
+            returned = []
+            
+            def give_back(trans_id):
+                start.wait()
+                if self.library.return_book(trans_id)[0]:
+                    returned.append(trans_id)
+            
+            threads = [threading.Thread(target=give_back, args=(trans_id,))
+                       for trans_id in borrowed * 2]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        
+        self.assertEqual(sorted(returned), sorted(borrowed))
+        self.assertEqual(self.library.get_book("book001").available_copies, 5)
+        self.assertEqual(self.library.borrow_count, 5)
+        self.assertEqual(self.library.return_count, 5)
+
     def test_statistics(self):
         """Test generate statistics"""
         self.library.add_book(self.book)
@@ -351,6 +1168,715 @@ class TestPersistence(unittest.TestCase):
         self.assertTrue(success)
         self.assertEqual(library2.books_bst.size, 1)
 
+    def test_save_and_load_recommendation_graph(self):
+        """Test relasi buku tersimpan dan dimuat ulang"""
+        for i in range(3):
+            self.library.add_book(Book(
+                book_id=f"book{i:03d}", title=f"Book {i}", author="Test Author",
+                publisher="Test Publisher", isbn="123456789", publication_year=2023,
+                category="Fiction", total_copies=1, available_copies=1, location="Rak A1"
+            ))
+        self.library.add_book_relationship("book000", "book001", 0.9)
+        self.library.add_book_relationship("book000", "book002", 0.4)
+        self.library.add_book_relationship("book001", "book002", 0.7)
+        
+        success, msg = self.persistence.save_all(self.library, self.auth)
+        self.assertTrue(success, msg)
+        
+        library2 = LibraryManager()
+        success, msg = self.persistence.load_all(library2, AuthenticationManager())
+        self.assertTrue(success, msg)
+        self.assertEqual(library2.recommendation_graph.get_recommendations("book000", depth=1),
+                         self.library.recommendation_graph.get_recommendations("book000", depth=1))
+        self.assertEqual(len(library2.get_recommendations("book001")), 1)
+
+    def test_background_saver(self):
+        """Test BackgroundSaver mengumpulkan perubahan lalu menyimpan di background"""
+        saver = BackgroundSaver(self.persistence, self.library, self.auth,
+                                flush_interval_ms=60000, max_pending=3)
+        try:
+            for i in range(3):
+                with saver.mutation():
+                    self.library.add_book(Book(
+                        book_id=f"book{i:03d}", title=f"Book {i}", author="Test Author",
+                        publisher="Test Publisher", isbn="123456789", publication_year=2023,
+                        category="Fiction", total_copies=1, available_copies=1, location="Rak A1"
+                    ))
+            
+            # max_pending tercapai -> satu flush untuk tiga perubahan
+            deadline = time.monotonic() + 5
+            while saver.pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(saver.get_stats()["flush_count"], 1)
+            
+            with saver.mutation():
+                self.library.update_book("book000", title="Judul Baru")
+            self.assertTrue(saver.flush(timeout=5))
+        finally:
+            saver.stop()
+        
+        stats = saver.get_stats()
+        self.assertEqual(stats["flush_count"], 2)
+        self.assertEqual(stats["pending"], 0)
+        self.assertTrue(stats["last_success"], stats["last_message"])
+        
+        library2 = LibraryManager()
+        self.persistence.load_all(library2, AuthenticationManager())
+        self.assertEqual(library2.get_book("book000").title, "Judul Baru")
+        self.assertEqual(library2.books_bst.size, 3)
+
+    def test_background_saver_retries_failed_write(self):
+        """Test penulisan yang gagal tetap pending dan dicoba lagi"""
+        persistence = self.persistence
+        write_snapshot = persistence.write_snapshot
+        results = [(False, "Disk penuh")]
+        
+        def flaky_write(snapshot):
+            if results:
+                return results.pop()
+            return write_snapshot(snapshot)
+        
+        persistence.write_snapshot = flaky_write
+        saver = BackgroundSaver(persistence, self.library, self.auth, flush_interval_ms=60000)
+        try:
+            with saver.mutation():
+                self.library.add_book(Book(
+                    book_id="book000", title="Book 0", author="Test Author",
+                    publisher="Test Publisher", isbn="123456789", publication_year=2023,
+                    category="Fiction", total_copies=1, available_copies=1, location="Rak A1"
+                ))
+            self.assertFalse(saver.flush(timeout=5))  # Percobaan pertama gagal
+            self.assertEqual(saver.pending, 1)
+            self.assertTrue(saver.flush(timeout=5))
+        finally:
+            saver.stop()
+        
+        self.assertEqual(saver.pending, 0)
+        library2 = LibraryManager()
+        self.persistence.load_all(library2, AuthenticationManager())
+        self.assertIsNotNone(library2.get_book("book000"))
+        
+        # Gagal saat shutdown: stop() tetap selesai dan perubahan terlihat pending
+        persistence.write_snapshot = lambda snapshot: (False, "Disk penuh")
+        saver = BackgroundSaver(persistence, self.library, self.auth, flush_interval_ms=60000)
+        with saver.mutation():
+            self.library.update_book("book000", title="Judul Baru")
+        saver.stop(timeout=5)
+        self.assertFalse(saver._thread.is_alive())
+        self.assertEqual(saver.pending, 1)
+        self.assertFalse(saver.last_result[0])
+
+    def test_parallel_load_all(self):
+        """Test load_all paralel menghasilkan data yang sama dengan sekuensial"""
+        self.library.add_book(Book(
+            book_id="book001", title="Test Book", author="Test Author",
+            publisher="Test Publisher", isbn="123456789", publication_year=2023,
+            category="Fiction", total_copies=5, available_copies=5, location="Rak A1"
+        ))
+        self.auth.register_user(
+            "testuser", "password123", "Test User",
+            "test@email.com", "08123456789", "Jl. Test", "user001"
+        )
+        _, _, trans_id = self.library.borrow_book("user001", "book001")
+        self.library.add_review("user001", "book001", 4, "Bagus")
+        self.persistence.save_all(self.library, self.auth)
+        
+        library2 = LibraryManager()
+        auth2 = AuthenticationManager()
+        success, msg = self.persistence.load_all(library2, auth2, parallel=True, max_workers=2)
+        self.assertTrue(success, msg)
+        self.assertEqual(library2.get_book("book001").available_copies, 4)
+        self.assertIsNotNone(auth2.get_user("testuser"))
+        self.assertIsNotNone(auth2.get_user_by_id("user001"))
+        self.assertEqual(library2.transactions.get_all()[0].transaction_id, trans_id)
+        self.assertEqual(library2.reviews.size, 1)
+
+
+class TestMmapCatalog(unittest.TestCase):
+    """Test katalog memory-mapped"""
+
+    def setUp(self):
+        self.data_dir = "test_data"
+        self.persistence = DataPersistence(self.data_dir)
+        self.library = LibraryManager()
+        for i in range(20):
+            self.library.add_book(Book(
+                book_id=f"book{i:03d}", title=f"Judul {i} ✓", author="Test Author",
+                publisher="Test Publisher", isbn="123456789", publication_year=2000 + i,
+                category="Fiction", total_copies=3, available_copies=3, location="Rak A1",
+                rating=4.5
+            ))
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.data_dir):
+            shutil.rmtree(self.data_dir)
+
+    def test_get_book_from_catalog(self):
+        """Test get_book membaca buku dari mmap tanpa memuat BST"""
+        success, msg = self.persistence.save_catalog(self.library)
+        self.assertTrue(success, msg)
+        
+        library2 = LibraryManager()
+        success, msg = self.persistence.load_catalog(library2)
+        self.assertTrue(success, msg)
+        self.assertEqual(library2.books_bst.size, 0)
+        
+        book = library2.get_book("book007")
+        self.assertEqual(book, self.library.get_book("book007"))
+        self.assertIsNone(library2.get_book("book999"))
+        self.assertEqual(list(library2.catalog.iter_ids())[:2], ["book000", "book001"])
+        library2.catalog.close()
+
+    def test_borrow_copies_catalog_book_to_memory(self):
+        """Test perubahan buku katalog disalin ke BST"""
+        self.persistence.save_catalog(self.library)
+        library2 = LibraryManager()
+        self.persistence.load_catalog(library2)
+        
+        success, _, _ = library2.borrow_book("user001", "book003")
+        self.assertTrue(success)
+        self.assertEqual(library2.get_book("book003").available_copies, 2)
+        self.assertEqual(library2.books_bst.size, 1)
+        library2.catalog.close()
+
+    def test_search_includes_catalog_books(self):
+        """Test pencarian multi-kriteria ikut memindai katalog mmap"""
+        self.persistence.save_catalog(self.library)
+        library2 = LibraryManager()
+        self.persistence.load_catalog(library2)
+        library2.update_book("book003", title="Judul Baru")
+
+        results = library2.search_books_multi_criteria(title="judul")
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results[0].title, "Judul Baru")  # Salinan BST, bukan versi katalog
+        self.assertEqual([b.book_id for b in library2.search_books_multi_criteria(year=2005)], ["book005"])
+        self.assertEqual(len(library2.search_books_multi_criteria(author="test", limit=4)), 4)
+        library2.catalog.close()
+
+    def test_listing_and_stats_include_catalog_books(self):
+        """Test daftar, paging, kategori dan statistik ikut menghitung buku katalog"""
+        self.persistence.save_catalog(self.library)
+        library2 = LibraryManager()
+        self.persistence.load_catalog(library2)
+        library2.borrow_book("user001", "book004")
+        library2.update_book("book005", category="History")
+
+        self.assertEqual(len(library2.get_all_books()), 20)
+        self.assertEqual(library2.generate_statistics().total_books, 20)
+        books, total = library2.get_books_page(0, 5, sort_by="title", descending=True)
+        self.assertEqual(total, 20)
+        self.assertEqual(books[0].book_id, "book009")
+        self.assertEqual(len(library2.search_books_by_category("Fiction")), 19)
+        self.assertEqual([b.book_id for b in library2.search_books_by_category("History")], ["book005"])
+        library2.catalog.close()
+
+    def test_delete_catalog_book(self):
+        """Test buku katalog yang dihapus tidak muncul lagi di lookup maupun pencarian"""
+        self.persistence.save_catalog(self.library)
+        library2 = LibraryManager()
+        self.persistence.load_catalog(library2)
+        library2.get_books_page(0, 5)
+        library2.borrow_book("user001", "book002")
+
+        for book_id in ("book001", "book002"):
+            self.assertTrue(library2.delete_book(book_id)[0])
+            self.assertIsNone(library2.get_book(book_id))
+        self.assertFalse(library2.delete_book("book001")[0])
+        self.assertEqual(library2.get_books_many(["book001", "book002", "book003"]).keys(), {"book003"})
+        self.assertEqual(len(library2.search_books_multi_criteria(author="test")), 18)
+        self.assertEqual(library2.get_books_page(0, 5)[1], 18)
+        self.assertFalse(library2.add_book(self.library.get_book("book003"))[0])
+        self.assertTrue(library2.add_book(self.library.get_book("book001"))[0])
+        self.assertEqual(len(library2.get_all_books()), 19)
+        library2.catalog.close()
+
+    def test_save_all_keeps_catalog_books(self):
+        """Test save_all di mode katalog menulis semua buku, bukan hanya salinan di BST"""
+        self.persistence.save_catalog(self.library)
+        library2 = LibraryManager()
+        self.persistence.load_catalog(library2)
+        library2.borrow_book("user001", "book000")
+        library2.delete_book("book001")
+        success, msg = self.persistence.save_all(library2, AuthenticationManager())
+        self.assertTrue(success, msg)
+        library2.catalog.close()
+
+        library3 = LibraryManager()
+        self.persistence.load_all(library3, AuthenticationManager())
+        self.assertEqual(len(library3.get_all_books()), 19)
+        self.assertEqual(library3.get_book("book000").available_copies, 2)
+
+    def test_catalog_books_keep_recommendation_graph(self):
+        """Test relasi buku katalog dimuat, bisa ditambah, dan tidak hilang saat save_all"""
+        self.library.add_book_relationship("book000", "book001", 0.9)
+        self.persistence.save_all(self.library, AuthenticationManager())
+        self.persistence.save_catalog(self.library)
+        
+        library2 = LibraryManager()
+        self.persistence.load_catalog(library2)
+        success, msg = self.persistence.load_recommendation_graph(library2)
+        self.assertEqual(msg, "Berhasil memuat 1 relasi buku")
+        self.assertEqual(library2.get_recommendations("book000"), [("Judul 1 ✓", 0.9)])
+        
+        library2.add_book_relationship("book002", "book003", 0.5)
+        self.assertEqual(len(library2.get_recommendations("book002")), 1)
+        self.persistence.save_all(library2, AuthenticationManager())
+        library2.catalog.close()
+        
+        library3 = LibraryManager()
+        self.persistence.load_all(library3, AuthenticationManager())
+        self.assertEqual(library3.recommendation_graph.get_edge_weight("book000", "book001"), 0.9)
+        self.assertEqual(library3.recommendation_graph.get_edge_weight("book002", "book003"), 0.5)
+
+
+class TestCatalogReplica(unittest.TestCase):
+    """Test publish snapshot katalog dan read replica"""
+
+    def setUp(self):
+        self.data_dir = "test_data"
+        self.library = LibraryManager()
+        for i in range(3):
+            self.library.add_book(Book(
+                book_id=f"book{i:03d}", title=f"Buku {i}", author="Test Author",
+                publisher="Test Publisher", isbn="123456789", publication_year=2020,
+                category="Fiction", total_copies=2, available_copies=2, location="Rak A1"
+            ))
+        self.library.add_book_relationship("book000", "book001", 0.9)
+        self.publisher = CatalogPublisher(self.library, self.data_dir, keep=2)
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.data_dir):
+            shutil.rmtree(self.data_dir)
+
+    def test_replica_follows_published_versions(self):
+        """Test replika membaca snapshot dan pindah saat versi naik"""
+        self.assertIsNone(CatalogReplica(self.data_dir).get_book("book000"))
+        success, msg = self.publisher.publish()
+        self.assertTrue(success, msg)
+
+        replica = CatalogReplica(self.data_dir, check_interval=3600)
+        self.assertEqual(replica.version, 1)
+        self.assertEqual(replica.get_book("book001").title, "Buku 1")
+        self.assertEqual(len(replica.search_books(author="test")), 3)
+        self.assertEqual(replica.get_recommendations("book000"), [("Buku 1", 0.9)])
+
+        self.publisher.publish_if_changed()
+        self.assertEqual(self.publisher.version, 1)  # Tidak ada perubahan
+
+        self.library.update_book("book001", title="Buku Revisi")
+        self.library.delete_book("book002")
+        self.publisher.publish_if_changed()
+        self.assertEqual(replica.get_book("book001").title, "Buku 1")  # Belum lewat check_interval
+        self.assertTrue(replica.refresh())
+        self.assertFalse(replica.refresh())
+        self.assertEqual(replica.version, 2)
+        self.assertEqual(replica.get_book("book001").title, "Buku Revisi")
+        self.assertIsNone(replica.get_book("book002"))
+
+    def test_old_snapshots_removed(self):
+        """Test publisher hanya menyimpan `keep` snapshot terakhir dan melanjutkan versi"""
+        for _ in range(4):
+            self.publisher.publish()
+        files = sorted(name for name in os.listdir(self.data_dir) if name.endswith(".bin"))
+        self.assertEqual(files, ["catalog-00000003.bin", "catalog-00000004.bin",
+                                 "graph-00000003.bin", "graph-00000004.bin"])
+        self.assertEqual(CatalogPublisher(self.library, self.data_dir).version, 4)
+
+
+class TestLazyLoading(unittest.TestCase):
+    """Test lazy loading koleksi dingin"""
+
+    def setUp(self):
+        self.data_dir = "test_data"
+        self.persistence = DataPersistence(self.data_dir)
+        self.library = LibraryManager()
+        self.auth = AuthenticationManager()
+        self.library.add_book(Book(
+            book_id="book001", title="Test Book", author="Test Author",
+            publisher="Test Publisher", isbn="123456789", publication_year=2023,
+            category="Fiction", total_copies=5, available_copies=5, location="Rak A1"
+        ))
+        self.library.add_review("user001", "book001", 5, "Bagus")
+        self.library.add_search_history("user001", "test", 1)
+        self.persistence.save_all(self.library, self.auth)
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.data_dir):
+            shutil.rmtree(self.data_dir)
+
+    def test_lazy_load_all(self):
+        """Test review & riwayat pencarian baru dimuat saat diakses"""
+        library2 = LibraryManager()
+        success, msg = self.persistence.load_all(library2, AuthenticationManager(), lazy=True)
+        self.assertTrue(success, msg)
+        self.assertIsNotNone(library2.get_book("book001"))
+        self.assertFalse(library2.reviews.is_loaded)
+        self.assertFalse(library2.search_history.is_loaded)
+        
+        self.assertEqual(len(library2.get_book_reviews("book001")), 1)
+        self.assertTrue(library2.reviews.is_loaded)
+        self.assertFalse(library2.search_history.is_loaded)
+
+    def test_preload_lazy_collections(self):
+        """Test preload memuat transaksi sebelum mutasi pertama"""
+        self.library.borrow_book("user001", "book001")
+        self.persistence.save_all(self.library, self.auth)
+        library2 = LibraryManager()
+        self.persistence.load_all(library2, AuthenticationManager(), lazy=True)
+        self.assertFalse(library2.transactions.is_loaded)
+        
+        library2.preload_lazy_collections()
+        self.assertTrue(library2.transactions.is_loaded)
+        self.assertFalse(library2.reviews.is_loaded)
+        self.assertEqual(len(library2.get_pending_transactions()), 1)
+        with self.assertRaises(ValueError):
+            library2.preload_lazy_collections(["books"])
+
+    def test_save_skips_unloaded_collections(self):
+        """Test save_all tidak menulis ulang koleksi lazy yang belum dimuat"""
+        library2 = LibraryManager()
+        self.persistence.load_all(library2, AuthenticationManager(), lazy=True)
+        self.persistence.save_all(library2, self.auth)
+        
+        library3 = LibraryManager()
+        self.persistence.load_all(library3, AuthenticationManager())
+        self.assertEqual(library3.reviews.size, 1)
+        self.assertEqual(library3.search_history.size, 1)
+
+    def test_malformed_lazy_file_not_overwritten(self):
+        """Test file koleksi lazy yang rusak tidak ditimpa [] saat save_all"""
+        with open(self.persistence.reviews_file, 'w', encoding='utf-8') as f:
+            f.write('[{"review_id": ')
+        library2 = LibraryManager()
+        self.persistence.load_all(library2, AuthenticationManager(), lazy=True)
+
+        with self.assertRaises(ValueError):
+            library2.get_book_reviews("book001")
+        self.assertFalse(library2.reviews.is_loaded)
+        self.persistence.save_all(library2, self.auth)
+        with open(self.persistence.reviews_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), '[{"review_id": ')
+
+
+class TestSQLitePersistence(unittest.TestCase):
+    """Test backend SQLite"""
+
+    def setUp(self):
+        self.data_dir = "test_data"
+        self.library = LibraryManager()
+        self.auth = AuthenticationManager()
+        self.library.add_book(Book(
+            book_id="book001", title="Test Book", author="Test Author",
+            publisher="Test Publisher", isbn="123456789", publication_year=2023,
+            category="Fiction", total_copies=5, available_copies=5, location="Rak A1"
+        ))
+        self.auth.register_user(
+            "testuser", "password123", "Test User",
+            "test@email.com", "08123456789", "Jl. Test", "user001"
+        )
+        _, _, self.trans_id = self.library.borrow_book("user001", "book001")
+        self.library.add_review("user001", "book001", 4, "Bagus")
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.data_dir):
+            shutil.rmtree(self.data_dir)
+
+    def test_save_and_load_all(self):
+        """Test save dan load semua data lewat SQLite"""
+        store = SQLitePersistence(os.path.join(self.data_dir, "library.db"))
+        success, msg = store.save_all(self.library, self.auth)
+        self.assertTrue(success, msg)
+        
+        library2 = LibraryManager()
+        auth2 = AuthenticationManager()
+        success, msg = store.load_all(library2, auth2)
+        self.assertTrue(success, msg)
+        self.assertEqual(library2.get_book("book001").available_copies, 4)
+        self.assertTrue(auth2.get_user("testuser").is_active)
+        self.assertEqual(library2.transactions.get_all()[0].transaction_id, self.trans_id)
+        store.close()
+
+    def test_lazy_load_queries_cold_store(self):
+        """Test query data dingin langsung ke SQLite tanpa memuat koleksi"""
+        store = SQLitePersistence(os.path.join(self.data_dir, "library.db"))
+        store.save_all(self.library, self.auth)
+        
+        library2 = LibraryManager()
+        store.load_all(library2, AuthenticationManager(), lazy=True)
+        self.assertEqual(len(library2.get_user_transactions("user001")), 1)
+        self.assertEqual(len(library2.get_book_reviews("book001")), 1)
+        self.assertFalse(library2.transactions.is_loaded)
+        self.assertFalse(library2.reviews.is_loaded)
+        store.close()
+
+    def test_save_all_is_incremental(self):
+        """Test save_all hanya menulis baris yang berubah dan menghapus baris yang hilang"""
+        store = SQLitePersistence(os.path.join(self.data_dir, "library.db"))
+        store.save_all(self.library, self.auth)
+        
+        changes = store.conn.total_changes
+        success, msg = store.save_all(self.library, self.auth)
+        self.assertTrue(success, msg)
+        self.assertEqual(store.conn.total_changes, changes)
+        
+        self.library.return_book(self.trans_id)
+        store.save_all(self.library, self.auth)
+        self.assertEqual(store.conn.total_changes - changes, 2)  # Buku + transaksi
+        
+        self.library.add_book(Book(
+            book_id="book002", title="Buku Lain", author="Test Author",
+            publisher="Test Publisher", isbn="987654321", publication_year=2023,
+            category="Fiction", total_copies=1, available_copies=1, location="Rak A2"
+        ))
+        store.save_all(self.library, self.auth)
+        self.library.delete_book("book002")
+        store.save_all(self.library, self.auth)
+        self.assertEqual(store.conn.execute(
+            "SELECT COUNT(*) FROM books WHERE book_id = 'book002'").fetchone()[0], 0)
+        
+        library2 = LibraryManager()
+        store.load_all(library2, AuthenticationManager())
+        self.assertEqual(library2.get_book("book001").available_copies, 5)
+        store.close()
+
+    def test_background_saver_with_sqlite(self):
+        """Test BackgroundSaver menyimpan lewat snapshot/write_snapshot SQLite"""
+        db_path = os.path.join(self.data_dir, "library.db")
+        store = SQLitePersistence(db_path)
+        saver = BackgroundSaver(store, self.library, self.auth, flush_interval_ms=60000)
+        try:
+            workers = [threading.Thread(target=lambda: store.get_user_transactions("user001"))
+                       for _ in range(4)]
+            for worker in workers:
+                worker.start()
+            with saver.mutation():
+                self.library.return_book(self.trans_id)
+            self.assertTrue(saver.flush(timeout=5))
+            for worker in workers:
+                worker.join()
+        finally:
+            saver.stop(timeout=5)
+        store.close()
+        
+        store = SQLitePersistence(db_path)
+        library2 = LibraryManager()
+        success, msg = store.load_all(library2, AuthenticationManager())
+        self.assertTrue(success, msg)
+        self.assertEqual(library2.get_book("book001").available_copies, 5)
+        store.close()
+
+    def test_migrate_json_to_sqlite(self):
+        """Test migrasi data JSON ke SQLite"""
+        DataPersistence(self.data_dir).save_all(self.library, self.auth)
+        db_path = os.path.join(self.data_dir, "library.db")
+        
+        success, msg = migrate_json_to_sqlite(self.data_dir, db_path)
+        self.assertTrue(success, msg)
+        
+        store = SQLitePersistence(db_path)
+        library2 = LibraryManager()
+        store.load_books(library2)
+        self.assertIsNotNone(library2.get_book("book001"))
+        self.assertEqual(len(store.get_user_transactions("user001")), 1)
+        store.close()
+
+
+class TestAPIServer(unittest.TestCase):
+    """Test HTTP/JSON API (asyncio)"""
+
+    def setUp(self):
+        self.library = LibraryManager()
+        self.auth = AuthenticationManager()
+        self.library.add_book(Book(
+            book_id="book001", title="Test Book", author="Test Author",
+            publisher="Test Publisher", isbn="123456789", publication_year=2023,
+            category="Fiction", total_copies=1, available_copies=1, location="Rak A1"
+        ))
+        self.auth.register_user(
+            "testuser", "password123", "Test User",
+            "test@email.com", "08123456789", "Jl. Test", "user001"
+        )
+
+    def tearDown(self):
+        self.auth.shutdown()
+
+    async def _request(self, reader, writer, method, path, body=None, token=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n"
+        if token:
+            head += f"Authorization: Bearer {token}\r\n"
+        writer.write(head.encode() + b"\r\n" + data)
+        await writer.drain()
+        
+        status_line = await reader.readline()
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode().strip()
+            if not line:
+                break
+            name, value = line.split(":", 1)
+            headers[name.lower()] = value.strip()
+        payload = json.loads(await reader.readexactly(int(headers["content-length"])))
+        return int(status_line.split()[1]), headers, payload
+
+    def test_borrow_flow_over_keep_alive(self):
+        """Test login, search, borrow dan reserve lewat satu koneksi keep-alive"""
+        async def scenario():
+            server = LibraryAPIServer(self.library, self.auth, port=0)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                status, _, payload = await self._request(reader, writer, "POST", "/login",
+                                                         {"username": "testuser", "password": "wrong"})
+                self.assertEqual(status, 401)
+                
+                status, headers, payload = await self._request(
+                    reader, writer, "POST", "/login",
+                    {"username": "testuser", "password": "password123"})
+                self.assertEqual(status, 200)
+                self.assertEqual(headers["connection"], "keep-alive")
+                token = payload["session_id"]
+                
+                status, _, payload = await self._request(reader, writer, "GET",
+                                                         "/books/search?title=test&limit=5")
+                self.assertEqual([b["book_id"] for b in payload["books"]], ["book001"])
+                
+                status, _, payload = await self._request(reader, writer, "POST", "/borrow",
+                                                         {"book_id": "book001"})
+                self.assertEqual(status, 401)
+                status, _, payload = await self._request(reader, writer, "POST", "/borrow",
+                                                         {"book_id": "book001"}, token)
+                self.assertTrue(payload["success"], payload["message"])
+                status, _, payload = await self._request(reader, writer, "POST", "/return",
+                                                         {"transaction_id": payload["transaction_id"]}, token)
+                self.assertEqual(status, 403)  # member bukan staff
+                
+                status, _, payload = await self._request(reader, writer, "POST", "/reserve",
+                                                         {"book_id": "book001"}, token)
+                self.assertTrue(payload["success"], payload["message"])
+                status, _, payload = await self._request(reader, writer, "POST", "/borrow",
+                                                         {"book_ids": ["book001", "book999"]}, token)
+                self.assertEqual([(r["book_id"], r["success"]) for r in payload["results"]],
+                                 [("book001", False), ("book999", False)])
+                status, _, _ = await self._request(reader, writer, "GET", "/books/book999")
+                self.assertEqual(status, 404)
+                status, _, _ = await self._request(reader, writer, "DELETE", "/borrow")
+                self.assertEqual(status, 405)
+                
+                writer.close()
+                self.assertEqual(server.request_count, 10)
+            finally:
+                await server.stop()
+        
+        asyncio.run(scenario())
+        self.assertEqual(self.library.get_book("book001").available_copies, 0)
+
+    def test_query_params_bounded(self):
+        """Test depth/limit di luar rentang ditolak dengan 400"""
+        async def scenario():
+            server = LibraryAPIServer(self.library, self.auth, port=0)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                for path in ("/books/search?title=test&limit=0",
+                             "/books/search?title=test&limit=-1",
+                             "/books/search?title=test&limit=101",
+                             "/books/book001/recommendations?depth=0",
+                             "/books/book001/recommendations?depth=20000000&limit=5",
+                             "/books/book001/recommendations?limit=0"):
+                    status, _, payload = await self._request(reader, writer, "GET", path)
+                    self.assertEqual(status, 400, path)
+                status, _, _ = await self._request(reader, writer, "GET",
+                                                   "/books/book001/recommendations?depth=5&limit=100")
+                self.assertEqual(status, 200)
+                writer.close()
+            finally:
+                await server.stop()
+        
+        asyncio.run(scenario())
+
+    def test_lock_waits_do_not_block_event_loop(self):
+        """Test request yang menunggu index lock tidak menahan koneksi lain"""
+        async def scenario():
+            server = LibraryAPIServer(self.library, self.auth, port=0, max_workers=4)
+            await server.start()
+            locked = threading.Event()
+            release = threading.Event()
+            
+            def hold_write_lock():
+                with self.library.index_lock.write():
+                    locked.set()
+                    release.wait(5)
+            
+            holder = threading.Thread(target=hold_write_lock)
+            holder.start()
+            locked.wait(5)
+            try:
+                reader1, writer1 = await asyncio.open_connection("127.0.0.1", server.port)
+                blocked = asyncio.ensure_future(
+                    self._request(reader1, writer1, "GET", "/books/book001"))
+                await asyncio.sleep(0.05)
+                
+                reader2, writer2 = await asyncio.open_connection("127.0.0.1", server.port)
+                status, _, _ = await asyncio.wait_for(self._request(
+                    reader2, writer2, "POST", "/logout", token="invalid"), 2)
+                self.assertEqual(status, 401)
+                self.assertFalse(blocked.done())
+                
+                release.set()
+                status, _, payload = await asyncio.wait_for(blocked, 5)
+                self.assertEqual(status, 200)
+                writer1.close()
+                writer2.close()
+            finally:
+                release.set()
+                holder.join(5)
+                await server.stop()
+        
+        asyncio.run(scenario())
+
+    def test_mutations_off_loop_and_chunked_rejected(self):
+        """Test mutasi berjalan di worker pool dan body chunked ditolak"""
+        threads = []
+        borrow_book = self.library.borrow_book
+        
+        def tracking_borrow(*args):
+            threads.append(threading.current_thread().name)
+            return borrow_book(*args)
+        
+        self.library.borrow_book = tracking_borrow
+        
+        async def scenario():
+            server = LibraryAPIServer(self.library, self.auth, port=0)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                _, _, payload = await self._request(reader, writer, "POST", "/login",
+                                                    {"username": "testuser", "password": "password123"})
+                _, _, payload = await self._request(reader, writer, "POST", "/borrow",
+                                                    {"book_id": "book001"}, payload["session_id"])
+                self.assertTrue(payload["success"], payload["message"])
+                
+                writer.write(b"POST /login HTTP/1.1\r\nHost: test\r\n"
+                             b"Transfer-Encoding: chunked\r\n\r\n"
+                             b"0\r\n\r\n")
+                await writer.drain()
+                status_line = await reader.readline()
+                self.assertEqual(int(status_line.split()[1]), 411)
+                response = await reader.read()  # Koneksi ditutup server
+                self.assertIn(b"Connection: close", response)
+                writer.close()
+            finally:
+                await server.stop()
+        
+        asyncio.run(scenario())
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("api-worker"))
+
 
 def run_tests():
     """Run all tests"""